@@ -23,7 +23,7 @@ _project_root = os.path.join(_script_dir, '..', '..')
 _src_dir = os.path.join(_project_root, 'src')
 sys.path.insert(0, _src_dir)
 
-from llm_manager import LLMManager
+from llm_manager import LLMManager, LLMResult
 
 # Import prompts from the same directory
 _prompts_path = os.path.join(_script_dir, 'prompts.py')
@@ -66,69 +66,8 @@ def _per_model_kwargs(model: str) -> dict:
 
 
 def extract_text_from_response(response) -> str:
-    """
-    Extract text content from various response object types.
-    
-    Handles:
-    - Azure OpenAI responses (Pydantic models)
-    - Bedrock responses (dict)
-    - Other response formats
-    """
-    # If it's already a string, return it
-    if isinstance(response, str):
-        return response
-    
-    # Azure OpenAI responses with output (reasoning models)
-    if hasattr(response, 'output') and response.output:
-        if len(response.output) >= 2:
-            return response.output[1].content[0].text
-        elif len(response.output) >= 1:
-            if hasattr(response.output[0], 'content') and response.output[0].content:
-                return response.output[0].content[0].text
-    
-    # Azure OpenAI chat completions
-    if hasattr(response, 'choices') and response.choices:
-        if hasattr(response.choices[0], 'message'):
-            content = response.choices[0].message.content
-            if content:
-                return content
-    
-    # Bedrock responses (dict format)
-    if isinstance(response, dict):
-        # Claude format: content array with potentially multiple items
-        # Claude Sonnet 4 may have: [{'type': 'thinking', 'thinking': '...'}, {'type': 'text', 'text': '...'}]
-        if 'content' in response and isinstance(response['content'], list):
-            # Iterate through content items to find the text block
-            # Skip thinking blocks and find the first text block
-            for content_item in response['content']:
-                if isinstance(content_item, dict):
-                    # Check if this is a text block (not a thinking block)
-                    if content_item.get('type') == 'text' and 'text' in content_item:
-                        return content_item['text']
-                    # Fallback: if no type specified but has 'text' key, use it
-                    elif 'text' in content_item and content_item.get('type') != 'thinking':
-                        return content_item['text']
-                    # Try nested content structure
-                    if 'content' in content_item and isinstance(content_item['content'], list):
-                        if len(content_item['content']) > 0:
-                            nested = content_item['content'][0]
-                            if isinstance(nested, dict) and 'text' in nested:
-                                return nested['text']
-        
-        # Alternative Bedrock format
-        if 'outputs' in response:
-            outputs = response['outputs']
-            if isinstance(outputs, list) and len(outputs) > 0:
-                output = outputs[0]
-                if isinstance(output, dict) and 'text' in output:
-                    return output['text']
-        
-        # Try direct 'text' key
-        if 'text' in response:
-            return response['text']
-    
-    # Fallback: try to convert to string
-    return str(response)
+    """Extract the text content of any provider's response"""
+    return LLMResult.from_response(response, keep_raw=False).text
 
 
 class IdeaGenerationBot:
@@ -21,11 +21,13 @@ setup(
         "abacusai>=1.0.0",
         "boto3>=1.26.0",
         "aioboto3>=11.0.0",
-        "retry>=0.9.2",
+        "aiohttp>=3.8.0",
     ],
     extras_require={
         "dev": [
             "pytest>=7.0.0",
+            "pytest-asyncio>=0.21.0",
+            "moto[s3]>=5.0.0",
             "black>=23.0.0",
             "isort>=5.12.0",
             "mypy>=1.0.0",
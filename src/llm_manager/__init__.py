@@ -1,3 +1,28 @@
 from .llm_manager import LLMManager
+from .batch import BatchItem, BatchResult
+from .streaming import StreamEvent
+from .result import LLMResult
+from .errors import (
+    LLMError,
+    RateLimitedError,
+    RequestTimeoutError,
+    ServerError,
+    BadRequestError,
+    ContentFilteredError,
+    CircuitOpenError,
+)
 
-__all__ = ["LLMManager"]
\ No newline at end of file
+__all__ = [
+    "LLMManager",
+    "BatchItem",
+    "BatchResult",
+    "StreamEvent",
+    "LLMResult",
+    "LLMError",
+    "RateLimitedError",
+    "RequestTimeoutError",
+    "ServerError",
+    "BadRequestError",
+    "ContentFilteredError",
+    "CircuitOpenError",
+]
\ No newline at end of file
@@ -0,0 +1,133 @@
+import json
+import tempfile
+import time
+from contextlib import contextmanager
+from typing import Any, BinaryIO, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .errors import LLMError, RequestTimeoutError
+
+# Seconds between status checks of a provider batch job, unless batch.poll_interval is set
+DEFAULT_BATCH_POLL_INTERVAL = 60.0
+
+
+class BatchItem:
+    """A single request in a batch: prompt, model and per-item kwargs"""
+
+    __slots__ = ("prompt", "model", "kwargs")
+
+    def __init__(self, prompt: str, model: Optional[str] = None, kwargs: Optional[Dict[str, Any]] = None):
+        self.prompt = prompt
+        self.model = model
+        self.kwargs = kwargs or {}
+
+    @classmethod
+    def coerce(cls, item: Any) -> "BatchItem":
+        """Build a BatchItem from a prompt string, a tuple or a dict"""
+        if isinstance(item, cls):
+            return item
+        if isinstance(item, str):
+            return cls(item)
+        if isinstance(item, dict):
+            item = dict(item)
+            prompt = item.pop("prompt")
+            model = item.pop("model", None)
+            kwargs = item.pop("kwargs", {})
+            # Any remaining keys are treated as generation kwargs
+            return cls(prompt, model, {**item, **kwargs})
+        if isinstance(item, (tuple, list)) and 1 <= len(item) <= 3:
+            return cls(*item)
+        raise ValueError(
+            f"Invalid batch item: {item!r}. Use a prompt string, a (prompt, model, kwargs) tuple or a dict."
+        )
+
+    def __repr__(self):
+        return f"BatchItem(model={self.model!r}, prompt={self.prompt[:40]!r})"
+
+
+class BatchResult:
+    """Outcome of one batch item; exactly one of response/error is set"""
+
+    __slots__ = ("index", "item", "response", "error", "target")
+
+    def __init__(self, index: int, item: Optional[BatchItem], response: Any = None, error: Optional[BaseException] = None,
+                 target: Optional[str] = None):
+        self.index = index
+        self.item = item
+        self.response = response
+        self.error = error
+        # 'provider/model_id' that served the item, or None on error or cache hit
+        self.target = target
+
+    @property
+    def ok(self) -> bool:
+        """True if the item completed without an error"""
+        return self.error is None
+
+    def __repr__(self):
+        status = "ok" if self.ok else f"error={self.error!r}"
+        return f"BatchResult(index={self.index}, {status})"
+
+
+@contextmanager
+def spool_jsonl(records: Iterable[Dict[str, Any]]) -> Iterator[BinaryIO]:
+    """Write records as JSONL to a temporary file and yield it rewound, ready to upload.
+
+    The file lives on disk, so large batch jobs are not held in memory.
+    """
+    with tempfile.TemporaryFile() as spool:
+        for record in records:
+            spool.write(json.dumps(record).encode("utf-8") + b"\n")
+        if not spool.tell():
+            raise ValueError("A batch job needs at least one item")
+        spool.seek(0)
+        yield spool
+
+
+class BatchJobMixin:
+    """Waiting on and running the batch jobs of a provider with a native batch API.
+
+    Providers implement submit_batch_job, get_batch_job and
+    iter_batch_results with their service calls, plus two hooks:
+    _get_batch_config(model_id), which returns (config, batch settings), and
+    _batch_job_state(job), which returns (status, finished, error) where
+    error says why a finished job did not succeed and is None otherwise.
+    """
+
+    # Provider name used in batch targets and error messages
+    _provider_name = "provider"
+
+    def _iter_batch_items(self, items: Iterable[Any], model_id: str) -> Iterator[Tuple[int, BatchItem]]:
+        """(index, BatchItem) for each item; a batch job runs only one model"""
+        target = f"{self._provider_name}/{model_id}"
+        for index, raw_item in enumerate(items):
+            item = BatchItem.coerce(raw_item)
+            if item.model not in (None, target):
+                raise ValueError(f"Batch item {index} targets {item.model}, but a batch job runs only {target}")
+            yield index, item
+
+    def wait_batch_job(self, job_id: str, model_id: str, poll_interval: Optional[float] = None,
+                       timeout: Optional[float] = None) -> Any:
+        """Poll a batch job until it finishes and return it; raises LLMError if it did not succeed"""
+        _, batch_config = self._get_batch_config(model_id)
+        if poll_interval is None:
+            poll_interval = batch_config.get("poll_interval", DEFAULT_BATCH_POLL_INTERVAL)
+        deadline = time.monotonic() + timeout if timeout is not None else None
+        label = f"{self._provider_name.capitalize()} batch job {job_id}"
+        while True:
+            job = self.get_batch_job(job_id, model_id)
+            status, finished, error = self._batch_job_state(job)
+            if finished and error is None:
+                return job
+            if finished:
+                raise LLMError(f"{label} {status}: {error}", provider=self._provider_name)
+            if deadline is not None and time.monotonic() + poll_interval > deadline:
+                raise RequestTimeoutError(f"{label} still {status} after {timeout}s", provider=self._provider_name)
+            time.sleep(poll_interval)
+
+    def run_batch_job(self, items, model_id: str, poll_interval: Optional[float] = None,
+                      timeout: Optional[float] = None, **kwargs) -> Iterator[BatchResult]:
+        """Submit items as a batch job, wait for it and stream back its results"""
+        items: List[BatchItem] = [BatchItem.coerce(item) for item in items]
+        job_id = self.submit_batch_job(items, model_id, **kwargs)
+        self.wait_batch_job(job_id, model_id, poll_interval, timeout)
+        return self.iter_batch_results(job_id, model_id, items)
@@ -0,0 +1,123 @@
+import re
+import time
+from email.utils import parsedate_to_datetime
+from typing import Any, Mapping, Optional
+
+
+class LLMError(Exception):
+    """Base class for errors raised by providers.
+
+    retryable tells the retry engine whether the same request may succeed
+    if sent again; retry_after is the server-suggested wait in seconds.
+    """
+
+    retryable = False
+
+    def __init__(self, message: str, provider: Optional[str] = None, status_code: Optional[int] = None,
+                 retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.provider = provider
+        self.status_code = status_code
+        self.retry_after = retry_after
+
+
+class RateLimitedError(LLMError):
+    """The provider rejected the request because of quota or throttling (HTTP 429)"""
+
+    retryable = True
+
+
+class RequestTimeoutError(LLMError):
+    """The request or the model timed out"""
+
+    retryable = True
+
+
+class ServerError(LLMError):
+    """The provider failed, was overloaded or could not be reached (HTTP 5xx)"""
+
+    retryable = True
+
+
+class BadRequestError(LLMError):
+    """The request was rejected as invalid; sending it again will not help (HTTP 4xx)"""
+
+
+class ContentFilteredError(BadRequestError):
+    """The prompt or completion was blocked by a content filter or guardrail"""
+
+
+class CircuitOpenError(LLMError):
+    """The endpoint's circuit breaker is open, so the call was not attempted.
+
+    Not retryable against the same endpoint; retry_after is the time left
+    before the breaker lets a probe call through.
+    """
+
+
+def error_for_status(status_code: Optional[int], message: str, provider: Optional[str] = None,
+                     retry_after: Optional[float] = None) -> LLMError:
+    """Map an HTTP status code to the matching LLMError subclass"""
+    if status_code == 429:
+        error_class = RateLimitedError
+    elif status_code in (408, 504):
+        error_class = RequestTimeoutError
+    elif status_code is not None and status_code >= 500:
+        error_class = ServerError
+    elif status_code in (400, 404, 413, 422):
+        error_class = BadRequestError
+    else:
+        # Authentication/permission problems and anything unrecognized
+        error_class = LLMError
+    return error_class(message, provider=provider, status_code=status_code, retry_after=retry_after)
+
+
+_DURATION_PART = re.compile(r"(\d+(?:\.\d+)?)(ms|h|m|s)")
+_DURATION_UNITS = {"ms": 0.001, "s": 1.0, "m": 60.0, "h": 3600.0}
+
+
+def _parse_duration(value: str) -> Optional[float]:
+    """Parse '20', '1.5s', '250ms' or '6m0s' into seconds"""
+    value = value.strip()
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    parts = _DURATION_PART.findall(value)
+    if not parts:
+        return None
+    return sum(float(amount) * _DURATION_UNITS[unit] for amount, unit in parts)
+
+
+def retry_after_from_headers(headers: Optional[Mapping[str, Any]]) -> Optional[float]:
+    """Seconds to wait according to Retry-After style response headers.
+
+    Understands retry-after-ms, retry-after (seconds or HTTP date) and the
+    x-ratelimit-reset-requests / x-ratelimit-reset-tokens durations; the
+    longest wait wins.
+    """
+    if not headers:
+        return None
+    headers = {str(k).lower(): str(v) for k, v in headers.items()}
+    waits = []
+
+    if "retry-after-ms" in headers:
+        seconds = _parse_duration(headers["retry-after-ms"])
+        if seconds is not None:
+            waits.append(seconds / 1000.0)
+    if "retry-after" in headers:
+        seconds = _parse_duration(headers["retry-after"])
+        if seconds is None:
+            try:
+                seconds = parsedate_to_datetime(headers["retry-after"]).timestamp() - time.time()
+            except (TypeError, ValueError):
+                seconds = None
+        if seconds is not None:
+            waits.append(seconds)
+    for name in ("x-ratelimit-reset-requests", "x-ratelimit-reset-tokens"):
+        if name in headers:
+            seconds = _parse_duration(headers[name])
+            if seconds is not None:
+                waits.append(seconds)
+
+    return max(0.0, max(waits)) if waits else None
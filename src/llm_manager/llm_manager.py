@@ -1,6 +1,29 @@
+import asyncio
+import threading
+import time
+from collections import deque
+from contextlib import closing, nullcontext
+from concurrent.futures import ThreadPoolExecutor
 from .utils.config import load_config
+from .utils.cache import ResponseCache, make_cache_key
+from .utils.singleflight import SingleFlight
+from .utils.rate_limit import build_rate_limiters
+from .utils.usage import estimate_tokens, extract_usage, total_tokens
+from .utils.retry import RetryPolicy
+from .utils.circuit_breaker import CircuitBreakerRegistry
+from .utils.hedging import Hedger
+from .utils.accounting import UsageRegistry
+from .streaming import USAGE
+from .errors import CircuitOpenError, LLMError
 from .providers import PROVIDER_MAP
-from retry import retry
+from .batch import BatchItem, BatchResult
+from .result import LLMResult
+from .routing import build_fallback_chains, build_route_table, make_route
+
+# Per-call options consumed by the manager and never forwarded to providers
+_CALL_OPTIONS = ("cache", "cache_ttl", "coalesce", "max_attempts", "return_target", "hedge", "normalize", "tag")
+
+_MISSING = object()
 
 class LLMManager:
     "Manager for interacting with various LLM providers"
@@ -10,39 +33,332 @@ class LLMManager:
         self.config = load_config(config_path)
         self.providers = {}
         self._initialize_providers()
+        self._routes = build_route_table(self.providers, self.config.get("model_aliases", {}))
+        self._chains = build_fallback_chains(self._routes, self.config.get("model_aliases", {}))
+        cache_config = self.config.get("cache") or {}
+        self.cache = ResponseCache.from_config(cache_config) if cache_config.get("enabled", False) else None
+        coalescing_config = self.config.get("coalescing") or {}
+        self.inflight = SingleFlight() if coalescing_config.get("enabled", True) else None
+        self._coalesce_deterministic_only = coalescing_config.get("deterministic_only", True)
+        self.retry_policy = RetryPolicy.from_config(self.config.get("retry") or {})
+        breaker_config = self.config.get("circuit_breaker") or {}
+        self.circuit_breakers = (
+            CircuitBreakerRegistry(breaker_config) if breaker_config.get("enabled", True) else None
+        )
+        self._route_breakers = {}
+        self.hedging = Hedger(self.config.get("hedging"))
+        responses_config = self.config.get("responses") or {}
+        self._normalize = responses_config.get("normalize", False)
+        self._keep_raw = responses_config.get("keep_raw", True)
+        accounting_config = self.config.get("accounting") or {}
+        self.usage = (
+            UsageRegistry.from_config({name: self.config["providers"][name] for name in self.providers})
+            if accounting_config.get("enabled", True) else None
+        )
+        self._rate_limiters = build_rate_limiters({
+            name: config for name, config in self.config.get("providers", {}).items() if name in self.providers
+        })
 
 
     def _initialize_providers(self):
-        """Initialize all enabled providers"""
+        """Initialize all enabled providers, importing only their modules"""
         for provider_name, provider_config in self.config.get("providers", {}).items():
-            if provider_name in PROVIDER_MAP and provider_config.get("enabled", False):
+            if provider_config.get("enabled", False) and provider_name in PROVIDER_MAP:
                 provider_class = PROVIDER_MAP[provider_name]
                 self.providers[provider_name] = provider_class(provider_config)
 
 
-    def generate(self, prompt, model=None, **kwargs):
-        """Generate a response using the specified model"""
+    def _resolve_route(self, model):
+        """Resolve a model alias or 'provider/model_id' string to its route"""
         if model is None:
             model = self.config.get("default_model")
-        
-        # Resolve model alias if needed
-        if model in self.config.get("model_aliases", {}):
-            model_path = self.config["model_aliases"][model]
+
+        route = self._routes.get(model)
+        if route is not None:
+            return route
+
+        # Slow path: only reached for unknown models, to report a useful error
+        model_path = self.config.get("model_aliases", {}).get(model, model)
+        if isinstance(model_path, (list, tuple)):
+            raise ValueError(f"No target of fallback chain '{model}' is available: {model_path}")
+        try:
             provider_name, model_id = model_path.split("/")
-        else:
-            # Assume format is provider/model_id
-            try:
-                provider_name, model_id = model.split("/")
-            except ValueError:
-                raise ValueError(f"Invalid model format: {model}. Use 'provider/model_id' format or a defined alias.")
-        
-        # Check if provider exists and is enabled
+        except ValueError:
+            raise ValueError(f"Invalid model format: {model}. Use 'provider/model_id' format or a defined alias.")
+
         if provider_name not in self.providers:
             raise ValueError(f"Provider '{provider_name}' not found or not enabled")
-        
-        # Generate the response
-        return self.providers[provider_name].generate(prompt, model_id, **kwargs)
-    
+
+        # Let the provider raise its own unknown-model error
+        return make_route(provider_name, model_id, self.providers[provider_name])
+
+    def _resolve_targets(self, model):
+        """Resolve a model to its name and the ordered routes to try.
+
+        A fallback chain alias resolves to all of its available targets;
+        anything else resolves to a single route.
+        """
+        if model is None:
+            model = self.config.get("default_model")
+        chain = self._chains.get(model)
+        if chain is not None:
+            return model, chain
+        route = self._resolve_route(model)
+        return route.name, (route,)
+
+    @staticmethod
+    def _should_fail_over(error):
+        """Whether a failed target should be skipped for the next one in its chain"""
+        return isinstance(error, LLMError) and (error.retryable or isinstance(error, CircuitOpenError))
+
+    @staticmethod
+    def _pop_call_options(kwargs):
+        """Remove manager-level options from the kwargs bound for the provider"""
+        return {name: kwargs.pop(name) for name in _CALL_OPTIONS if name in kwargs}
+
+    @staticmethod
+    def _provider_kwargs(route, kwargs):
+        """kwargs for one route's provider; prompt_cache only reaches providers that cache prompts.
+
+        A fallback chain or hedge sends the same call kwargs to every target,
+        and other providers would pass the option on to their API.
+        """
+        if "prompt_cache" in kwargs and not getattr(route.provider, "supports_prompt_cache", False):
+            return {name: value for name, value in kwargs.items() if name != "prompt_cache"}
+        return kwargs
+
+    @staticmethod
+    def _is_reusable(kwargs, options):
+        """Whether a response may be shared between identical requests"""
+        return kwargs.get("temperature") == 0 or options.get("cache") is True
+
+    def _cache_key(self, name, prompt, kwargs, options):
+        """Cache key for a request, or None if it should bypass the cache.
+
+        Only deterministic requests (temperature 0) are cached unless the
+        caller opts in with cache=True; cache=False always bypasses.
+        """
+        if self.cache is None or options.get("cache") is False or not self._is_reusable(kwargs, options):
+            return None
+        return make_cache_key(name, prompt, kwargs)
+
+    def _coalesce_key(self, name, prompt, kwargs, options, cache_key):
+        """Key under which identical in-flight async requests share one call, or None"""
+        if self.inflight is None:
+            return None
+        coalesce = options.get("coalesce")
+        if coalesce is False:
+            return None
+        if coalesce is None and self._coalesce_deterministic_only and not self._is_reusable(kwargs, options):
+            return None
+        return cache_key or make_cache_key(name, prompt, kwargs)
+
+    def _acquire_limits(self, route, prompt, kwargs):
+        """Wait for admission from every rate limiter on the route"""
+        limiters = self._rate_limiters.get(route.name)
+        if not limiters:
+            return ()
+        tokens = estimate_tokens(prompt, kwargs)
+        permits = []
+        try:
+            for limiter in limiters:
+                permits.append(limiter.acquire(tokens))
+        except BaseException:
+            self._release_limits(permits)
+            raise
+        return permits
+
+    async def _acquire_limits_async(self, route, prompt, kwargs):
+        """Wait for admission from every rate limiter on the route without blocking the loop"""
+        limiters = self._rate_limiters.get(route.name)
+        if not limiters:
+            return ()
+        tokens = estimate_tokens(prompt, kwargs)
+        permits = []
+        try:
+            for limiter in limiters:
+                permits.append(await limiter.acquire_async(tokens))
+        except BaseException:
+            self._release_limits(permits)
+            raise
+        return permits
+
+    @staticmethod
+    def _release_limits(permits, used_tokens=None):
+        """Release rate limiter permits, reconciling estimated with actual token usage"""
+        for permit in permits:
+            permit.release(used_tokens)
+
+    def _get_retry_policy(self, options):
+        """Retry policy for a call, honoring a per-call max_attempts override"""
+        if "max_attempts" in options:
+            return self.retry_policy.with_attempts(options["max_attempts"])
+        return self.retry_policy
+
+    def _get_breaker(self, route):
+        """Circuit breaker of the endpoint serving a route, or None if breakers are disabled.
+
+        Routes are grouped by the key their provider already uses to cache
+        clients (endpoint, deployment, region, base URL), so models sharing
+        an endpoint share a breaker. A model load balanced over several
+        deployments has no single endpoint; its pool already cools down
+        failing deployments, so it gets a breaker of its own.
+        """
+        if self.circuit_breakers is None:
+            return None
+        breaker = self._route_breakers.get(route.name)
+        if breaker is None:
+            create_key = getattr(route.provider, "_create_cache_key", None)
+            endpoint_key = (route.provider_name,)
+            if route.model_config and route.model_config.get("deployments"):
+                endpoint_key += ("deployments", route.model_id)
+            elif create_key is not None and route.model_config is not None:
+                endpoint_key += tuple(create_key(route.model_config))
+            breaker = self.circuit_breakers.get(endpoint_key, route.name)
+            self._route_breakers[route.name] = breaker
+        return breaker
+
+    def circuit_breaker_stats(self):
+        """State and counters of the circuit breaker behind each route used so far"""
+        return {name: breaker.stats() for name, breaker in list(self._route_breakers.items())}
+
+    def _call_route(self, route, prompt, kwargs):
+        """Make one upstream call on a route under its circuit breaker and rate limits"""
+        breaker = self._get_breaker(route)
+        if breaker is not None:
+            # Fail fast before taking a rate limit or concurrency slot
+            breaker.check()
+        permits = self._acquire_limits(route, prompt, kwargs)
+        response = None
+        try:
+            with breaker.guard() if breaker is not None else nullcontext():
+                response = route.generate(prompt, route.model_id, **self._provider_kwargs(route, kwargs))
+        finally:
+            if permits:
+                self._release_limits(permits, total_tokens(extract_usage(response)))
+        return response
+
+    async def _call_route_async(self, route, prompt, kwargs):
+        """Make one asynchronous upstream call on a route under its circuit breaker and rate limits"""
+        breaker = self._get_breaker(route)
+        if breaker is not None:
+            breaker.check()
+        permits = await self._acquire_limits_async(route, prompt, kwargs)
+        response = None
+        try:
+            with breaker.guard() if breaker is not None else nullcontext():
+                start = time.monotonic()
+                response = await route.generate_async(prompt, route.model_id, **self._provider_kwargs(route, kwargs))
+                self.hedging.record(route.name, time.monotonic() - start)
+        finally:
+            if permits:
+                self._release_limits(permits, total_tokens(extract_usage(response)))
+        return response
+
+    def _call_targets(self, routes, prompt, kwargs):
+        """Call each target in order until one succeeds; returns (route, response).
+
+        Fails over to the next target on retryable errors and open circuits;
+        any other error, or the last target's error, is raised.
+        """
+        for route in routes[:-1]:
+            try:
+                return route, self._call_route(route, prompt, kwargs)
+            except Exception as e:
+                if not self._should_fail_over(e):
+                    raise
+        return routes[-1], self._call_route(routes[-1], prompt, kwargs)
+
+    async def _call_targets_async(self, routes, prompt, kwargs):
+        """Asynchronous version of _call_targets"""
+        for route in routes[:-1]:
+            try:
+                return route, await self._call_route_async(route, prompt, kwargs)
+            except Exception as e:
+                if not self._should_fail_over(e):
+                    raise
+        return routes[-1], await self._call_route_async(routes[-1], prompt, kwargs)
+
+    async def _call_hedged(self, name, routes, prompt, kwargs):
+        """Call the chain, and send a hedge to the next target if the primary is slow.
+
+        The hedge starts once the primary has run longer than the configured
+        latency percentile of its route, budget permitting. The first success
+        wins and the other request is cancelled.
+        """
+        budget = self.hedging.get_budget(name)
+        budget.deposit()
+        primary = asyncio.ensure_future(self._call_targets_async(routes, prompt, kwargs))
+        hedge = None
+        try:
+            done, _ = await asyncio.wait({primary}, timeout=self.hedging.delay(name, routes[0].name))
+            if done or not budget.try_spend():
+                return await primary
+
+            hedge = asyncio.ensure_future(self._call_targets_async(routes[1:] + routes[:1], prompt, kwargs))
+            pending = {primary, hedge}
+            error = None
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        return task.result()
+                    error = error or task.exception()
+            raise error
+        finally:
+            for task in (primary, hedge):
+                if task is not None and not task.done():
+                    task.cancel()
+
+    def _should_hedge(self, routes, options):
+        """Whether an async call should be hedged: opt-in, and only with an equivalent target"""
+        return len(routes) > 1 and options.get("hedge", self.hedging.enabled)
+
+    def _record_usage(self, route, usage, options):
+        """Feed the usage of one upstream call into the accounting registry"""
+        if self.usage is not None:
+            self.usage.record(route.provider_name, route.name, usage, options.get("tag"))
+
+    def _finish(self, response, name, target, start, options):
+        """Apply the normalize and return_target options to a response.
+
+        target is the 'provider/model_id' that served the call, or None when
+        the response came from the cache.
+        """
+        if options.get("normalize", self._normalize):
+            response = LLMResult.from_response(
+                response, model=target or name, latency=time.monotonic() - start, keep_raw=self._keep_raw
+            )
+        if options.get("return_target", False):
+            return response, target
+        return response
+
+    def generate(self, prompt, model=None, **kwargs):
+        """Generate a response using the specified model.
+
+        With normalize=True, returns an LLMResult instead of the provider's
+        payload. With return_target=True, returns (response, target) where
+        target is the 'provider/model_id' that served the call, or None for a
+        cache hit.
+        """
+        start = time.monotonic()
+        options = self._pop_call_options(kwargs)
+        name, routes = self._resolve_targets(model)
+
+        cache_key = self._cache_key(name, prompt, kwargs, options)
+        if cache_key is not None:
+            response = self.cache.get(cache_key, _MISSING)
+            if response is not _MISSING:
+                return self._finish(response, name, None, start, options)
+
+        # Each attempt walks the whole chain before backing off
+        policy = self._get_retry_policy(options)
+        route, response = policy.call(lambda: self._call_targets(routes, prompt, kwargs))
+        self._record_usage(route, extract_usage(response), options)
+
+        if cache_key is not None:
+            self.cache.set(cache_key, response, options.get("cache_ttl"))
+        return self._finish(response, name, route.name, start, options)
 
     def list_models(self):
         """List all available models"""
@@ -55,30 +371,211 @@ class LLMManager:
     def list_aliases(self):
         """List all model aliases"""
         return self.config.get("model_aliases", {})
-    
+
+    async def aclose(self):
+        """Close the pooled async clients that providers hold for the running event loop"""
+        for provider in self.providers.values():
+            if hasattr(provider, "aclose"):
+                await provider.aclose()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.aclose()
+
     async def generate_async(self, prompt, model=None, **kwargs):
         """Generate a response asynchronously using the specified model"""
-        if model is None:
-            model = self.config.get("default_model")
-        
-        # Resolve model alias if needed
-        if model in self.config.get("model_aliases", {}):
-            model_path = self.config["model_aliases"][model]
-            provider_name, model_id = model_path.split("/")
+        start = time.monotonic()
+        options = self._pop_call_options(kwargs)
+        name, routes = self._resolve_targets(model)
+        async_routes = tuple(route for route in routes if route.generate_async is not None)
+        if not async_routes:
+            raise ValueError(f"Provider '{routes[0].provider_name}' does not support async calls")
+
+        cache_key = self._cache_key(name, prompt, kwargs, options)
+        if cache_key is not None:
+            response = self.cache.get(cache_key, _MISSING)
+            if response is not _MISSING:
+                return self._finish(response, name, None, start, options)
+
+        policy = self._get_retry_policy(options)
+        if self._should_hedge(async_routes, options):
+            attempt = lambda: self._call_hedged(name, async_routes, prompt, kwargs)
+        else:
+            attempt = lambda: self._call_targets_async(async_routes, prompt, kwargs)
+
+        async def call():
+            route, response = await policy.acall(attempt)
+            self._record_usage(route, extract_usage(response), options)
+            if cache_key is not None:
+                self.cache.set(cache_key, response, options.get("cache_ttl"))
+            return route, response
+
+        coalesce_key = self._coalesce_key(name, prompt, kwargs, options, cache_key)
+        if coalesce_key is not None:
+            route, response = await self.inflight.do(coalesce_key, call)
         else:
-            # Assume format is provider/model_id
+            route, response = await call()
+        return self._finish(response, name, route.name, start, options)
+
+    def stream(self, prompt, model=None, **kwargs):
+        """Stream a response as normalized StreamEvents.
+
+        Yields "text" and "thinking" deltas as they arrive, followed by a
+        final "usage" event with token counts and the finish reason.
+        """
+        options = self._pop_call_options(kwargs)
+        route = self._resolve_route(model)
+        if route.stream is None:
+            raise ValueError(f"Provider '{route.provider_name}' does not support streaming")
+        return self._stream(route, prompt, kwargs, options)
+
+    def _stream(self, route, prompt, kwargs, options):
+        breaker = self._get_breaker(route)
+        if breaker is not None:
+            breaker.check()
+        permits = self._acquire_limits(route, prompt, kwargs)
+        used_tokens = None
+        start = time.monotonic()
+        ttft = None
+        try:
+            # Stream duration depends on output length, so it is not timed
+            with breaker.guard(timed=False) if breaker is not None else nullcontext():
+                # Closed explicitly so a consumer that stops early frees the provider's connection
+                with closing(route.stream(prompt, route.model_id, **self._provider_kwargs(route, kwargs))) as events:
+                    for event in events:
+                        if event.type == USAGE:
+                            used_tokens = total_tokens(event.usage)
+                            self._record_usage(route, event.usage, options)
+                            event.ttft = ttft
+                        elif ttft is None:
+                            ttft = time.monotonic() - start
+                        yield event
+        finally:
+            self._release_limits(permits, used_tokens)
+
+    def astream(self, prompt, model=None, **kwargs):
+        """Stream a response asynchronously; use with `async for`"""
+        options = self._pop_call_options(kwargs)
+        route = self._resolve_route(model)
+        if route.astream is None:
+            raise ValueError(f"Provider '{route.provider_name}' does not support async streaming")
+        return self._astream(route, prompt, kwargs, options)
+
+    async def _astream(self, route, prompt, kwargs, options):
+        breaker = self._get_breaker(route)
+        if breaker is not None:
+            breaker.check()
+        permits = await self._acquire_limits_async(route, prompt, kwargs)
+        used_tokens = None
+        start = time.monotonic()
+        ttft = None
+        try:
+            with breaker.guard(timed=False) if breaker is not None else nullcontext():
+                events = route.astream(prompt, route.model_id, **self._provider_kwargs(route, kwargs))
+                try:
+                    async for event in events:
+                        if event.type == USAGE:
+                            used_tokens = total_tokens(event.usage)
+                            self._record_usage(route, event.usage, options)
+                            event.ttft = ttft
+                        elif ttft is None:
+                            ttft = time.monotonic() - start
+                        yield event
+                finally:
+                    await events.aclose()
+        finally:
+            self._release_limits(permits, used_tokens)
+
+    def _plan_batch(self, items):
+        """Coerce batch items and queue them per provider; unresolvable items fail immediately"""
+        results = {}
+        pending = {}
+        total = 0
+        for index, raw_item in enumerate(items):
+            total += 1
+            item = None
             try:
-                provider_name, model_id = model.split("/")
-            except ValueError:
-                raise ValueError(f"Invalid model format: {model}. Use 'provider/model_id' format or a defined alias.")
-        
-        # Check if provider exists and is enabled
-        if provider_name not in self.providers:
-            raise ValueError(f"Provider '{provider_name}' not found or not enabled")
-        
-        # Check if provider supports async
-        if not hasattr(self.providers[provider_name], 'generate_async'):
-            raise ValueError(f"Provider '{provider_name}' does not support async calls")
-        
-        # Generate the response asynchronously
-        return await self.providers[provider_name].generate_async(prompt, model_id, **kwargs)
\ No newline at end of file
+                item = BatchItem.coerce(raw_item)
+                provider_name = self._resolve_route(item.model).provider_name
+            except Exception as e:
+                results[index] = BatchResult(index, item, error=e)
+                continue
+            pending.setdefault(provider_name, deque()).append((index, item))
+        return results, pending, total
+
+    @staticmethod
+    def _batch_worker_counts(pending, max_concurrency, provider_concurrency):
+        """Number of workers to run per provider queue"""
+        provider_concurrency = provider_concurrency or {}
+        return {
+            provider_name: max(1, min(provider_concurrency.get(provider_name, max_concurrency), max_concurrency, len(work)))
+            for provider_name, work in pending.items()
+        }
+
+    def generate_batch(self, items, max_concurrency=8, provider_concurrency=None):
+        """Generate responses for many items using a bounded thread pool.
+
+        Items may be prompt strings, (prompt, model, kwargs) tuples, dicts or
+        BatchItem objects. Returns a list of BatchResult in input order; a
+        failing item records its exception instead of aborting the batch.
+        """
+        results, pending, total = self._plan_batch(items)
+        worker_counts = self._batch_worker_counts(pending, max_concurrency, provider_concurrency)
+        limit = threading.BoundedSemaphore(max_concurrency)
+
+        def worker(work):
+            while True:
+                try:
+                    index, item = work.popleft()
+                except IndexError:
+                    return
+                with limit:
+                    try:
+                        response, target = self.generate(
+                            item.prompt, model=item.model, **{**item.kwargs, "return_target": True}
+                        )
+                        results[index] = BatchResult(index, item, response=response, target=target)
+                    except Exception as e:
+                        results[index] = BatchResult(index, item, error=e)
+
+        if pending:
+            with ThreadPoolExecutor(max_workers=sum(worker_counts.values())) as executor:
+                for provider_name, work in pending.items():
+                    for _ in range(worker_counts[provider_name]):
+                        executor.submit(worker, work)
+
+        return [results[index] for index in range(total)]
+
+    async def generate_batch_async(self, items, max_concurrency=32, provider_concurrency=None):
+        """Generate responses for many items concurrently with bounded fan-out.
+
+        At most max_concurrency requests are in flight overall, and at most
+        provider_concurrency[name] per provider. Each provider has its own
+        work queue so a slow provider never blocks the others. Returns a list
+        of BatchResult in input order.
+        """
+        results, pending, total = self._plan_batch(items)
+        worker_counts = self._batch_worker_counts(pending, max_concurrency, provider_concurrency)
+        limit = asyncio.Semaphore(max_concurrency)
+
+        async def worker(work):
+            while work:
+                index, item = work.popleft()
+                async with limit:
+                    try:
+                        response, target = await self.generate_async(
+                            item.prompt, model=item.model, **{**item.kwargs, "return_target": True}
+                        )
+                        results[index] = BatchResult(index, item, response=response, target=target)
+                    except Exception as e:
+                        results[index] = BatchResult(index, item, error=e)
+
+        await asyncio.gather(*(
+            worker(work)
+            for provider_name, work in pending.items()
+            for _ in range(worker_counts[provider_name])
+        ))
+
+        return [results[index] for index in range(total)]
@@ -1,24 +1,82 @@
-from .azure import AzureProvider
-from .anthropic import AnthropicProvider
-from .abacus import AbacusProvider
-from .bedrock import BedrockProvider
-from .ollama import OllamaProvider
-# from .vLLM import VLLMProvider
-
-PROVIDER_MAP = {
-    "azure": AzureProvider,
-    "anthropic": AnthropicProvider,
-    "abacus": AbacusProvider,
-    "bedrock": BedrockProvider,
-    "ollama": OllamaProvider,
-    # "vLLM": VLLMProvider
+import importlib
+from collections.abc import MutableMapping
+
+# Provider name -> (module, class). Modules are imported on first lookup so that
+# `import llm_manager` does not pull in every provider SDK.
+_PROVIDER_SPECS = {
+    "azure": (".azure", "AzureProvider"),
+    "anthropic": (".anthropic", "AnthropicProvider"),
+    "abacus": (".abacus", "AbacusProvider"),
+    "bedrock": (".bedrock", "BedrockProvider"),
+    "ollama": (".ollama", "OllamaProvider"),
+    # "vLLM": (".vLLM", "VLLMProvider"),
 }
 
-__all__ = ["AzureProvider", 
-           "AnthropicProvider", 
-           "AbacusProvider", 
+
+def _import_provider(module_name, class_name):
+    """Import a provider class from its module in this package"""
+    module = importlib.import_module(module_name, __name__)
+    return getattr(module, class_name)
+
+
+class ProviderRegistry(MutableMapping):
+    """Mapping of provider names to provider classes, imported lazily"""
+
+    def __init__(self, specs):
+        self._specs = dict(specs)
+        self._classes = {}
+
+    def __getitem__(self, name):
+        if name not in self._classes:
+            module_name, class_name = self._specs[name]
+            try:
+                self._classes[name] = _import_provider(module_name, class_name)
+            except ImportError as e:
+                raise ImportError(f"Provider '{name}' could not be loaded: {e}") from e
+        return self._classes[name]
+
+    def __setitem__(self, name, provider_class):
+        self._classes[name] = provider_class
+
+    def __delitem__(self, name):
+        if name not in self:
+            raise KeyError(name)
+        self._classes.pop(name, None)
+        self._specs.pop(name, None)
+
+    def __contains__(self, name):
+        # Checked without importing the provider module
+        return name in self._classes or name in self._specs
+
+    def __iter__(self):
+        yield from self._specs
+        yield from (name for name in self._classes if name not in self._specs)
+
+    def __len__(self):
+        return len(self._specs.keys() | self._classes.keys())
+
+    def is_loaded(self, name):
+        """Check whether a provider class has already been imported"""
+        return name in self._classes
+
+
+PROVIDER_MAP = ProviderRegistry(_PROVIDER_SPECS)
+
+_CLASS_SPECS = {class_name: (module_name, class_name) for module_name, class_name in _PROVIDER_SPECS.values()}
+
+
+def __getattr__(name):
+    """Import provider classes on attribute access, e.g. `from .providers import AzureProvider`"""
+    if name in _CLASS_SPECS:
+        return _import_provider(*_CLASS_SPECS[name])
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+__all__ = ["AzureProvider",
+           "AnthropicProvider",
+           "AbacusProvider",
            "BedrockProvider",
            "OllamaProvider",
         #    "VLLMProvider",
+           "ProviderRegistry",
            "PROVIDER_MAP"]
-
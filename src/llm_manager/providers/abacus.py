@@ -1,5 +1,15 @@
+import asyncio
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
 import abacusai
+import requests
 from .base import BaseProvider
+from ..errors import RequestTimeoutError, ServerError, error_for_status
+
+# Worker threads for generate_async when the provider sets no max_concurrency
+DEFAULT_MAX_WORKERS = 8
 
 class AbacusProvider(BaseProvider):
 
@@ -7,22 +17,87 @@ class AbacusProvider(BaseProvider):
         super().__init__(config)
         self.api_key = config.get("api_key")
         self.models = config.get("models", {})
+        self._clients = {}  # Cache for API clients
+        self._executor = None  # Thread pool for generate_async, created on first use
+        self._executor_lock = threading.Lock()
+
+    def _create_cache_key(self, model_config):
+        """Create a cache key based on the model configuration"""
+        return (
+            model_config.get("api_key", self.api_key),
+        )
+
+    def _get_client(self, model_config):
+        """Get or create an Abacus API client for the given model config"""
+        cache_key = self._create_cache_key(model_config)
+
+        if cache_key not in self._clients:
+            self._clients[cache_key] = abacusai.ApiClient(api_key=cache_key[0])
+
+        return self._clients[cache_key]
+
+    def _get_executor(self):
+        """Bounded thread pool that runs the blocking SDK for generate_async.
+
+        Sized by the provider's max_concurrency, so async callers never hold
+        more Abacus requests in flight than the rate limiter allows.
+        """
+        if self._executor is None:
+            with self._executor_lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=self.config.get("max_concurrency") or DEFAULT_MAX_WORKERS,
+                        thread_name_prefix="abacus",
+                    )
+        return self._executor
+
+    def close_clients(self):
+        """Forget cached clients and stop the async worker threads"""
+        self._clients.clear()
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+    def _translate_error(self, e):
+        """Convert an SDK or HTTP transport exception into the matching LLMError"""
+        if isinstance(e, abacusai.ApiException):
+            return error_for_status(e.http_status, f"Abacus error: {e.message}", "abacus")
+        message = f"Abacus error: {str(e)}"
+        if isinstance(e, requests.exceptions.Timeout):
+            return RequestTimeoutError(message, provider="abacus")
+        # The SDK calls the API with requests, so connection refused, DNS
+        # failures and exhausted retries surface as requests exceptions
+        return ServerError(message, provider="abacus")
 
     def generate(self, prompt, model_id, **kwargs):
         if not self.is_enabled():
             raise ValueError("Abacus provider is not enabled")
-        
+
         if model_id not in self.models:
             raise ValueError(f"Unknown Abacus model: {model_id}")
-        
+
         model_config = self.models[model_id]
-        client = abacusai.ApiClient(api_key=self.api_key)
+        client = self._get_client(model_config)
 
-        response = client.evaluate_prompt(
-            prompt=prompt,
-            llm_name=model_config.get("model_id"),
-            **kwargs
-        )
+        try:
+            response = client.evaluate_prompt(
+                prompt=prompt,
+                llm_name=model_config.get("model_id"),
+                **kwargs
+            )
+        except (abacusai.ApiException, requests.exceptions.RequestException) as e:
+            raise self._translate_error(e) from e
 
         return response
 
+    async def generate_async(self, prompt, model_id, **kwargs):
+        """Generate a response without blocking the event loop.
+
+        The Abacus SDK is synchronous, so the call runs on the provider's
+        bounded thread pool; a cancelled caller stops waiting but the
+        request itself runs to completion.
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._get_executor(), functools.partial(self.generate, prompt, model_id, **kwargs)
+        )
@@ -1,17 +1,99 @@
-from anthropic import Anthropic
+import asyncio
+import anthropic
+from anthropic import Anthropic, AsyncAnthropic
 from .base import BaseProvider
+from ..errors import LLMError, RequestTimeoutError, ServerError, error_for_status, retry_after_from_headers
+from ..streaming import StreamEvent, TEXT, THINKING, make_usage
+from ..result import UsageText
+from ..utils.prompt_cache import add_cache_breakpoints, prompt_cache_threshold
+
+def _translate_error(e: Exception) -> LLMError:
+    """Convert an Anthropic SDK exception into the matching LLMError"""
+    if isinstance(e, LLMError):
+        return e
+    message = f"Error calling Anthropic API: {str(e)}"
+    if isinstance(e, anthropic.APITimeoutError):
+        return RequestTimeoutError(message, provider="anthropic")
+    if isinstance(e, anthropic.APIConnectionError):
+        return ServerError(message, provider="anthropic")
+    if isinstance(e, anthropic.APIStatusError):
+        retry_after = retry_after_from_headers(e.response.headers)
+        return error_for_status(e.status_code, message, "anthropic", retry_after)
+    return LLMError(message, provider="anthropic")
+
 
 class AnthropicProvider(BaseProvider):
     """Provider for Anthropic Claude models"""
     
+    # Accepts the per-call prompt_cache option
+    supports_prompt_cache = True
+    
     def __init__(self, config):
         super().__init__(config)
         self.models = config.get("models", {})
         # Models that support thinking parameter
         self.thinking_supported_models = ["claude-sonnet-4", "claude-sonnet-3.7"]
+        self._clients = {}  # Cache for sync clients
+        # Cache for async clients, per event loop since their connection pools are bound to one
+        self._async_clients = {}
     
-    def generate(self, prompt, model_id, **kwargs):
-        """Generate a response using the specified Anthropic model"""
+    def _create_cache_key(self, model_config):
+        """Create a cache key based on the model configuration"""
+        return (
+            model_config.get("api_key", self.config.get("api_key")),
+        )
+    
+    def _get_client(self, model_config):
+        """Get or create a synchronous Anthropic client for the given model config"""
+        cache_key = self._create_cache_key(model_config)
+        
+        if cache_key not in self._clients:
+            self._clients[cache_key] = Anthropic(api_key=cache_key[0])
+        
+        return self._clients[cache_key]
+    
+    async def _get_async_client(self, model_config):
+        """Get or create an asynchronous Anthropic client for the running event loop and model config"""
+        await self._close_stale_clients()
+        clients = self._async_clients.setdefault(asyncio.get_running_loop(), {})
+        cache_key = self._create_cache_key(model_config)
+        
+        if cache_key not in clients:
+            clients[cache_key] = AsyncAnthropic(api_key=cache_key[0])
+        
+        return clients[cache_key]
+    
+    def close_clients(self):
+        """Close all cached sync clients and forget the async ones"""
+        for client in self._clients.values():
+            client.close()
+        self._clients.clear()
+        # Async clients must be closed from their event loop with `await provider.aclose()`
+        self._async_clients.clear()
+    
+    async def _close_stale_clients(self):
+        """Close the clients of event loops that have since closed.
+
+        Their connection pools hold on to the loop, so callers that run one
+        loop per request (asyncio.run per call) would otherwise keep every
+        loop and its connections alive.
+        """
+        for loop in [loop for loop in self._async_clients if loop.is_closed()]:
+            for client in self._async_clients.pop(loop, {}).values():
+                try:
+                    await client.close()
+                except RuntimeError:
+                    # Connections of a closed loop cannot be shut down cleanly; dropping them frees the sockets
+                    pass
+    
+    async def aclose(self):
+        """Close the async clients of the running event loop"""
+        clients = self._async_clients.pop(asyncio.get_running_loop(), {})
+        for client in clients.values():
+            await client.close()
+    
+    def _prepare_request(self, prompt, model_id, kwargs):
+        """Validate the model and build (model_config, request_params, using_thinking)"""
         if not self.is_enabled():
             raise ValueError("Anthropic provider is not enabled")
         
@@ -19,11 +101,9 @@ class AnthropicProvider(BaseProvider):
             raise ValueError(f"Unknown Anthropic model: {model_id}")
         
         model_config = self.models[model_id]
-        api_key = model_config.get("api_key")
+        min_cache_tokens = prompt_cache_threshold(self.config, model_config, kwargs)
 
         merged_config = {**model_config, **kwargs}
-        
-        client = Anthropic(api_key=api_key)
 
         # print(merged_config.get("system", ""))
         
@@ -36,9 +116,12 @@ class AnthropicProvider(BaseProvider):
             "stream": merged_config.get("stream", False)
         }
         
-        # Add system prompt if provided
-        if merged_config.get("system"):
-            request_params["system"] = merged_config.get("system")
+        # Add system prompt if provided, and cache breakpoints on its stable parts
+        system, request_params["messages"][0]["content"] = add_cache_breakpoints(
+            merged_config.get("system"), prompt, min_cache_tokens
+        )
+        if system:
+            request_params["system"] = system
 
         # Handle thinking parameter
         supports_thinking = any(model in model_id for model in self.thinking_supported_models)
@@ -78,33 +161,130 @@ class AnthropicProvider(BaseProvider):
             )
             print(warning_msg)
         
-        # Add any remaining kwargs to the request
-        request_params.update(kwargs)
+        # Add any remaining kwargs to the request; the system prompt was set above
+        request_params.update({key: value for key, value in kwargs.items() if key != "system"})
+
+        return model_config, request_params, using_thinking
+
+    def _stream_events(self, event, state):
+        """Translate an Anthropic stream event into normalized events"""
+        if event.type == "message_start":
+            usage = event.message.usage
+            state["usage"] = make_usage(
+                usage.input_tokens,
+                usage.output_tokens,
+                cache_read_tokens=getattr(usage, "cache_read_input_tokens", None),
+                cache_write_tokens=getattr(usage, "cache_creation_input_tokens", None),
+            )
+        elif event.type == "content_block_delta":
+            if event.delta.type == "thinking_delta":
+                yield StreamEvent(THINKING, event.delta.thinking)
+            elif event.delta.type == "text_delta":
+                yield StreamEvent(TEXT, event.delta.text)
+        elif event.type == "message_delta":
+            state["finish_reason"] = event.delta.stop_reason
+            if event.usage is not None:
+                state.setdefault("usage", {})["output_tokens"] = event.usage.output_tokens
+
+    @staticmethod
+    def _thinking_response(thinking_parts, response_parts, state):
+        """Response of a thinking request: both texts plus the usage seen on the stream"""
+        return {
+            "thinking": "".join(thinking_parts),
+            "response": "".join(response_parts),
+            "usage": state.get("usage"),
+        }
+
+    @staticmethod
+    def _text_response(message):
+        """Text of a message, keeping its usage on it"""
+        usage = make_usage(
+            message.usage.input_tokens,
+            message.usage.output_tokens,
+            cache_read_tokens=getattr(message.usage, "cache_read_input_tokens", None),
+            cache_write_tokens=getattr(message.usage, "cache_creation_input_tokens", None),
+        )
+        return UsageText(message.content[0].text, usage)
+
+    def generate(self, prompt, model_id, **kwargs):
+        """Generate a response using the specified Anthropic model"""
+        model_config, request_params, using_thinking = self._prepare_request(prompt, model_id, kwargs)
+        client = self._get_client(model_config)
         
         # Make the API call
-        try:  
-              
+        try:
             # Handle response differently if thinking was used
             if using_thinking:
-                stream = client.messages.create(**request_params)
                 # Return both thinking and response
-
-                thinking_text = ""
-                response_text = ""
-                for chunk in stream:
-                    if chunk.type == "content_block_delta" and hasattr(chunk.delta, "thinking"):
-                        thinking_text += chunk.delta.thinking
-                    if chunk.type == "content_block_delta" and hasattr(chunk.delta, "text"):
-                        response_text += chunk.delta.text
-                    
-                return {
-                    "thinking": thinking_text,
-                    "response": response_text
-                }
+                thinking_parts = []
+                response_parts = []
+                state = {}
+                with client.messages.create(**request_params) as stream:
+                    for chunk in stream:
+                        for event in self._stream_events(chunk, state):
+                            if event.type == THINKING:
+                                thinking_parts.append(event.text)
+                            else:
+                                response_parts.append(event.text)
+                return self._thinking_response(thinking_parts, response_parts, state)
             else:
                 # Return just the response text
-                message = client.messages.create(**request_params)
-                return message.content[0].text
+                return self._text_response(client.messages.create(**request_params))
                 
         except Exception as e:
-            raise Exception(f"Error calling Anthropic API: {str(e)}")
+            raise _translate_error(e) from e
+
+    async def generate_async(self, prompt, model_id, **kwargs):
+        """Generate a response asynchronously using the specified Anthropic model"""
+        model_config, request_params, using_thinking = self._prepare_request(prompt, model_id, kwargs)
+        client = await self._get_async_client(model_config)
+
+        try:
+            if using_thinking:
+                thinking_parts = []
+                response_parts = []
+                state = {}
+                async with await client.messages.create(**request_params) as stream:
+                    async for chunk in stream:
+                        for event in self._stream_events(chunk, state):
+                            if event.type == THINKING:
+                                thinking_parts.append(event.text)
+                            else:
+                                response_parts.append(event.text)
+                return self._thinking_response(thinking_parts, response_parts, state)
+            return self._text_response(await client.messages.create(**request_params))
+        except Exception as e:
+            raise _translate_error(e) from e
+
+    def stream(self, prompt, model_id, **kwargs):
+        """Stream normalized text/thinking deltas, ending with a usage event"""
+        model_config, request_params, _ = self._prepare_request(prompt, model_id, kwargs)
+        request_params["stream"] = True
+        client = self._get_client(model_config)
+        state = {}
+
+        try:
+            with client.messages.create(**request_params) as stream:
+                for chunk in stream:
+                    yield from self._stream_events(chunk, state)
+        except Exception as e:
+            raise _translate_error(e) from e
+
+        yield StreamEvent.final(state)
+
+    async def astream(self, prompt, model_id, **kwargs):
+        """Asynchronously stream normalized text/thinking deltas, ending with a usage event"""
+        model_config, request_params, _ = self._prepare_request(prompt, model_id, kwargs)
+        request_params["stream"] = True
+        client = await self._get_async_client(model_config)
+        state = {}
+
+        try:
+            async with await client.messages.create(**request_params) as stream:
+                async for chunk in stream:
+                    for event in self._stream_events(chunk, state):
+                        yield event
+        except Exception as e:
+            raise _translate_error(e) from e
+
+        yield StreamEvent.final(state)
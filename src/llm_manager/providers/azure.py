@@ -1,16 +1,91 @@
+import json
+import openai
 from openai import AzureOpenAI, AsyncAzureOpenAI
+from openai.types.chat import ChatCompletion
+from openai.types.responses import Response
 from .base import BaseProvider
+from ..errors import (
+    LLMError, RequestTimeoutError, ServerError, ContentFilteredError, error_for_status, retry_after_from_headers,
+)
+from ..streaming import StreamEvent, TEXT, THINKING, make_usage
+from ..utils.load_balancer import DeploymentPool, LEAST_OUTSTANDING, DEFAULT_COOLDOWN_SECONDS
+from ..batch import BatchItem, BatchJobMixin, BatchResult, spool_jsonl
+from ..result import LLMResult
+from contextlib import contextmanager
 import warnings
-from typing import Dict, Any, Optional, Tuple
+from typing import Dict, Any, List, Optional, Tuple, Iterator, AsyncIterator
 
-class AzureProvider(BaseProvider):
+# Batch states after which a batch no longer changes
+_BATCH_DONE = ("completed", "failed", "expired", "cancelled")
+
+def _translate_error(e: openai.OpenAIError) -> LLMError:
+    """Convert an OpenAI SDK exception into the matching LLMError"""
+    message = f"Azure error: {str(e)}"
+    if isinstance(e, openai.APITimeoutError):
+        return RequestTimeoutError(message, provider="azure")
+    if isinstance(e, openai.APIConnectionError):
+        return ServerError(message, provider="azure")
+    if isinstance(e, openai.ContentFilterFinishReasonError):
+        return ContentFilteredError(message, provider="azure")
+    if isinstance(e, openai.APIStatusError):
+        retry_after = retry_after_from_headers(e.response.headers)
+        if getattr(e, "code", None) == "content_filter":
+            return ContentFilteredError(message, provider="azure", status_code=e.status_code)
+        return error_for_status(e.status_code, message, "azure", retry_after)
+    return LLMError(message, provider="azure")
+
+
+class AzureProvider(BaseProvider, BatchJobMixin):
     """Provider for Azure OpenAI models"""
     
+    _provider_name = "azure"
+    
     def __init__(self, config):
         super().__init__(config)
         self.models = config.get("models", {})
         self._clients = {}  # Cache for sync clients
         self._async_clients = {}  # Cache for async clients
+        self._pools = {
+            model_id: self._create_pool(model_config)
+            for model_id, model_config in self.models.items()
+            if model_config.get("deployments")
+        }
+    
+    def _create_pool(self, model_config: Dict[str, Any]) -> DeploymentPool:
+        """Build the deployment pool of a model that lists several deployments"""
+        shared = {key: value for key, value in model_config.items() if key != "deployments"}
+        return DeploymentPool(
+            [{**shared, **deployment} for deployment in model_config["deployments"]],
+            strategy=model_config.get("load_balancing", LEAST_OUTSTANDING),
+            cooldown_seconds=model_config.get("cooldown_seconds", DEFAULT_COOLDOWN_SECONDS),
+        )
+    
+    @contextmanager
+    def _deployment(self, model_id: str, model_config: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+        """Yield the config of the deployment serving one request.
+
+        Models with a `deployments` list are load balanced over them; the
+        chosen deployment is told about failures so it can cool down.
+        """
+        pool = self._pools.get(model_id)
+        if pool is None:
+            yield model_config
+            return
+        deployment = pool.acquire()
+        try:
+            yield deployment.config
+        except Exception as e:
+            pool.release(deployment, e)
+            raise
+        except BaseException:
+            pool.release(deployment)
+            raise
+        pool.release(deployment)
+    
+    def deployment_stats(self, model_id: str) -> list:
+        """Load and health of each deployment of a load-balanced model"""
+        pool = self._pools.get(model_id)
+        return pool.stats() if pool is not None else []
     
     def _create_cache_key(self, model_config: Dict[str, Any]) -> Tuple:
         """Create a cache key based on the model configuration"""
@@ -102,8 +177,9 @@ class AzureProvider(BaseProvider):
             messages.append({"role": "user", "content": prompt})
             return messages
     
-    def generate(self, prompt: str, model_id: str, **kwargs) -> Any:
-        """Generate a response using the specified Azure model"""
+    def _build_request(self, prompt: str, model_id: str, kwargs: Dict[str, Any],
+                       stream: bool = False) -> Tuple[Dict[str, Any], bool, Dict[str, Any]]:
+        """Validate the model and build (model_config, uses_responses_api, request params)"""
         if not self.is_enabled():
             raise ValueError("Azure provider is not enabled")
         
@@ -113,77 +189,231 @@ class AzureProvider(BaseProvider):
         model_config = self.models[model_id]
         request_kwargs, system_prompt = self._prepare_request_params(kwargs)
         supports_reasoning, supports_reasoning_summary = self._get_model_capabilities(model_config)
-        client = self._get_client(model_config)
 
         if supports_reasoning_summary:
+            # Reasoning models with summaries go through the Responses API
             reasoning_params = self._prepare_reasoning_params(kwargs, request_kwargs)
-            response = client.responses.create(
+            # Without a summary level the API returns no summaries, so streams would show no reasoning progress
+            reasoning_params.setdefault("summary", model_config.get("summary_level", "auto" if stream else None))
+            if reasoning_params["summary"] is None:
+                del reasoning_params["summary"]
+            params = dict(
                 input=prompt,
                 model=model_config.get("model_id"),
                 reasoning=reasoning_params,
                 **request_kwargs
             )
-            return response
+            return model_config, True, params
 
-        elif supports_reasoning:
-            # For o1 models that support reasoning but not summary
-            messages = self._get_message_format(model_id, system_prompt, prompt)
-            response = client.chat.completions.create(
-                model=model_config.get("model_id"),
-                messages=messages,
-                **request_kwargs
-            )
-            return response
+        # Regular models and o1 models that support reasoning but not summary
+        messages = self._get_message_format(model_id, system_prompt, prompt)
+        params = dict(
+            model=model_config.get("model_id"),
+            messages=messages,
+            **request_kwargs
+        )
+        return model_config, False, params
+    
+    def generate(self, prompt: str, model_id: str, **kwargs) -> Any:
+        """Generate a response using the specified Azure model"""
+        model_config, use_responses, params = self._build_request(prompt, model_id, kwargs)
 
-        else:
-            # Regular models
-            messages = self._get_message_format(model_id, system_prompt, prompt)
-            response = client.chat.completions.create(
-                model=model_config.get("model_id"),
-                messages=messages,
-                **request_kwargs
-            )
-            return response
+        with self._deployment(model_id, model_config) as deployment_config:
+            client = self._get_client(deployment_config)
+            try:
+                if use_responses:
+                    return client.responses.create(**params)
+                return client.chat.completions.create(**params)
+            except openai.OpenAIError as e:
+                raise _translate_error(e) from e
     
     async def generate_async(self, prompt: str, model_id: str, **kwargs) -> Any:
         """Generate a response asynchronously using the specified Azure model"""
-        if not self.is_enabled():
-            raise ValueError("Azure provider is not enabled")
-        
+        model_config, use_responses, params = self._build_request(prompt, model_id, kwargs)
+
+        with self._deployment(model_id, model_config) as deployment_config:
+            client = self._get_async_client(deployment_config)
+            try:
+                if use_responses:
+                    return await client.responses.create(**params)
+                return await client.chat.completions.create(**params)
+            except openai.OpenAIError as e:
+                raise _translate_error(e) from e
+
+    def _chat_stream_events(self, chunk: Any, state: Dict[str, Any]) -> Iterator[StreamEvent]:
+        """Translate a chat.completions stream chunk into normalized events"""
+        if getattr(chunk, "usage", None):
+            details = getattr(chunk.usage, "completion_tokens_details", None)
+            state["usage"] = make_usage(
+                chunk.usage.prompt_tokens,
+                chunk.usage.completion_tokens,
+                getattr(details, "reasoning_tokens", None),
+            )
+        for choice in chunk.choices:
+            content = getattr(choice.delta, "content", None)
+            if content:
+                yield StreamEvent(TEXT, content)
+            if choice.finish_reason:
+                state["finish_reason"] = choice.finish_reason
+
+    def _responses_stream_events(self, event: Any, state: Dict[str, Any]) -> Iterator[StreamEvent]:
+        """Translate a Responses API stream event into normalized events"""
+        if event.type == "response.output_text.delta":
+            yield StreamEvent(TEXT, event.delta)
+        elif event.type == "response.reasoning_summary_text.delta":
+            yield StreamEvent(THINKING, event.delta)
+        elif event.type in ("response.completed", "response.incomplete"):
+            response = event.response
+            usage = response.usage
+            if usage is not None:
+                details = getattr(usage, "output_tokens_details", None)
+                state["usage"] = make_usage(
+                    usage.input_tokens,
+                    usage.output_tokens,
+                    getattr(details, "reasoning_tokens", None),
+                )
+            details = getattr(response, "incomplete_details", None)
+            state["finish_reason"] = getattr(details, "reason", None) or response.status
+
+    def stream(self, prompt: str, model_id: str, **kwargs) -> Iterator[StreamEvent]:
+        """Stream normalized text/thinking deltas, ending with a usage event"""
+        model_config, use_responses, params = self._build_request(prompt, model_id, kwargs, stream=True)
+        state = {}
+
+        with self._deployment(model_id, model_config) as deployment_config:
+            client = self._get_client(deployment_config)
+            try:
+                if use_responses:
+                    with client.responses.create(stream=True, **params) as stream:
+                        for event in stream:
+                            yield from self._responses_stream_events(event, state)
+                else:
+                    params.setdefault("stream_options", {"include_usage": True})
+                    with client.chat.completions.create(stream=True, **params) as stream:
+                        for chunk in stream:
+                            yield from self._chat_stream_events(chunk, state)
+            except openai.OpenAIError as e:
+                raise _translate_error(e) from e
+
+        yield StreamEvent.final(state)
+
+    async def astream(self, prompt: str, model_id: str, **kwargs) -> AsyncIterator[StreamEvent]:
+        """Asynchronously stream normalized text/thinking deltas, ending with a usage event"""
+        model_config, use_responses, params = self._build_request(prompt, model_id, kwargs, stream=True)
+        state = {}
+
+        with self._deployment(model_id, model_config) as deployment_config:
+            client = self._get_async_client(deployment_config)
+            try:
+                if use_responses:
+                    async with await client.responses.create(stream=True, **params) as stream:
+                        async for event in stream:
+                            for stream_event in self._responses_stream_events(event, state):
+                                yield stream_event
+                else:
+                    params.setdefault("stream_options", {"include_usage": True})
+                    async with await client.chat.completions.create(stream=True, **params) as stream:
+                        async for chunk in stream:
+                            for stream_event in self._chat_stream_events(chunk, state):
+                                yield stream_event
+            except openai.OpenAIError as e:
+                raise _translate_error(e) from e
+
+        yield StreamEvent.final(state)
+
+    def _get_batch_config(self, model_id: str) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """(client config, batch settings) for a batch; a pooled model submits through its first deployment"""
         if model_id not in self.models:
             raise ValueError(f"Unknown Azure model: {model_id}")
-        
-        model_config = self.models[model_id]
-        request_kwargs, system_prompt = self._prepare_request_params(kwargs)
-        supports_reasoning, supports_reasoning_summary = self._get_model_capabilities(model_config)
-        client = self._get_async_client(model_config)
+        pool = self._pools.get(model_id)
+        client_config = pool.deployments[0].config if pool is not None else self.models[model_id]
+        batch_config = {**(self.config.get("batch") or {}), **(self.models[model_id].get("batch") or {})}
+        return client_config, batch_config
 
-        if supports_reasoning_summary:
-            reasoning_params = self._prepare_reasoning_params(kwargs, request_kwargs)
-            response = await client.responses.create(
-                input=prompt,
-                model=model_config.get("model_id"),
-                reasoning=reasoning_params,
-                **request_kwargs
-            )
-            return response
+    def _batch_requests(self, items, model_id: str, endpoint: str, batch_config: Dict[str, Any],
+                        kwargs: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+        """Batch request lines with the same body as generate, addressed to the batch deployment"""
+        for index, item in self._iter_batch_items(items, model_id):
+            _, _, params = self._build_request(item.prompt, model_id, {**kwargs, **item.kwargs})
+            # Batches run on a Global Batch deployment, which may differ from the live one
+            params["model"] = batch_config.get("deployment", params["model"])
+            yield {"custom_id": str(index), "method": "POST", "url": endpoint, "body": params}
 
-        elif supports_reasoning:
-            # For o1 models that support reasoning but not summary
-            messages = self._get_message_format(model_id, system_prompt, prompt)
-            response = await client.chat.completions.create(
-                model=model_config.get("model_id"),
-                messages=messages,
-                **request_kwargs
-            )
-            return response
+    def submit_batch_job(self, items, model_id: str, **kwargs) -> str:
+        """Write items as a request JSONL file, upload it and create a batch; returns the batch ID.
 
-        else:
-            # Regular models
-            messages = self._get_message_format(model_id, system_prompt, prompt)
-            response = await client.chat.completions.create(
-                model=model_config.get("model_id"),
-                messages=messages,
-                **request_kwargs
-            )
-            return response
+        Items may be prompt strings, (prompt, model, kwargs) tuples, dicts or
+        BatchItem objects; each becomes the same chat completions or
+        Responses API request as generate, with its position as custom_id.
+        """
+        client_config, batch_config = self._get_batch_config(model_id)
+        _, uses_responses = self._get_model_capabilities(self.models[model_id])
+        endpoint = "/responses" if uses_responses else "/chat/completions"
+
+        with spool_jsonl(self._batch_requests(items, model_id, endpoint, batch_config, kwargs)) as requests_file:
+            client = self._get_client(client_config)
+            try:
+                input_file = client.files.create(file=("batch.jsonl", requests_file), purpose="batch")
+                batch = client.batches.create(
+                    input_file_id=input_file.id,
+                    endpoint=endpoint,
+                    completion_window=batch_config.get("completion_window", "24h"),
+                )
+            except openai.OpenAIError as e:
+                raise _translate_error(e) from e
+        return batch.id
+
+    def get_batch_job(self, batch_id: str, model_id: str) -> Any:
+        """Current state of a batch, including its status and output file IDs"""
+        client_config, _ = self._get_batch_config(model_id)
+        try:
+            return self._get_client(client_config).batches.retrieve(batch_id)
+        except openai.OpenAIError as e:
+            raise _translate_error(e) from e
+
+    def _batch_job_state(self, batch: Any) -> Tuple[str, bool, Optional[str]]:
+        """(status, finished, error) of a batch; failed, expired and cancelled batches did not succeed"""
+        if batch.status not in _BATCH_DONE or batch.status == "completed":
+            return batch.status, batch.status in _BATCH_DONE, None
+        errors = getattr(batch.errors, "data", None) or ()
+        return batch.status, True, "; ".join(error.message or "" for error in errors)
+
+    def iter_batch_results(self, batch_id: str, model_id: str, items: Optional[List[BatchItem]] = None) -> Iterator[BatchResult]:
+        """Stream the results of a finished batch as BatchResults, line by line.
+
+        result.index is the input position of the request; results arrive
+        in output-file order. Responses are LLMResults over the same SDK
+        objects generate returns, and failed requests carry an LLMError.
+        """
+        client_config, _ = self._get_batch_config(model_id)
+        client = self._get_client(client_config)
+        batch = self.get_batch_job(batch_id, model_id)
+        response_type = Response if batch.endpoint.endswith("/responses") else ChatCompletion
+        target = f"azure/{model_id}"
+
+        try:
+            for file_id in (batch.output_file_id, batch.error_file_id):
+                if not file_id:
+                    continue
+                with client.files.with_streaming_response.content(file_id) as content:
+                    for line in content.iter_lines():
+                        if not line.strip():
+                            continue
+                        record = json.loads(line)
+                        index = int(record["custom_id"])
+                        item = items[index] if items is not None else None
+                        response = record.get("response") or {}
+                        status_code = response.get("status_code")
+                        if status_code == 200:
+                            result = LLMResult.from_response(response_type.model_validate(response["body"]), model=target)
+                            yield BatchResult(index, item, response=result, target=target)
+                            continue
+                        error = (response.get("body") or {}).get("error") or record.get("error") or {}
+                        if error.get("code") == "content_filter":
+                            batch_error = ContentFilteredError(f"Azure error: {error.get('message')}", provider="azure",
+                                                               status_code=status_code)
+                        else:
+                            batch_error = error_for_status(status_code, f"Azure error: {error.get('message')}", "azure")
+                        yield BatchResult(index, item, error=batch_error)
+        except openai.OpenAIError as e:
+            raise _translate_error(e) from e
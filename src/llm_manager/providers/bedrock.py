@@ -1,20 +1,102 @@
 # bedrock_provider.py
+import asyncio
 import boto3
 import json
-from botocore.exceptions import ClientError
+import re
+import time
+import uuid
+from contextlib import AsyncExitStack
+from botocore.config import Config
+from botocore.exceptions import BotoCoreError, ClientError, ConnectTimeoutError, ReadTimeoutError
 from .base import BaseProvider
-from typing import Dict, Any, List, Optional, Tuple
+from ..errors import (
+    LLMError, RateLimitedError, RequestTimeoutError, ServerError, BadRequestError, ContentFilteredError,
+    error_for_status, retry_after_from_headers,
+)
+from ..streaming import StreamEvent, TEXT, THINKING, make_usage
+from ..batch import BatchItem, BatchJobMixin, BatchResult, spool_jsonl
+from ..result import LLMResult
+from ..utils.prompt_cache import add_cache_breakpoints, prompt_cache_threshold
+from typing import Dict, Any, List, Optional, Tuple, Iterator, AsyncIterator
 import aioboto3
 
-class BedrockProvider(BaseProvider):
+# Batch inference job states after which a job no longer changes
+_BATCH_DONE = ("Completed", "PartiallyCompleted", "Failed", "Stopped", "Expired")
+_BATCH_SUCCEEDED = ("Completed", "PartiallyCompleted")
+
+# Connections per client when the provider sets neither max_pool_connections nor max_concurrency
+DEFAULT_MAX_POOL_CONNECTIONS = 50
+
+# Bedrock error codes -> LLMError subclasses
+_ERROR_CODES = {
+    "ThrottlingException": RateLimitedError,
+    "ServiceQuotaExceededException": RateLimitedError,
+    "TooManyRequestsException": RateLimitedError,
+    "ModelTimeoutException": RequestTimeoutError,
+    "InternalServerException": ServerError,
+    "ServiceUnavailableException": ServerError,
+    "ModelNotReadyException": ServerError,
+    "ModelStreamErrorException": ServerError,
+    "ValidationException": BadRequestError,
+    "ResourceNotFoundException": BadRequestError,
+    "AccessDeniedException": LLMError,
+}
+
+
+def _split_s3_uri(uri: str) -> Tuple[str, str]:
+    """Split 's3://bucket/prefix' into (bucket, prefix without trailing slash)"""
+    if not uri.startswith("s3://"):
+        raise ValueError(f"Invalid S3 URI: {uri}. Use 's3://bucket/prefix' format.")
+    bucket, _, prefix = uri[len("s3://"):].partition("/")
+    return bucket, prefix.rstrip("/")
+
+
+def _translate_error(e: Exception) -> LLMError:
+    """Convert a botocore exception into the matching LLMError"""
+    if isinstance(e, ClientError):
+        error = e.response.get("Error", {})
+        metadata = e.response.get("ResponseMetadata", {})
+        message = f"Bedrock error: {error.get('Message', str(e))}"
+        status_code = metadata.get("HTTPStatusCode")
+        retry_after = retry_after_from_headers(metadata.get("HTTPHeaders"))
+        error_class = _ERROR_CODES.get(error.get("Code"))
+        if error_class is None:
+            return error_for_status(status_code, message, "bedrock", retry_after)
+        if error_class is BadRequestError and "guardrail" in message.lower():
+            error_class = ContentFilteredError
+        return error_class(message, provider="bedrock", status_code=status_code, retry_after=retry_after)
+    if isinstance(e, (ReadTimeoutError, ConnectTimeoutError)):
+        return RequestTimeoutError(f"Bedrock error: {e}", provider="bedrock")
+    # Connection failures and other transport errors
+    return ServerError(f"Bedrock error: {e}", provider="bedrock")
+
+
+class _LoopClients:
+    """Async clients entered on one event loop, and the stack that closes them"""
+
+    __slots__ = ("clients", "stack", "lock")
+
+    def __init__(self):
+        self.clients = {}
+        self.stack = AsyncExitStack()
+        self.lock = asyncio.Lock()
+
+
+class BedrockProvider(BaseProvider, BatchJobMixin):
     """Provider for AWS Bedrock models"""
     
+    # Accepts the per-call prompt_cache option
+    supports_prompt_cache = True
+    
+    _provider_name = "bedrock"
+    
     def __init__(self, config: Dict[str, Any]):
         """Initialize the Bedrock provider with configuration"""
         super().__init__(config)
         self.models = config.get("models", {})
         self._clients = {}  # Cache for sync clients
-        self._async_clients = {}  # Cache for async clients
+        # Cache for async clients, per event loop since aiobotocore clients are bound to one
+        self._async_clients = {}
         # Default models that support thinking parameter (used as fallback if config flag not provided)
         # self._default_thinking_supported_models = ["claude-sonnet-4", "claude-opus-4", "claude-sonnet-3.7"]
     
@@ -26,40 +108,99 @@ class BedrockProvider(BaseProvider):
             model_config.get("aws_secret_access_key", self.config.get("aws_secret_access_key"))
         )
     
+    def _get_client_config(self) -> Config:
+        """botocore settings shared by sync and async clients"""
+        return Config(
+            max_pool_connections=(
+                self.config.get("max_pool_connections")
+                or self.config.get("max_concurrency")
+                or DEFAULT_MAX_POOL_CONNECTIONS
+            ),
+        )
+    
     def _get_client(self, model_config: Dict[str, Any]):
         """Get or create a synchronous Bedrock client for the given model config"""
         cache_key = self._create_cache_key(model_config)
         
         if cache_key not in self._clients:
+            region_name, aws_access_key_id, aws_secret_access_key = cache_key
             self._clients[cache_key] = boto3.client(
                 service_name="bedrock-runtime",
-                region_name=model_config.get("region_name", self.config.get("region_name", "us-east-2")),
-                aws_access_key_id=model_config.get("aws_access_key_id", self.config.get("aws_access_key_id")),
-                aws_secret_access_key=model_config.get("aws_secret_access_key", self.config.get("aws_secret_access_key"))
+                region_name=region_name,
+                aws_access_key_id=aws_access_key_id,
+                aws_secret_access_key=aws_secret_access_key,
+                config=self._get_client_config(),
             )
         
         return self._clients[cache_key]
     
-    def _get_async_client(self, model_config: Dict[str, Any]):
-        """Create a fresh asynchronous Bedrock client for the given model config"""
-        # Create a fresh client for each request to avoid coroutine reuse issues
-        session = aioboto3.Session()
-        return session.client(
-            service_name="bedrock-runtime",
-            region_name=model_config.get("region_name", self.config.get("region_name", "us-east-2")),
-            aws_access_key_id=model_config.get("aws_access_key_id", self.config.get("aws_access_key_id")),
-            aws_secret_access_key=model_config.get("aws_secret_access_key", self.config.get("aws_secret_access_key"))
-        )
+    def _get_service_client(self, service_name: str, model_config: Dict[str, Any]):
+        """Get or create a synchronous client for another AWS service (bedrock, s3) with the model's credentials"""
+        cache_key = (service_name,) + self._create_cache_key(model_config)
+        
+        if cache_key not in self._clients:
+            _, region_name, aws_access_key_id, aws_secret_access_key = cache_key
+            self._clients[cache_key] = boto3.client(
+                service_name=service_name,
+                region_name=region_name,
+                aws_access_key_id=aws_access_key_id,
+                aws_secret_access_key=aws_secret_access_key,
+                config=self._get_client_config(),
+            )
+        
+        return self._clients[cache_key]
+    
+    async def _get_async_client(self, model_config: Dict[str, Any]):
+        """Get or create a long-lived async Bedrock client for the running event loop and model config"""
+        await self._close_stale_clients()
+        loop_clients = self._async_clients.get(asyncio.get_running_loop())
+        if loop_clients is None:
+            loop_clients = self._async_clients[asyncio.get_running_loop()] = _LoopClients()
+        cache_key = self._create_cache_key(model_config)
+        
+        client = loop_clients.clients.get(cache_key)
+        if client is None:
+            # Concurrent first calls share one client instead of each resolving credentials
+            async with loop_clients.lock:
+                client = loop_clients.clients.get(cache_key)
+                if client is None:
+                    region_name, aws_access_key_id, aws_secret_access_key = cache_key
+                    session = aioboto3.Session()
+                    client = await loop_clients.stack.enter_async_context(session.client(
+                        service_name="bedrock-runtime",
+                        region_name=region_name,
+                        aws_access_key_id=aws_access_key_id,
+                        aws_secret_access_key=aws_secret_access_key,
+                        config=self._get_client_config(),
+                    ))
+                    loop_clients.clients[cache_key] = client
+        
+        return client
     
     def close_clients(self):
-        """Close all cached clients to free resources"""
-        # Close sync clients
+        """Close all cached sync clients to free resources"""
         for client in self._clients.values():
             if hasattr(client, 'close'):
                 client.close()
         self._clients.clear()
-        
-        # Note: Async clients are now created fresh for each request, so no need to close cached ones
+    
+    async def _close_stale_clients(self):
+        """Close the clients of event loops that have since closed.
+
+        Their HTTP sessions hold on to the loop, so callers that run one loop
+        per request (asyncio.run per call) would otherwise keep every loop
+        and its connection pool alive.
+        """
+        for loop in [loop for loop in self._async_clients if loop.is_closed()]:
+            loop_clients = self._async_clients.pop(loop, None)
+            if loop_clients is not None:
+                await loop_clients.stack.aclose()
+    
+    async def aclose(self):
+        """Close the async clients of the running event loop"""
+        loop_clients = self._async_clients.pop(asyncio.get_running_loop(), None)
+        if loop_clients is not None:
+            await loop_clients.stack.aclose()
     
     def get_available_models(self) -> List[str]:
         """Get a list of available model IDs"""
@@ -140,8 +281,8 @@ class BedrockProvider(BaseProvider):
         
         return payload
     
-    def generate(self, prompt: str, model_id: str, **kwargs) -> Any:
-        """Generate a response using the specified Bedrock model"""
+    def _build_request(self, prompt: str, model_id: str, kwargs: Dict[str, Any]) -> Tuple[Dict[str, Any], str, str]:
+        """Validate the model and build (model_config, model_arn, JSON request body)"""
         if not self.is_enabled():
             raise ValueError("Bedrock provider is not enabled")
         
@@ -155,26 +296,15 @@ class BedrockProvider(BaseProvider):
         # If caller provided a raw payload, send it as-is (dict or JSON string)
         if "payload" in kwargs:
             user_payload = kwargs.get("payload")
-            client = self._get_client(model_config)
-            try:
-                if isinstance(user_payload, str):
-                    body = user_payload
-                else:
-                    body = json.dumps(user_payload)
-                response = client.invoke_model(
-                    modelId=model_arn,
-                    body=body,
-                    contentType="application/json",
-                    accept="application/json",
-                )
-                response_body = json.loads(response['body'].read())
-                return response_body
-            except ClientError as e:
-                error_message = f"Bedrock error: {e.response['Error']['Message']}"
-                raise Exception(error_message)
+            if isinstance(user_payload, str):
+                body = user_payload
+            else:
+                body = json.dumps(user_payload)
+            return model_config, model_arn, body
 
         # Prepare request parameters
         request_kwargs, system_prompt = self._prepare_request_params(kwargs)
+        min_cache_tokens = prompt_cache_threshold(self.config, model_config, request_kwargs)
         is_claude, supports_thinking = self._get_model_capabilities(model_id, model_arn, model_config)
         
         # Handle thinking parameters
@@ -198,6 +328,101 @@ class BedrockProvider(BaseProvider):
             prompt, model_arn, is_claude, system_prompt, 
             thinking_params, using_thinking, **request_kwargs
         )
+        if is_claude:
+            # Claude on Bedrock takes the same cache_control breakpoints as the Anthropic API
+            payload["system"], payload["messages"][0]["content"] = add_cache_breakpoints(
+                payload["system"], prompt, min_cache_tokens
+            )
+        return model_config, model_arn, json.dumps(payload)
+    
+    def _uses_converse(self, model_id: str) -> bool:
+        """Whether a model is called through the Converse API (opt-in with `converse: true`)"""
+        model_config = self.models.get(model_id) or {}
+        return bool(model_config.get("converse", self.config.get("converse", False)))
+    
+    def _build_converse_request(self, prompt: str, model_id: str, kwargs: Dict[str, Any]) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """Validate the model and build (model_config, Converse request params).
+
+        Converse uses one message schema for every Bedrock model family;
+        model-specific fields go in additionalModelRequestFields.
+        """
+        if not self.is_enabled():
+            raise ValueError("Bedrock provider is not enabled")
+        
+        if model_id not in self.models:
+            raise ValueError(f"Unknown Bedrock model: {model_id}")
+        
+        model_config = self.models[model_id]
+        model_arn = model_config.get("model_id")
+        
+        # A caller-provided payload is sent as the Converse request as-is
+        if "payload" in kwargs:
+            user_payload = kwargs["payload"]
+            if isinstance(user_payload, str):
+                user_payload = json.loads(user_payload)
+            return model_config, {"modelId": model_arn, **user_payload}
+        
+        request_kwargs, system_prompt = self._prepare_request_params(kwargs)
+        inference_config = {
+            "maxTokens": request_kwargs.get("max_tokens", 1000),
+            "temperature": request_kwargs.get("temperature", 0.7),
+        }
+        if "top_p" in request_kwargs:
+            inference_config["topP"] = request_kwargs["top_p"]
+        stop_sequences = request_kwargs.get("stop_sequences", request_kwargs.get("stop"))
+        if stop_sequences:
+            inference_config["stopSequences"] = stop_sequences
+        
+        additional_fields = dict(request_kwargs.get("additional_model_request_fields") or {})
+        if "top_k" in request_kwargs:
+            additional_fields["top_k"] = request_kwargs["top_k"]
+        if "thinking_tokens" in request_kwargs:
+            if model_config.get("thinking_supported") and "anthropic" in model_arn.lower():
+                additional_fields["thinking"] = {"type": "enabled", "budget_tokens": request_kwargs["thinking_tokens"]}
+            else:
+                print(
+                    f"Warning: 'thinking_tokens' parameter is not supported by the model '{model_id}'. "
+                    f"The parameter has been ignored for this request."
+                )
+        
+        params = {
+            "modelId": model_arn,
+            "messages": [{"role": "user", "content": [{"text": prompt}]}],
+            "inferenceConfig": inference_config,
+        }
+        if system_prompt:
+            params["system"] = [{"text": system_prompt}]
+        if additional_fields:
+            params["additionalModelRequestFields"] = additional_fields
+        return model_config, params
+    
+    @staticmethod
+    def _converse_response(response: Dict[str, Any]) -> Dict[str, Any]:
+        """A Converse response without the boto transport metadata"""
+        response.pop("ResponseMetadata", None)
+        return response
+    
+    def _converse(self, prompt: str, model_id: str, kwargs: Dict[str, Any]) -> Dict[str, Any]:
+        model_config, params = self._build_converse_request(prompt, model_id, kwargs)
+        client = self._get_client(model_config)
+        try:
+            return self._converse_response(client.converse(**params))
+        except (ClientError, BotoCoreError) as e:
+            raise _translate_error(e) from e
+    
+    async def _converse_async(self, prompt: str, model_id: str, kwargs: Dict[str, Any]) -> Dict[str, Any]:
+        model_config, params = self._build_converse_request(prompt, model_id, kwargs)
+        client = await self._get_async_client(model_config)
+        try:
+            return self._converse_response(await client.converse(**params))
+        except (ClientError, BotoCoreError) as e:
+            raise _translate_error(e) from e
+    
+    def generate(self, prompt: str, model_id: str, **kwargs) -> Any:
+        """Generate a response using the specified Bedrock model"""
+        if self._uses_converse(model_id):
+            return self._converse(prompt, model_id, kwargs)
+        model_config, model_arn, body = self._build_request(prompt, model_id, kwargs)
         
         # Get client and make request
         client = self._get_client(model_config)
@@ -205,7 +430,7 @@ class BedrockProvider(BaseProvider):
         try:
             response = client.invoke_model(
                 modelId=model_arn,
-                body=json.dumps(payload),
+                body=body,
                 contentType="application/json",
                 accept="application/json",
             )
@@ -216,87 +441,303 @@ class BedrockProvider(BaseProvider):
             # Return the raw response body instead of processed text
             return response_body
             
-        except ClientError as e:
-            error_message = f"Bedrock error: {e.response['Error']['Message']}"
-            raise Exception(error_message)
+        except (ClientError, BotoCoreError) as e:
+            raise _translate_error(e) from e
     
     async def generate_async(self, prompt: str, model_id: str, **kwargs) -> Any:
         """Generate a response asynchronously using the specified Bedrock model"""
-        if not self.is_enabled():
-            raise ValueError("Bedrock provider is not enabled")
+        if self._uses_converse(model_id):
+            return await self._converse_async(prompt, model_id, kwargs)
+        model_config, model_arn, body = self._build_request(prompt, model_id, kwargs)
         
-        if model_id not in self.models:
-            raise ValueError(f"Unknown Bedrock model: {model_id}")
-        
-        # Get model-specific config
-        model_config = self.models[model_id]
-        model_arn = model_config.get("model_id")
+        # Get async client and make request
+        client = await self._get_async_client(model_config)
         
-        # If caller provided a raw payload, send it as-is (dict or JSON string)
-        if "payload" in kwargs:
-            async_client = self._get_async_client(model_config)
+        try:
+            response = await client.invoke_model(
+                modelId=model_arn,
+                body=body,
+                contentType="application/json",
+                accept="application/json",
+            )
+            
+            # Parse the response body
+            response_body = json.loads(await response['body'].read())
+            
+            # Return the raw response body instead of processed text
+            return response_body
+            
+        except (ClientError, BotoCoreError) as e:
+            raise _translate_error(e) from e
+
+    def _stream_events(self, chunk: Dict[str, Any], state: Dict[str, Any]) -> Iterator[StreamEvent]:
+        """Translate a decoded response-stream chunk into normalized events"""
+        chunk_type = chunk.get("type")
+        if chunk_type == "message_start":
+            usage = chunk.get("message", {}).get("usage", {})
+            state["usage"] = make_usage(
+                usage.get("input_tokens"),
+                usage.get("output_tokens"),
+                cache_read_tokens=usage.get("cache_read_input_tokens"),
+                cache_write_tokens=usage.get("cache_creation_input_tokens"),
+            )
+        elif chunk_type == "content_block_delta":
+            delta = chunk.get("delta", {})
+            if delta.get("type") == "thinking_delta":
+                yield StreamEvent(THINKING, delta.get("thinking", ""))
+            elif delta.get("type") == "text_delta":
+                yield StreamEvent(TEXT, delta.get("text", ""))
+        elif chunk_type == "message_delta":
+            state["finish_reason"] = chunk.get("delta", {}).get("stop_reason")
+            if "output_tokens" in chunk.get("usage", {}):
+                state.setdefault("usage", {})["output_tokens"] = chunk["usage"]["output_tokens"]
+        elif chunk_type is None:
+            # Non-Claude model families stream flat chunks
+            text = chunk.get("outputText") or chunk.get("generation") or chunk.get("completion")
+            if text is None and chunk.get("outputs"):
+                text = chunk["outputs"][0].get("text")
+            if text:
+                yield StreamEvent(TEXT, text)
+            reason = chunk.get("completionReason") or chunk.get("stop_reason")
+            if reason:
+                state["finish_reason"] = reason
+        # Bedrock appends invocation metrics to the last chunk of every model family
+        metrics = chunk.get("amazon-bedrock-invocationMetrics")
+        if metrics:
+            state.setdefault("usage", {}).update(
+                make_usage(
+                    metrics.get("inputTokenCount"),
+                    metrics.get("outputTokenCount"),
+                    cache_read_tokens=metrics.get("cacheReadInputTokenCount"),
+                    cache_write_tokens=metrics.get("cacheWriteInputTokenCount"),
+                )
+            )
+
+    def _converse_stream_events(self, event: Dict[str, Any], state: Dict[str, Any]) -> Iterator[StreamEvent]:
+        """Translate a ConverseStream event into normalized events"""
+        if "contentBlockDelta" in event:
+            delta = event["contentBlockDelta"].get("delta", {})
+            if "text" in delta:
+                yield StreamEvent(TEXT, delta["text"])
+            elif delta.get("reasoningContent", {}).get("text"):
+                yield StreamEvent(THINKING, delta["reasoningContent"]["text"])
+        elif "messageStop" in event:
+            state["finish_reason"] = event["messageStop"].get("stopReason")
+        elif "metadata" in event:
+            usage = event["metadata"].get("usage", {})
+            state["usage"] = make_usage(
+                usage.get("inputTokens"),
+                usage.get("outputTokens"),
+                cache_read_tokens=usage.get("cacheReadInputTokens"),
+                cache_write_tokens=usage.get("cacheWriteInputTokens"),
+            )
+
+    def _converse_stream(self, prompt: str, model_id: str, kwargs: Dict[str, Any]) -> Iterator[StreamEvent]:
+        model_config, params = self._build_converse_request(prompt, model_id, kwargs)
+        client = self._get_client(model_config)
+        state = {}
+
+        try:
+            event_stream = client.converse_stream(**params)["stream"]
             try:
-                async with async_client as client:
-                    if isinstance(user_payload, str):
-                        body = user_payload
-                    else:
-                        body = json.dumps(user_payload)
-                    response = await client.invoke_model(
-                        modelId=model_arn,
-                        body=body,
-                        contentType="application/json",
-                        accept="application/json",
-                    )
-                    response_body = json.loads(await response['body'].read())
-                    return response_body
-            except ClientError as e:
-                error_message = f"Bedrock error: {e.response['Error']['Message']}"
-                raise Exception(error_message)
+                for event in event_stream:
+                    yield from self._converse_stream_events(event, state)
+            finally:
+                if hasattr(event_stream, "close"):
+                    event_stream.close()
+        except (ClientError, BotoCoreError) as e:
+            raise _translate_error(e) from e
 
-        # Prepare request parameters
-        request_kwargs, system_prompt = self._prepare_request_params(kwargs)
-        is_claude, supports_thinking = self._get_model_capabilities(model_id, model_arn, model_config)
-        
-        # Handle thinking parameters
-        if "thinking_tokens" in kwargs and not supports_thinking and is_claude:
-            # Remove the parameter and warn the user
-            kwargs.pop("thinking_tokens")
-            # Prefer models explicitly flagged in config; else fallback to default list
-            explicitly_flagged = [m for m, cfg in self.models.items() if cfg.get("thinking_supported")]
-            compatible_models = ", ".join(explicitly_flagged or self._default_thinking_supported_models)
-            warning_msg = (
-                f"Warning: 'thinking_tokens' parameter is not supported by the model '{model_id}'. "
-                f"This parameter is only compatible with the following models: {compatible_models}. "
-                f"The parameter has been ignored for this request."
+        yield StreamEvent.final(state)
+
+    async def _converse_astream(self, prompt: str, model_id: str, kwargs: Dict[str, Any]) -> AsyncIterator[StreamEvent]:
+        model_config, params = self._build_converse_request(prompt, model_id, kwargs)
+        client = await self._get_async_client(model_config)
+        state = {}
+
+        try:
+            event_stream = (await client.converse_stream(**params))["stream"]
+            try:
+                async for event in event_stream:
+                    for stream_event in self._converse_stream_events(event, state):
+                        yield stream_event
+            finally:
+                if hasattr(event_stream, "close"):
+                    event_stream.close()
+        except (ClientError, BotoCoreError) as e:
+            raise _translate_error(e) from e
+
+        yield StreamEvent.final(state)
+
+    def stream(self, prompt: str, model_id: str, **kwargs) -> Iterator[StreamEvent]:
+        """Stream normalized text/thinking deltas via invoke_model_with_response_stream or ConverseStream"""
+        if self._uses_converse(model_id):
+            yield from self._converse_stream(prompt, model_id, kwargs)
+            return
+        model_config, model_arn, body = self._build_request(prompt, model_id, kwargs)
+        client = self._get_client(model_config)
+        state = {}
+
+        try:
+            response = client.invoke_model_with_response_stream(
+                modelId=model_arn,
+                body=body,
+                contentType="application/json",
+                accept="application/json",
             )
-            print(warning_msg)
-        
-        thinking_params, using_thinking = self._prepare_thinking_params(kwargs, request_kwargs)
-        
-        # Prepare payload
-        payload = self._prepare_payload(
-            prompt, model_arn, is_claude, system_prompt, 
-            thinking_params, using_thinking, **request_kwargs
-        )
-        
-        # Get async client and make request
-        async_client = self._get_async_client(model_config)
-        
+            event_stream = response["body"]
+            try:
+                for event in event_stream:
+                    if "chunk" in event:
+                        yield from self._stream_events(json.loads(event["chunk"]["bytes"]), state)
+            finally:
+                if hasattr(event_stream, "close"):
+                    event_stream.close()
+        except (ClientError, BotoCoreError) as e:
+            raise _translate_error(e) from e
+
+        yield StreamEvent.final(state)
+
+    async def astream(self, prompt: str, model_id: str, **kwargs) -> AsyncIterator[StreamEvent]:
+        """Asynchronously stream normalized text/thinking deltas"""
+        if self._uses_converse(model_id):
+            events = self._converse_astream(prompt, model_id, kwargs)
+            try:
+                async for event in events:
+                    yield event
+            finally:
+                await events.aclose()
+            return
+        model_config, model_arn, body = self._build_request(prompt, model_id, kwargs)
+        client = await self._get_async_client(model_config)
+        state = {}
+
         try:
-            async with async_client as client:
-                response = await client.invoke_model(
+            response = await client.invoke_model_with_response_stream(
+                modelId=model_arn,
+                body=body,
+                contentType="application/json",
+                accept="application/json",
+            )
+            event_stream = response["body"]
+            try:
+                async for event in event_stream:
+                    if "chunk" in event:
+                        for stream_event in self._stream_events(json.loads(event["chunk"]["bytes"]), state):
+                            yield stream_event
+            finally:
+                # The client outlives the call, so release the connection of an abandoned stream
+                if hasattr(event_stream, "close"):
+                    event_stream.close()
+        except (ClientError, BotoCoreError) as e:
+            raise _translate_error(e) from e
+
+        yield StreamEvent.final(state)
+
+    def _get_batch_config(self, model_id: str) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """(model_config, batch settings) for a batch job; model settings override the provider's"""
+        if model_id not in self.models:
+            raise ValueError(f"Unknown Bedrock model: {model_id}")
+        model_config = self.models[model_id]
+        batch_config = {**(self.config.get("batch") or {}), **(model_config.get("batch") or {})}
+        return model_config, batch_config
+
+    def _batch_records(self, items, model_id: str, kwargs: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+        """Batch inference records built with the same payload logic as generate"""
+        for index, item in self._iter_batch_items(items, model_id):
+            # Prompt caching is for live traffic; batch records are sent without breakpoints
+            _, _, body = self._build_request(item.prompt, model_id, {"prompt_cache": False, **kwargs, **item.kwargs})
+            yield {"recordId": f"{index:011d}", "modelInput": json.loads(body)}
+
+    def submit_batch_job(self, items, model_id: str, job_name: Optional[str] = None, **kwargs) -> str:
+        """Stage items as a JSONL file in S3 and start a batch inference job; returns the job ARN.
+
+        Items may be prompt strings, (prompt, model, kwargs) tuples, dicts or
+        BatchItem objects; each is built with the same payload logic as
+        generate, and its recordId is its position in items.
+        """
+        model_config, batch_config = self._get_batch_config(model_id)
+        if not batch_config.get("s3_uri") or not batch_config.get("role_arn"):
+            raise ValueError("Bedrock batch jobs need 'batch.s3_uri' and 'batch.role_arn' in the provider config")
+        bucket, prefix = _split_s3_uri(batch_config["s3_uri"])
+        if job_name is None:
+            job_name = f"{re.sub(r'[^a-zA-Z0-9-]', '-', model_id)}-{time.strftime('%Y%m%d-%H%M%S')}-{uuid.uuid4().hex[:6]}"
+        job_prefix = f"{prefix}/{job_name}" if prefix else job_name
+        model_arn = model_config.get("model_id")
+
+        with spool_jsonl(self._batch_records(items, model_id, kwargs)) as records:
+            try:
+                self._get_service_client("s3", model_config).upload_fileobj(
+                    records, bucket, f"{job_prefix}/input.jsonl"
+                )
+                job_params = dict(
+                    jobName=job_name,
+                    roleArn=batch_config["role_arn"],
                     modelId=model_arn,
-                    body=json.dumps(payload),
-                    contentType="application/json",
-                    accept="application/json",
+                    inputDataConfig={"s3InputDataConfig": {
+                        "s3Uri": f"s3://{bucket}/{job_prefix}/input.jsonl", "s3InputFormat": "JSONL",
+                    }},
+                    outputDataConfig={"s3OutputDataConfig": {"s3Uri": f"s3://{bucket}/{job_prefix}/output/"}},
                 )
-                
-                # Parse the response body
-                response_body = json.loads(await response['body'].read())
-                
-                # Return the raw response body instead of processed text
-                return response_body
-                
-        except ClientError as e:
-            error_message = f"Bedrock error: {e.response['Error']['Message']}"
-            raise Exception(error_message)
+                if batch_config.get("timeout_hours"):
+                    job_params["timeoutDurationInHours"] = batch_config["timeout_hours"]
+                response = self._get_service_client("bedrock", model_config).create_model_invocation_job(**job_params)
+            except (ClientError, BotoCoreError) as e:
+                raise _translate_error(e) from e
+        return response["jobArn"]
+
+    def get_batch_job(self, job_arn: str, model_id: str) -> Dict[str, Any]:
+        """Current description of a batch inference job, including its status"""
+        model_config, _ = self._get_batch_config(model_id)
+        try:
+            job = self._get_service_client("bedrock", model_config).get_model_invocation_job(jobIdentifier=job_arn)
+        except (ClientError, BotoCoreError) as e:
+            raise _translate_error(e) from e
+        job.pop("ResponseMetadata", None)
+        return job
+
+    def _batch_job_state(self, job: Dict[str, Any]) -> Tuple[str, bool, Optional[str]]:
+        """(status, finished, error) of a batch inference job; stopped and expired jobs did not succeed"""
+        status = job.get("status")
+        return status, status in _BATCH_DONE, None if status in _BATCH_SUCCEEDED else job.get("message", "")
+
+    def iter_batch_results(self, job_arn: str, model_id: str, items: Optional[List[BatchItem]] = None) -> Iterator[BatchResult]:
+        """Stream the records of a finished batch job as BatchResults, line by line.
+
+        result.index is the input position the record was submitted from;
+        records arrive in output-file order, not input order. Responses are
+        LLMResults and failed records carry the matching LLMError.
+        """
+        model_config, _ = self._get_batch_config(model_id)
+        job = self.get_batch_job(job_arn, model_id)
+        bucket, prefix = _split_s3_uri(job["outputDataConfig"]["s3OutputDataConfig"]["s3Uri"])
+        # Bedrock writes outputs under a folder named after the job ID
+        job_prefix = f"{prefix}/{job_arn.rsplit('/', 1)[-1]}/" if prefix else f"{job_arn.rsplit('/', 1)[-1]}/"
+        target = f"bedrock/{model_id}"
+        s3 = self._get_service_client("s3", model_config)
+
+        try:
+            for page in s3.get_paginator("list_objects_v2").paginate(Bucket=bucket, Prefix=job_prefix):
+                for entry in page.get("Contents", ()):
+                    if not entry["Key"].endswith(".jsonl.out"):
+                        continue
+                    body = s3.get_object(Bucket=bucket, Key=entry["Key"])["Body"]
+                    try:
+                        for line in body.iter_lines():
+                            if not line.strip():
+                                continue
+                            record = json.loads(line)
+                            index = int(record["recordId"])
+                            item = items[index] if items is not None else None
+                            if record.get("error"):
+                                error = record["error"]
+                                yield BatchResult(index, item, error=error_for_status(
+                                    error.get("errorCode"), f"Bedrock error: {error.get('errorMessage')}", "bedrock"
+                                ))
+                            else:
+                                response = LLMResult.from_response(record.get("modelOutput"), model=target)
+                                yield BatchResult(index, item, response=response, target=target)
+                    finally:
+                        body.close()
+        except (ClientError, BotoCoreError) as e:
+            raise _translate_error(e) from e
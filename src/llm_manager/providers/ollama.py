@@ -1,6 +1,15 @@
+import asyncio
+import json
+import aiohttp
 import requests
 from .base import BaseProvider
-from typing import Dict, Any, Optional, Tuple
+from ..errors import LLMError, RequestTimeoutError, ServerError, error_for_status, retry_after_from_headers
+from ..streaming import StreamEvent, TEXT, THINKING, make_usage
+from typing import Dict, Any, Optional, Tuple, Iterator, AsyncIterator
+
+DEFAULT_CONNECT_TIMEOUT = 10
+DEFAULT_READ_TIMEOUT = 300
+DEFAULT_MAX_CONNECTIONS = 32
 
 class OllamaProvider(BaseProvider):
     """Provider for Ollama local models"""
@@ -11,6 +20,8 @@ class OllamaProvider(BaseProvider):
         self.models = config.get("models", {})
         self.base_url = config.get("base_url", "http://localhost:11434")
         self._clients = {}  # Cache for sync clients (requests sessions)
+        # Cache for async clients (aiohttp sessions), per event loop since sessions are bound to one
+        self._async_clients = {}
     
     def _create_cache_key(self, model_config: Dict[str, Any]) -> Tuple:
         """Create a cache key based on the model configuration"""
@@ -23,20 +34,56 @@ class OllamaProvider(BaseProvider):
         cache_key = self._create_cache_key(model_config)
         
         if cache_key not in self._clients:
-            session = requests.Session()
-            # Set timeout for requests
-            session.timeout = model_config.get("timeout", 300)
-            self._clients[cache_key] = session
+            self._clients[cache_key] = requests.Session()
         
         return self._clients[cache_key]
     
+    def _get_timeouts(self, model_config: Dict[str, Any]) -> Tuple[float, float]:
+        """Connect and read timeouts in seconds; the read timeout bounds the wait between bytes"""
+        return (
+            model_config.get("connect_timeout", self.config.get("connect_timeout", DEFAULT_CONNECT_TIMEOUT)),
+            model_config.get("timeout", self.config.get("timeout", DEFAULT_READ_TIMEOUT)),
+        )
+    
+    async def _get_async_client(self, model_config: Dict[str, Any]) -> aiohttp.ClientSession:
+        """Get or create a pooled aiohttp session for the running event loop and model config"""
+        await self._close_stale_clients()
+        sessions = self._async_clients.setdefault(asyncio.get_running_loop(), {})
+        cache_key = self._create_cache_key(model_config)
+        
+        session = sessions.get(cache_key)
+        if session is None or session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.config.get("max_connections", DEFAULT_MAX_CONNECTIONS), keepalive_timeout=60
+            )
+            session = sessions[cache_key] = aiohttp.ClientSession(connector=connector)
+        
+        return session
+    
     def close_clients(self):
-        """Close all cached clients to free resources"""
+        """Close all cached sync clients to free resources"""
         for session in self._clients.values():
             if hasattr(session, 'close'):
                 session.close()
         self._clients.clear()
     
+    async def _close_stale_clients(self):
+        """Close the sessions of event loops that have since closed.
+
+        Sessions hold on to their loop, so callers that run one loop per
+        request (asyncio.run per call) would otherwise keep every loop and
+        its connection pool alive.
+        """
+        for loop in [loop for loop in self._async_clients if loop.is_closed()]:
+            for session in self._async_clients.pop(loop, {}).values():
+                await session.close()
+    
+    async def aclose(self):
+        """Close the async clients of the running event loop"""
+        sessions = self._async_clients.pop(asyncio.get_running_loop(), {})
+        for session in sessions.values():
+            await session.close()
+    
     def get_available_models(self) -> list:
         """Get a list of available model IDs"""
         return list(self.models.keys())
@@ -47,12 +94,12 @@ class OllamaProvider(BaseProvider):
         system_prompt = request_kwargs.pop("system", request_kwargs.pop("system_message", ""))
         return request_kwargs, system_prompt
     
-    def _prepare_payload(self, prompt: str, model_id: str, system_prompt: str, **kwargs) -> Dict[str, Any]:
+    def _prepare_payload(self, prompt: str, model_id: str, system_prompt: str, stream: bool = False, **kwargs) -> Dict[str, Any]:
         """Prepare the payload for the Ollama API call"""
         payload = {
             "model": model_id,
             "prompt": prompt,
-            "stream": False,  # Non-streaming for sync calls
+            "stream": stream,
         }
         
         # Add system prompt if provided
@@ -86,8 +133,8 @@ class OllamaProvider(BaseProvider):
         
         return payload
     
-    def generate(self, prompt: str, model_id: str, **kwargs) -> Any:
-        """Generate a response using the specified Ollama model"""
+    def _build_request(self, prompt: str, model_id: str, kwargs: Dict[str, Any], stream: bool = False) -> Tuple[Dict[str, Any], str, Dict[str, Any]]:
+        """Validate the model and build (model_config, api_url, payload)"""
         if not self.is_enabled():
             raise ValueError("Ollama provider is not enabled")
         
@@ -101,18 +148,50 @@ class OllamaProvider(BaseProvider):
         
         # Prepare request parameters
         request_kwargs, system_prompt = self._prepare_request_params(kwargs)
+        # keep_alive is a top-level field that controls how long the model stays loaded
+        keep_alive = request_kwargs.pop("keep_alive", model_config.get("keep_alive", self.config.get("keep_alive")))
         
         # Prepare payload
         payload = self._prepare_payload(
-            prompt, actual_model_id, system_prompt, **request_kwargs
+            prompt, actual_model_id, system_prompt, stream=stream, **request_kwargs
         )
+        if keep_alive is not None:
+            payload["keep_alive"] = keep_alive
+        return model_config, f"{base_url}/api/generate", payload
+
+    def _translate_error(self, e: requests.exceptions.RequestException) -> LLMError:
+        """Convert a requests exception into the matching LLMError"""
+        message = self._format_error(e)
+        if isinstance(e, requests.exceptions.Timeout):
+            return RequestTimeoutError(message, provider="ollama")
+        response = getattr(e, "response", None)
+        if response is not None:
+            return error_for_status(
+                response.status_code, message, "ollama", retry_after_from_headers(response.headers)
+            )
+        # Connection refused, DNS failures and the like
+        return ServerError(message, provider="ollama")
+
+    def _format_error(self, e: requests.exceptions.RequestException) -> str:
+        """Build an error message, preferring the error detail returned by Ollama"""
+        error_message = f"Ollama error: {str(e)}"
+        if hasattr(e, 'response') and e.response is not None:
+            try:
+                error_detail = e.response.json()
+                error_message = f"Ollama error: {error_detail.get('error', str(e))}"
+            except:
+                error_message = f"Ollama error: {e.response.text if hasattr(e.response, 'text') else str(e)}"
+        return error_message
+    
+    def generate(self, prompt: str, model_id: str, **kwargs) -> Any:
+        """Generate a response using the specified Ollama model"""
+        model_config, api_url, payload = self._build_request(prompt, model_id, kwargs)
         
         # Get client and make request
         session = self._get_client(model_config)
-        api_url = f"{base_url}/api/generate"
         
         try:
-            response = session.post(api_url, json=payload)
+            response = session.post(api_url, json=payload, timeout=self._get_timeouts(model_config))
             response.raise_for_status()  # Raise exception for bad status codes
             
             response_data = response.json()
@@ -120,12 +199,88 @@ class OllamaProvider(BaseProvider):
             return response_data
             
         except requests.exceptions.RequestException as e:
-            error_message = f"Ollama error: {str(e)}"
-            if hasattr(e, 'response') and e.response is not None:
-                try:
-                    error_detail = e.response.json()
-                    error_message = f"Ollama error: {error_detail.get('error', str(e))}"
-                except:
-                    error_message = f"Ollama error: {e.response.text if hasattr(e.response, 'text') else str(e)}"
-            raise Exception(error_message)
+            raise self._translate_error(e) from e
+
+    def _stream_events(self, chunk: Dict[str, Any], state: Dict[str, Any]) -> Iterator[StreamEvent]:
+        """Translate one NDJSON line of /api/generate into normalized events"""
+        if "error" in chunk:
+            raise LLMError(f"Ollama error: {chunk['error']}", provider="ollama")
+        if chunk.get("thinking"):
+            yield StreamEvent(THINKING, chunk["thinking"])
+        if chunk.get("response"):
+            yield StreamEvent(TEXT, chunk["response"])
+        if chunk.get("done"):
+            state["usage"] = make_usage(chunk.get("prompt_eval_count"), chunk.get("eval_count"))
+            state["finish_reason"] = chunk.get("done_reason")
+
+    def stream(self, prompt: str, model_id: str, **kwargs) -> Iterator[StreamEvent]:
+        """Stream normalized deltas from the NDJSON response of /api/generate"""
+        model_config, api_url, payload = self._build_request(prompt, model_id, kwargs, stream=True)
+        session = self._get_client(model_config)
+        state = {}
+
+        try:
+            with session.post(api_url, json=payload, stream=True, timeout=self._get_timeouts(model_config)) as response:
+                response.raise_for_status()
+                for line in response.iter_lines():
+                    if line:
+                        yield from self._stream_events(json.loads(line), state)
+        except requests.exceptions.RequestException as e:
+            raise self._translate_error(e) from e
+
+        yield StreamEvent.final(state)
+
+    async def _raise_for_status(self, response: aiohttp.ClientResponse):
+        """Raise the matching LLMError for an error response, using Ollama's error detail"""
+        if response.status < 400:
+            return
+        body = await response.text()
+        try:
+            detail = json.loads(body).get("error", body)
+        except ValueError:
+            detail = body
+        raise error_for_status(
+            response.status, f"Ollama error: {detail}", "ollama", retry_after_from_headers(response.headers)
+        )
+
+    def _translate_async_error(self, e: Exception) -> LLMError:
+        """Convert an aiohttp or timeout exception into the matching LLMError"""
+        message = f"Ollama error: {str(e) or type(e).__name__}"
+        if isinstance(e, (asyncio.TimeoutError, aiohttp.ServerTimeoutError)):
+            return RequestTimeoutError(message, provider="ollama")
+        return ServerError(message, provider="ollama")
+
+    def _async_request_kwargs(self, model_config: Dict[str, Any]) -> Dict[str, Any]:
+        connect_timeout, read_timeout = self._get_timeouts(model_config)
+        return {"timeout": aiohttp.ClientTimeout(total=None, connect=connect_timeout, sock_read=read_timeout)}
+
+    async def generate_async(self, prompt: str, model_id: str, **kwargs) -> Any:
+        """Generate a response asynchronously using the specified Ollama model"""
+        model_config, api_url, payload = self._build_request(prompt, model_id, kwargs)
+        session = await self._get_async_client(model_config)
+
+        try:
+            async with session.post(api_url, json=payload, **self._async_request_kwargs(model_config)) as response:
+                await self._raise_for_status(response)
+                return await response.json(content_type=None)
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            raise self._translate_async_error(e) from e
+
+    async def astream(self, prompt: str, model_id: str, **kwargs) -> AsyncIterator[StreamEvent]:
+        """Asynchronously stream normalized deltas from the NDJSON response of /api/generate"""
+        model_config, api_url, payload = self._build_request(prompt, model_id, kwargs, stream=True)
+        session = await self._get_async_client(model_config)
+        state = {}
+
+        try:
+            async with session.post(api_url, json=payload, **self._async_request_kwargs(model_config)) as response:
+                await self._raise_for_status(response)
+                async for line in response.content:
+                    line = line.strip()
+                    if line:
+                        for event in self._stream_events(json.loads(line), state):
+                            yield event
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            raise self._translate_async_error(e) from e
 
+        yield StreamEvent.final(state)
@@ -0,0 +1,155 @@
+from typing import Any, Dict, Optional, Tuple
+
+from .utils.usage import _get, extract_usage
+
+
+class LLMResult:
+    """A provider-independent response: text, thinking, usage and call metadata.
+
+    Fields reference the provider payload's strings rather than copying
+    them, and the payload itself stays available as `raw` unless dropped
+    with keep_raw=False.
+    """
+
+    __slots__ = ("text", "thinking", "usage", "finish_reason", "latency", "model", "_raw")
+
+    def __init__(self, text: str = "", thinking: Optional[str] = None, usage: Optional[Dict[str, int]] = None,
+                 finish_reason: Optional[str] = None, latency: Optional[float] = None, model: Optional[str] = None,
+                 raw: Any = None):
+        self.text = text
+        self.thinking = thinking
+        self.usage = usage
+        self.finish_reason = finish_reason
+        self.latency = latency
+        self.model = model
+        self._raw = raw
+
+    @property
+    def raw(self) -> Any:
+        """The original provider payload, or None if it was not kept"""
+        return self._raw
+
+    @classmethod
+    def from_response(cls, response: Any, model: Optional[str] = None, latency: Optional[float] = None,
+                      keep_raw: bool = True) -> "LLMResult":
+        """Normalize any provider's response into an LLMResult"""
+        if isinstance(response, cls):
+            return response
+        text, thinking, finish_reason = _extract_content(response)
+        return cls(
+            text=text,
+            thinking=thinking,
+            usage=extract_usage(response),
+            finish_reason=finish_reason,
+            latency=latency,
+            model=model,
+            raw=response if keep_raw else None,
+        )
+
+    def __str__(self):
+        return self.text
+
+    def __repr__(self):
+        return f"LLMResult(model={self.model!r}, text={self.text[:40]!r}, usage={self.usage!r})"
+
+
+class UsageText(str):
+    """A plain-text response that also carries its normalized token usage"""
+
+    def __new__(cls, text: str, usage: Optional[Dict[str, int]] = None):
+        instance = super().__new__(cls, text)
+        instance.usage = usage
+        return instance
+
+
+def _join(parts) -> Optional[str]:
+    return "".join(parts) if parts else None
+
+
+def _content_blocks(blocks) -> Tuple[str, Optional[str]]:
+    """Text and thinking of Anthropic-format content blocks (dicts or SDK objects)"""
+    text_parts, thinking_parts = [], []
+    for block in blocks or ():
+        block_type = _get(block, "type")
+        if block_type == "thinking":
+            thinking_parts.append(_get(block, "thinking") or "")
+        elif block_type in ("text", None) and _get(block, "text") is not None:
+            text_parts.append(_get(block, "text"))
+    return "".join(text_parts), _join(thinking_parts)
+
+
+def _converse_blocks(blocks) -> Tuple[str, Optional[str]]:
+    """Text and reasoning of Bedrock Converse content blocks"""
+    text_parts, thinking_parts = [], []
+    for block in blocks or ():
+        if "text" in block:
+            text_parts.append(block["text"])
+        elif "reasoningContent" in block:
+            thinking_parts.append(block["reasoningContent"].get("reasoningText", {}).get("text", ""))
+    return "".join(text_parts), _join(thinking_parts)
+
+
+def _extract_content(response: Any) -> Tuple[str, Optional[str], Optional[str]]:
+    """(text, thinking, finish_reason) of a raw provider response"""
+    if response is None:
+        return "", None, None
+    if isinstance(response, str):
+        # Anthropic without thinking, HuggingFace, vLLM
+        return str(response), None, None
+
+    if isinstance(response, dict):
+        if "response" in response and "done" in response:
+            # Ollama /api/generate, which also has "thinking" when called with `think`
+            return response["response"], response.get("thinking") or None, response.get("done_reason")
+        if "response" in response:
+            # Anthropic with thinking
+            return response["response"], response.get("thinking") or None, None
+        if isinstance(response.get("output"), dict):
+            # Bedrock Converse
+            text, thinking = _converse_blocks(response["output"].get("message", {}).get("content"))
+            return text, thinking, response.get("stopReason")
+        if isinstance(response.get("content"), list):
+            # Bedrock Claude messages
+            text, thinking = _content_blocks(response["content"])
+            return text, thinking, response.get("stop_reason")
+        if response.get("outputs"):
+            # Bedrock Mistral
+            output = response["outputs"][0]
+            return output.get("text", ""), None, output.get("stop_reason")
+        if "generation" in response:
+            # Bedrock Llama
+            return response["generation"], None, response.get("stop_reason")
+        return response.get("text", ""), None, None
+
+    choices = getattr(response, "choices", None)
+    if choices:
+        # Azure chat completions
+        choice = choices[0]
+        return choice.message.content or "", None, choice.finish_reason
+
+    output = getattr(response, "output", None)
+    if output is not None and not isinstance(output, str):
+        # Azure Responses API: reasoning summaries, then message items
+        text_parts, thinking_parts = [], []
+        for item in output:
+            item_type = getattr(item, "type", None)
+            if item_type == "reasoning":
+                thinking_parts.extend(part.text for part in getattr(item, "summary", None) or ())
+            elif item_type == "message":
+                text_parts.extend(
+                    part.text for part in item.content if getattr(part, "type", None) == "output_text"
+                )
+        details = getattr(response, "incomplete_details", None)
+        finish_reason = getattr(details, "reason", None) or getattr(response, "status", None)
+        return "".join(text_parts), _join(thinking_parts), finish_reason
+
+    content = getattr(response, "content", None)
+    if isinstance(content, list):
+        # Anthropic Message object
+        text, thinking = _content_blocks(content)
+        return text, thinking, getattr(response, "stop_reason", None)
+    if isinstance(content, str):
+        # Abacus LlmResponse
+        return content, None, None
+
+    return str(response), None, None
@@ -0,0 +1,80 @@
+from types import MappingProxyType
+from typing import Any, Callable, Dict, List, Mapping, NamedTuple, Optional, Tuple, Union
+
+
+class Route(NamedTuple):
+    """A resolved model target: provider, model and bound generate/stream methods"""
+
+    name: str
+    provider_name: str
+    model_id: str
+    provider: Any
+    model_config: Dict[str, Any]
+    generate: Callable
+    generate_async: Optional[Callable]
+    stream: Optional[Callable]
+    astream: Optional[Callable]
+
+
+def make_route(provider_name: str, model_id: str, provider: Any) -> Route:
+    """Bind a provider/model pair into a Route"""
+    return Route(
+        name=f"{provider_name}/{model_id}",
+        provider_name=provider_name,
+        model_id=model_id,
+        provider=provider,
+        model_config=getattr(provider, "models", {}).get(model_id, {}),
+        generate=provider.generate,
+        generate_async=getattr(provider, "generate_async", None),
+        stream=getattr(provider, "stream", None),
+        astream=getattr(provider, "astream", None),
+    )
+
+
+def _chain_targets(model_path: Union[str, List[str]]) -> List[str]:
+    """Targets of an alias, which is either one 'provider/model_id' or an ordered list"""
+    if isinstance(model_path, (list, tuple)):
+        return list(model_path)
+    return [model_path]
+
+
+def build_route_table(providers: Dict[str, Any], aliases: Dict[str, Any]) -> Mapping[str, Route]:
+    """Build an immutable map from 'provider/model_id' strings and aliases to routes.
+
+    An alias naming a fallback chain maps to its first available target.
+    Aliases pointing at unknown models or disabled providers are left out so
+    that resolving them falls back to the manager's error reporting.
+    """
+    routes = {}
+    for provider_name, provider in providers.items():
+        for model_id in getattr(provider, "models", {}):
+            route = make_route(provider_name, model_id, provider)
+            routes[route.name] = route
+
+    for alias, model_path in (aliases or {}).items():
+        for target in _chain_targets(model_path):
+            if target in routes:
+                routes[alias] = routes[target]
+                break
+
+    return MappingProxyType(routes)
+
+
+def build_fallback_chains(routes: Mapping[str, Route], aliases: Dict[str, Any]) -> Mapping[str, Tuple[Route, ...]]:
+    """Map aliases that name a list of targets to their available routes, in order.
+
+    Targets may be 'provider/model_id' strings or single-target aliases;
+    unavailable targets are skipped.
+    """
+    chains = {}
+    for alias, model_path in (aliases or {}).items():
+        if not isinstance(model_path, (list, tuple)):
+            continue
+        chain = []
+        for target in model_path:
+            route = routes.get(target) if target != alias else None
+            if route is not None and route not in chain:
+                chain.append(route)
+        if chain:
+            chains[alias] = tuple(chain)
+    return MappingProxyType(chains)
@@ -0,0 +1,56 @@
+from typing import Any, Dict, Optional
+
+TEXT = "text"
+THINKING = "thinking"
+USAGE = "usage"
+
+
+class StreamEvent:
+    """A normalized streaming delta.
+
+    type is "text" or "thinking" for content deltas (text holds the delta),
+    or "usage" for the final record of a stream (usage, finish_reason and
+    ttft, the seconds until the first content delta).
+    """
+
+    __slots__ = ("type", "text", "usage", "finish_reason", "ttft")
+
+    def __init__(self, type: str, text: str = "", usage: Optional[Dict[str, int]] = None,
+                 finish_reason: Optional[str] = None, ttft: Optional[float] = None):
+        self.type = type
+        self.text = text
+        self.usage = usage
+        self.finish_reason = finish_reason
+        self.ttft = ttft
+
+    @classmethod
+    def final(cls, state: Dict[str, Any]) -> "StreamEvent":
+        """Build the closing usage event from the state a provider accumulated"""
+        return cls(USAGE, usage=state.get("usage") or {}, finish_reason=state.get("finish_reason"))
+
+    def __repr__(self):
+        if self.type == USAGE:
+            return f"StreamEvent(usage={self.usage!r}, finish_reason={self.finish_reason!r}, ttft={self.ttft!r})"
+        return f"StreamEvent({self.type}={self.text!r})"
+
+
+def make_usage(input_tokens: Optional[int] = None, output_tokens: Optional[int] = None,
+               thinking_tokens: Optional[int] = None, cache_read_tokens: Optional[int] = None,
+               cache_write_tokens: Optional[int] = None) -> Dict[str, int]:
+    """Normalized usage dict; missing counts are left out.
+
+    input_tokens excludes prompt-cache reads and writes, which Anthropic
+    and Bedrock report (and bill) separately.
+    """
+    usage = {}
+    if input_tokens is not None:
+        usage["input_tokens"] = input_tokens
+    if output_tokens is not None:
+        usage["output_tokens"] = output_tokens
+    if thinking_tokens:
+        usage["thinking_tokens"] = thinking_tokens
+    if cache_read_tokens:
+        usage["cache_read_tokens"] = cache_read_tokens
+    if cache_write_tokens:
+        usage["cache_write_tokens"] = cache_write_tokens
+    return usage
@@ -1,3 +1,22 @@
-from .config import load_config, substitute_env_vars
+from .config import load_config, substitute_env_vars, clear_config_cache
+from .cache import ResponseCache
+from .singleflight import SingleFlight
+from .rate_limit import RateLimiter, TokenBucket
+from .retry import RetryPolicy
+from .circuit_breaker import CircuitBreaker
+from .load_balancer import DeploymentPool
+from .accounting import UsageRegistry
 
-__all__ = ["load_config", "substitute_env_vars"]
\ No newline at end of file
+__all__ = [
+    "load_config",
+    "substitute_env_vars",
+    "clear_config_cache",
+    "ResponseCache",
+    "SingleFlight",
+    "RateLimiter",
+    "TokenBucket",
+    "RetryPolicy",
+    "CircuitBreaker",
+    "DeploymentPool",
+    "UsageRegistry",
+]
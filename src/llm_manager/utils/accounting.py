@@ -0,0 +1,103 @@
+import csv
+import json
+import threading
+from typing import Any, Dict, IO, List, Optional, Tuple
+
+# Counters kept per (provider, model, tag), in this order
+_FIELDS = ("calls", "input_tokens", "output_tokens", "thinking_tokens", "cache_read_tokens", "cache_write_tokens", "cost")
+_TOKEN_FIELDS = _FIELDS[1:-1]
+GROUP_BY = ("model", "provider", "tag")
+
+# Prompt-cache prices relative to the input price when pricing sets none (Anthropic's 5-minute cache)
+CACHE_READ_MULTIPLIER = 0.1
+CACHE_WRITE_MULTIPLIER = 1.25
+
+
+class UsageRegistry:
+    """In-process token usage and cost totals per provider, model and caller tag.
+
+    Prices are USD per million tokens, taken from a model's `pricing`
+    section in config.yaml (`input` and `output`, optionally `cache_read`
+    and `cache_write`). Thinking tokens are reported separately but billed
+    as output, since providers already include them in the output count.
+    """
+
+    def __init__(self, pricing: Optional[Dict[str, Dict[str, float]]] = None):
+        self.pricing = dict(pricing or {})
+        self._totals: Dict[Tuple[str, str, Optional[str]], List[float]] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, providers_config: Dict[str, Any]) -> "UsageRegistry":
+        """Create a registry with the pricing of every model in the providers config"""
+        pricing = {}
+        for provider_name, provider_config in providers_config.items():
+            for model_id, model_config in (provider_config.get("models") or {}).items():
+                if (model_config or {}).get("pricing"):
+                    pricing[f"{provider_name}/{model_id}"] = model_config["pricing"]
+        return cls(pricing)
+
+    def cost(self, model: str, usage: Dict[str, int]) -> float:
+        """USD cost of a call's usage on a 'provider/model_id'"""
+        prices = self.pricing.get(model)
+        if not prices:
+            return 0.0
+        input_price = prices.get("input", 0.0)
+        return (
+            usage.get("input_tokens", 0) * input_price
+            + usage.get("output_tokens", 0) * prices.get("output", 0.0)
+            + usage.get("cache_read_tokens", 0) * prices.get("cache_read", input_price * CACHE_READ_MULTIPLIER)
+            + usage.get("cache_write_tokens", 0) * prices.get("cache_write", input_price * CACHE_WRITE_MULTIPLIER)
+        ) / 1_000_000
+
+    def record(self, provider: str, model: str, usage: Optional[Dict[str, int]], tag: Optional[str] = None):
+        """Add one call on a 'provider/model_id' and its normalized usage, if known"""
+        usage = usage or {}
+        cost = self.cost(model, usage) if usage else 0.0
+        key = (provider, model, tag)
+        with self._lock:
+            totals = self._totals.get(key)
+            if totals is None:
+                totals = self._totals[key] = [0] * (len(_FIELDS) - 1) + [0.0]
+            totals[0] += 1
+            for position, field in enumerate(_TOKEN_FIELDS, start=1):
+                totals[position] += usage.get(field, 0)
+            totals[-1] += cost
+
+    def rows(self) -> List[Dict[str, Any]]:
+        """One row of totals per (provider, model, tag)"""
+        with self._lock:
+            items = [(key, list(totals)) for key, totals in self._totals.items()]
+        return [
+            {"provider": provider, "model": model, "tag": tag, **dict(zip(_FIELDS, totals))}
+            for (provider, model, tag), totals in items
+        ]
+
+    def snapshot(self, group_by: Optional[str] = "model") -> Dict[Any, Dict[str, Any]]:
+        """Totals grouped by "model", "provider" or "tag"; group_by=None gives the grand total"""
+        if group_by is not None and group_by not in GROUP_BY:
+            raise ValueError(f"Invalid group_by: {group_by}. Use one of {GROUP_BY} or None.")
+        grouped = {}
+        for row in self.rows():
+            group = row[group_by] if group_by is not None else "total"
+            totals = grouped.setdefault(group, dict.fromkeys(_FIELDS, 0))
+            for field in _FIELDS:
+                totals[field] += row[field]
+        return grouped
+
+    def export(self, file: IO[str], format: str = "json"):
+        """Write all rows to an open text file in "json" or "csv" format"""
+        rows = self.rows()
+        if format == "json":
+            json.dump(rows, file, indent=2)
+        elif format == "csv":
+            writer = csv.DictWriter(file, fieldnames=("provider", "model", "tag") + _FIELDS)
+            writer.writeheader()
+            writer.writerows(rows)
+        else:
+            raise ValueError(f"Invalid export format: {format}. Use 'json' or 'csv'.")
+
+    def reset(self):
+        """Clear all totals"""
+        with self._lock:
+            self._totals.clear()
@@ -0,0 +1,121 @@
+import hashlib
+import json
+import sys
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+DEFAULT_TTL_SECONDS = 3600
+
+# Rough per-entry bookkeeping cost (key, expiry, OrderedDict node)
+_ENTRY_OVERHEAD = 200
+
+
+def make_cache_key(target: str, prompt: str, kwargs: Dict[str, Any]) -> str:
+    """Canonical hash of a resolved 'provider/model' target, prompt and kwargs"""
+    canonical = json.dumps(
+        [target, prompt, {k: v for k, v in kwargs.items() if v is not None}],
+        sort_keys=True,
+        separators=(",", ":"),
+        default=repr,
+    )
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def estimate_size(value: Any) -> int:
+    """Approximate the memory held by a cached response, in bytes"""
+    if isinstance(value, (str, bytes)):
+        return len(value)
+    if hasattr(value, "model_dump_json"):
+        return len(value.model_dump_json())
+    try:
+        return len(json.dumps(value, default=str))
+    except (TypeError, ValueError):
+        return sys.getsizeof(value)
+
+
+class ResponseCache:
+    """Thread-safe LRU cache bounded by total bytes, with per-entry TTL"""
+
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES, ttl_seconds: Optional[float] = DEFAULT_TTL_SECONDS):
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self._entries = OrderedDict()  # key -> (value, size, expires_at)
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any]) -> "ResponseCache":
+        """Create a cache from the `cache` section of config.yaml"""
+        return cls(
+            max_bytes=int(config.get("max_bytes", DEFAULT_MAX_BYTES)),
+            ttl_seconds=config.get("ttl_seconds", DEFAULT_TTL_SECONDS),
+        )
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Return a live cached value, or default on a miss"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return default
+            value, size, expires_at = entry
+            if expires_at is not None and expires_at <= time.monotonic():
+                self._remove(key, size)
+                self.expirations += 1
+                self.misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: str, value: Any, ttl_seconds: Optional[float] = None) -> bool:
+        """Store a value; returns False if it is larger than the whole cache"""
+        size = estimate_size(value) + _ENTRY_OVERHEAD
+        if size > self.max_bytes:
+            return False
+        ttl = self.ttl_seconds if ttl_seconds is None else ttl_seconds
+        expires_at = time.monotonic() + ttl if ttl else None
+
+        with self._lock:
+            if key in self._entries:
+                self._remove(key, self._entries[key][1])
+            self._entries[key] = (value, size, expires_at)
+            self._bytes += size
+            while self._bytes > self.max_bytes:
+                old_key, (_, old_size, _) = next(iter(self._entries.items()))
+                self._remove(old_key, old_size)
+                self.evictions += 1
+        return True
+
+    def _remove(self, key: str, size: int):
+        del self._entries[key]
+        self._bytes -= size
+
+    def clear(self):
+        """Drop all entries; counters are kept"""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> Dict[str, int]:
+        """Hit/miss counters and current occupancy"""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+            }
+
+    def __len__(self):
+        return len(self._entries)
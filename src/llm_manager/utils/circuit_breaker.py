@@ -0,0 +1,176 @@
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Dict, Hashable, Iterator, Optional
+
+from ..errors import CircuitOpenError, LLMError, RateLimitedError
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+DEFAULT_FAILURE_RATE = 0.5
+DEFAULT_MINIMUM_CALLS = 10
+DEFAULT_WINDOW_SIZE = 20
+DEFAULT_OPEN_SECONDS = 30.0
+DEFAULT_HALF_OPEN_CALLS = 1
+
+
+def is_endpoint_failure(error: BaseException) -> bool:
+    """Whether an error says something about the health of the endpoint.
+
+    Timeouts and 5xx count; rate limits are left to the retry policy and
+    rate limiter, and bad requests are the caller's fault.
+    """
+    return isinstance(error, LLMError) and error.retryable and not isinstance(error, RateLimitedError)
+
+
+class CircuitBreaker:
+    """Closed / open / half-open circuit breaker over a sliding window of calls.
+
+    The breaker opens once at least minimum_calls outcomes are recorded and
+    the share of failures in the last window_size calls reaches
+    failure_rate. Successful calls slower than slow_call_seconds count as
+    failures. While open, calls fail fast with CircuitOpenError; after
+    open_seconds up to half_open_calls probes are let through, and the
+    breaker closes if they all succeed or opens again on the first failure.
+    """
+
+    def __init__(self, failure_rate: float = DEFAULT_FAILURE_RATE, minimum_calls: int = DEFAULT_MINIMUM_CALLS,
+                 window_size: int = DEFAULT_WINDOW_SIZE, open_seconds: float = DEFAULT_OPEN_SECONDS,
+                 half_open_calls: int = DEFAULT_HALF_OPEN_CALLS, slow_call_seconds: Optional[float] = None,
+                 name: str = ""):
+        self.name = name
+        self.failure_rate = failure_rate
+        self.minimum_calls = max(1, minimum_calls)
+        self.open_seconds = open_seconds
+        self.half_open_calls = max(1, half_open_calls)
+        self.slow_call_seconds = slow_call_seconds
+        self.state = CLOSED
+        self.opened = 0
+        self.rejected = 0
+        self._outcomes = deque(maxlen=max(self.minimum_calls, window_size))
+        self._opened_at = 0.0
+        self._probes = 0
+        self._probe_successes = 0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any], name: str = "") -> "CircuitBreaker":
+        """Create a breaker from the `circuit_breaker` section of config.yaml"""
+        return cls(
+            failure_rate=config.get("failure_rate", DEFAULT_FAILURE_RATE),
+            minimum_calls=config.get("minimum_calls", DEFAULT_MINIMUM_CALLS),
+            window_size=config.get("window_size", DEFAULT_WINDOW_SIZE),
+            open_seconds=config.get("open_seconds", DEFAULT_OPEN_SECONDS),
+            half_open_calls=config.get("half_open_calls", DEFAULT_HALF_OPEN_CALLS),
+            slow_call_seconds=config.get("slow_call_seconds"),
+            name=name,
+        )
+
+    def _open(self, now: float):
+        self.state = OPEN
+        self.opened += 1
+        self._opened_at = now
+        self._outcomes.clear()
+
+    def _reject(self, remaining: float):
+        self.rejected += 1
+        raise CircuitOpenError(f"Circuit open for {self.name}", retry_after=max(0.0, remaining))
+
+    def check(self):
+        """Fail fast with CircuitOpenError while the breaker is open, without admitting a call"""
+        if self.state == OPEN:
+            remaining = self._opened_at + self.open_seconds - time.monotonic()
+            if remaining > 0:
+                self._reject(remaining)
+
+    def allow(self) -> bool:
+        """Admit a call or raise CircuitOpenError; returns True if the call is a half-open probe"""
+        with self._lock:
+            if self.state == CLOSED:
+                return False
+            if self.state == OPEN:
+                remaining = self._opened_at + self.open_seconds - time.monotonic()
+                if remaining > 0:
+                    self._reject(remaining)
+                self.state = HALF_OPEN
+                self._probes = 0
+                self._probe_successes = 0
+            if self._probes >= self.half_open_calls:
+                # Wait for the probes in flight to decide
+                self._reject(0.0)
+            self._probes += 1
+            return True
+
+    def cancel(self, probe: bool):
+        """Forget an admitted call that was abandoned before it produced an outcome"""
+        if probe:
+            with self._lock:
+                if self.state == HALF_OPEN and self._probes > 0:
+                    self._probes -= 1
+
+    @contextmanager
+    def guard(self, timed: bool = True) -> Iterator[None]:
+        """Admit the enclosed call and record its outcome and latency"""
+        probe = self.allow()
+        start = time.monotonic()
+        try:
+            yield
+        except Exception as e:
+            self.record(probe, e)
+            raise
+        except BaseException:
+            self.cancel(probe)
+            raise
+        self.record(probe, latency=time.monotonic() - start if timed else None)
+
+    def record(self, probe: bool, error: Optional[BaseException] = None, latency: Optional[float] = None):
+        """Record the outcome of an admitted call"""
+        failed = error is not None and is_endpoint_failure(error)
+        if not failed and error is None and latency is not None and self.slow_call_seconds is not None:
+            failed = latency > self.slow_call_seconds
+        with self._lock:
+            if probe:
+                if self.state != HALF_OPEN:
+                    return
+                if failed:
+                    self._open(time.monotonic())
+                    return
+                self._probe_successes += 1
+                if self._probe_successes >= self.half_open_calls:
+                    self.state = CLOSED
+                    self._outcomes.clear()
+                return
+            if self.state != CLOSED:
+                # Late result of a call admitted before the breaker opened
+                return
+            self._outcomes.append(failed)
+            if len(self._outcomes) >= self.minimum_calls:
+                if sum(self._outcomes) / len(self._outcomes) >= self.failure_rate:
+                    self._open(time.monotonic())
+
+    def stats(self) -> Dict[str, Any]:
+        """Current state and counters"""
+        with self._lock:
+            return {"state": self.state, "opened": self.opened, "rejected": self.rejected}
+
+
+class CircuitBreakerRegistry:
+    """One CircuitBreaker per endpoint key, created on first use"""
+
+    def __init__(self, config: Optional[Dict[str, Any]] = None):
+        self.config = config or {}
+        self._breakers: Dict[Hashable, CircuitBreaker] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, name: str = "") -> CircuitBreaker:
+        """Breaker for an endpoint key"""
+        breaker = self._breakers.get(key)
+        if breaker is None:
+            with self._lock:
+                breaker = self._breakers.get(key)
+                if breaker is None:
+                    breaker = self._breakers[key] = CircuitBreaker.from_config(self.config, name)
+        return breaker
@@ -1,29 +1,109 @@
 import os
 import re
+import threading
 import yaml
-import pkg_resources
+
+try:
+    from importlib.resources import files as _resource_files
+except ImportError:  # Python 3.8
+    _resource_files = None
+
+_ENV_PATTERN = re.compile(r'\${([^}^:]+)(?::-([^}]+))?}')
+
+# config_path -> _ConfigSnapshot
+_snapshots = {}
+_snapshots_lock = threading.Lock()
+
+
+class _ConfigSnapshot:
+    """Parsed YAML for one version of a config file plus its resolved form"""
+
+    __slots__ = ("file_key", "raw", "env_vars", "env_key", "resolved")
+
+    def __init__(self, file_key, raw):
+        self.file_key = file_key
+        self.raw = raw
+        self.env_vars = tuple(sorted(find_env_vars(raw)))
+        self.env_key = None
+        self.resolved = None
+
+
+def default_config_path():
+    """Path of the config.yaml bundled with the package"""
+    if _resource_files is not None:
+        return str(_resource_files('llm_manager') / 'config.yaml')
+    return os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'config.yaml')
+
 
 def load_config(config_path=None):
-    """Load and process the configuration file"""
+    """Load and process the configuration file.
+
+    The parsed and env-substituted config is cached per path, keyed by the
+    file's mtime/size and the values of the environment variables it
+    references, so repeated loads only pay for a copy.
+    """
     if config_path is None:
-        config_path = pkg_resources.resource_filename('llm_manager', 'config.yaml')
-    
-    with open(config_path, 'r') as file:
-        config = yaml.safe_load(file)
-    
-    return substitute_env_vars(config)
+        config_path = default_config_path()
+
+    stat = os.stat(config_path)
+    file_key = (stat.st_mtime_ns, stat.st_size)
+
+    with _snapshots_lock:
+        snapshot = _snapshots.get(config_path)
+        if snapshot is None or snapshot.file_key != file_key:
+            with open(config_path, 'r') as file:
+                snapshot = _ConfigSnapshot(file_key, yaml.safe_load(file))
+            _snapshots[config_path] = snapshot
+
+        env_key = tuple(os.environ.get(name) for name in snapshot.env_vars)
+        if snapshot.resolved is None or snapshot.env_key != env_key:
+            snapshot.resolved = substitute_env_vars(snapshot.raw)
+            snapshot.env_key = env_key
+
+        # Callers may mutate their config, so never hand out the cached object
+        return _copy_tree(snapshot.resolved)
+
+
+def _copy_tree(config):
+    """Copy the dicts and lists of a YAML tree; scalars are immutable and shared"""
+    if isinstance(config, dict):
+        return {k: _copy_tree(v) for k, v in config.items()}
+    elif isinstance(config, list):
+        return [_copy_tree(i) for i in config]
+    return config
+
+
+def clear_config_cache():
+    """Drop all cached config snapshots"""
+    with _snapshots_lock:
+        _snapshots.clear()
+
+
+def find_env_vars(config):
+    """Return the names of all environment variables referenced by ${VAR} patterns"""
+    if isinstance(config, dict):
+        return {name for v in config.values() for name in find_env_vars(v)}
+    elif isinstance(config, list):
+        return {name for i in config for name in find_env_vars(i)}
+    elif isinstance(config, str) and "${" in config:
+        return {match.group(1) for match in _ENV_PATTERN.finditer(config)}
+    return set()
+
+
+def _replace_env_var(match):
+    env_var, default = match.groups()
+    return os.environ.get(env_var, default or "")
+
 
 def substitute_env_vars(config):
-    """Replace ${VAR_NAME:-default} patterns with environment variables or defaults"""
+    """Replace every ${VAR_NAME:-default} pattern with its environment variable or default.
+
+    An unset variable without a default becomes an empty string.
+    """
     if isinstance(config, dict):
         return {k: substitute_env_vars(v) for k, v in config.items()}
     elif isinstance(config, list):
         return [substitute_env_vars(i) for i in config]
     elif isinstance(config, str) and "${" in config:
-        pattern = r'\${([^}^:]+)(?::-([^}]+))?}'
-        match = re.search(pattern, config)
-        if match:
-            env_var, default = match.groups()
-            value = os.environ.get(env_var, default or "")
-            return config.replace(match.group(0), value)
+        return _ENV_PATTERN.sub(_replace_env_var, config)
     return config
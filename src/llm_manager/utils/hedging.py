@@ -0,0 +1,118 @@
+import threading
+from collections import deque
+from typing import Any, Dict, Optional
+
+DEFAULT_PERCENTILE = 95.0
+DEFAULT_MIN_SAMPLES = 20
+DEFAULT_WINDOW_SIZE = 200
+DEFAULT_INITIAL_DELAY = 10.0
+DEFAULT_BUDGET = 0.1
+DEFAULT_MAX_BURST = 10.0
+
+
+class LatencyTracker:
+    """Sliding window of recent successful call latencies for one route"""
+
+    def __init__(self, window_size: int = DEFAULT_WINDOW_SIZE):
+        self._samples = deque(maxlen=window_size)
+
+    def record(self, latency: float):
+        """Add the latency of a successful call, in seconds"""
+        self._samples.append(latency)
+
+    def __len__(self):
+        return len(self._samples)
+
+    def percentile(self, percentile: float) -> Optional[float]:
+        """Latency at the given percentile (0-100), or None without samples"""
+        samples = sorted(self._samples)
+        if not samples:
+            return None
+        index = min(len(samples) - 1, int(len(samples) * percentile / 100.0))
+        return samples[index]
+
+
+class HedgeBudget:
+    """Caps duplicated requests to a share of all calls for one model.
+
+    Every hedgeable call deposits `ratio` credits, up to max_burst, and every
+    hedge spends one, so over time at most `ratio` of calls are duplicated.
+    """
+
+    def __init__(self, ratio: float = DEFAULT_BUDGET, max_burst: float = DEFAULT_MAX_BURST):
+        self.ratio = ratio
+        self.max_burst = max_burst
+        self.credits = 0.0
+        self.calls = 0
+        self.hedged = 0
+        self._lock = threading.Lock()
+
+    def deposit(self):
+        """Account for one hedgeable call"""
+        with self._lock:
+            self.calls += 1
+            self.credits = min(self.max_burst, self.credits + self.ratio)
+
+    def try_spend(self) -> bool:
+        """Take credit for one hedge; False if the budget is exhausted"""
+        with self._lock:
+            if self.credits < 1.0:
+                return False
+            self.credits -= 1.0
+            self.hedged += 1
+            return True
+
+
+class Hedger:
+    """Hedging settings, per-route latency trackers and per-model budgets.
+
+    Settings come from the `hedging` section of config.yaml; entries under
+    `models` override percentile, budget and initial_delay for one model
+    name or alias.
+    """
+
+    def __init__(self, config: Optional[Dict[str, Any]] = None):
+        config = config or {}
+        self.enabled = config.get("enabled", False)
+        self.percentile = config.get("percentile", DEFAULT_PERCENTILE)
+        self.min_samples = config.get("min_samples", DEFAULT_MIN_SAMPLES)
+        self.window_size = config.get("window_size", DEFAULT_WINDOW_SIZE)
+        self.initial_delay = config.get("initial_delay", DEFAULT_INITIAL_DELAY)
+        self.budget = config.get("budget", DEFAULT_BUDGET)
+        self.max_burst = config.get("max_burst", DEFAULT_MAX_BURST)
+        self.model_overrides = config.get("models") or {}
+        self._trackers: Dict[str, LatencyTracker] = {}
+        self._budgets: Dict[str, HedgeBudget] = {}
+        self._lock = threading.Lock()
+
+    def _setting(self, name: str, key: str) -> Any:
+        return (self.model_overrides.get(name) or {}).get(key, getattr(self, key))
+
+    def record(self, route_name: str, latency: float):
+        """Record a successful call's latency on a route"""
+        tracker = self._trackers.get(route_name)
+        if tracker is None:
+            with self._lock:
+                tracker = self._trackers.setdefault(route_name, LatencyTracker(self.window_size))
+        tracker.record(latency)
+
+    def delay(self, name: str, route_name: str) -> float:
+        """Seconds to wait on the primary route before sending a hedge for model `name`"""
+        tracker = self._trackers.get(route_name)
+        if tracker is None or len(tracker) < self.min_samples:
+            return self._setting(name, "initial_delay")
+        return tracker.percentile(self._setting(name, "percentile"))
+
+    def get_budget(self, name: str) -> HedgeBudget:
+        """Hedge budget of a model name or alias"""
+        budget = self._budgets.get(name)
+        if budget is None:
+            with self._lock:
+                budget = self._budgets.get(name)
+                if budget is None:
+                    budget = self._budgets[name] = HedgeBudget(self._setting(name, "budget"), self.max_burst)
+        return budget
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """Hedgeable calls versus hedges sent, per model"""
+        return {name: {"calls": budget.calls, "hedged": budget.hedged} for name, budget in list(self._budgets.items())}
@@ -0,0 +1,94 @@
+import random
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+from ..errors import LLMError
+
+LEAST_OUTSTANDING = "least_outstanding"
+WEIGHTED = "weighted"
+DEFAULT_COOLDOWN_SECONDS = 10.0
+
+
+class Deployment:
+    """One backend of a DeploymentPool and its load and health"""
+
+    __slots__ = ("config", "weight", "outstanding", "cooldown_until", "failures")
+
+    def __init__(self, config: Dict[str, Any]):
+        self.config = config
+        self.weight = float(config.get("weight", 1))
+        if self.weight < 0:
+            raise ValueError(f"Deployment weight must be zero or positive, got {self.weight}")
+        self.outstanding = 0
+        self.cooldown_until = 0.0
+        self.failures = 0
+
+
+class DeploymentPool:
+    """Spread requests for one logical model over several deployments.
+
+    `least_outstanding` picks the deployment with the fewest in-flight
+    requests relative to its weight; `weighted` picks at random in
+    proportion to weight. A deployment with weight 0 is drained: it gets no
+    requests while any deployment has a positive weight. A deployment that
+    fails with a retryable error (throttling, timeouts, 5xx) is skipped for
+    its Retry-After or cooldown_seconds, unless every deployment is cooling
+    down.
+    """
+
+    def __init__(self, configs: List[Dict[str, Any]], strategy: str = LEAST_OUTSTANDING,
+                 cooldown_seconds: float = DEFAULT_COOLDOWN_SECONDS):
+        if not configs:
+            raise ValueError("A deployment pool needs at least one deployment")
+        if strategy not in (LEAST_OUTSTANDING, WEIGHTED):
+            raise ValueError(f"Unknown load balancing strategy: {strategy}. Use '{LEAST_OUTSTANDING}' or '{WEIGHTED}'.")
+        self.deployments = [Deployment(config) for config in configs]
+        self.strategy = strategy
+        self.cooldown_seconds = cooldown_seconds
+        self._lock = threading.Lock()
+
+    def _choose(self, candidates: List[Deployment]) -> Deployment:
+        if len(candidates) == 1:
+            return candidates[0]
+        # Candidates are all drained only when every deployment is; share the load evenly then
+        weights = {id(d): d.weight or 1.0 for d in candidates}
+        if self.strategy == WEIGHTED:
+            return random.choices(candidates, weights=[weights[id(d)] for d in candidates])[0]
+        # Random tie-break so idle deployments share the load evenly
+        return min(candidates, key=lambda d: (d.outstanding / weights[id(d)], random.random()))
+
+    def acquire(self) -> Deployment:
+        """Pick a deployment for one request and count it as outstanding"""
+        with self._lock:
+            now = time.monotonic()
+            active = [d for d in self.deployments if d.weight > 0] or self.deployments
+            healthy = [d for d in active if d.cooldown_until <= now]
+            deployment = self._choose(healthy or active)
+            deployment.outstanding += 1
+            return deployment
+
+    def release(self, deployment: Deployment, error: Optional[BaseException] = None):
+        """Finish a request on a deployment, cooling it down after a retryable failure"""
+        with self._lock:
+            deployment.outstanding -= 1
+            if isinstance(error, LLMError) and error.retryable:
+                deployment.failures += 1
+                wait = error.retry_after if error.retry_after is not None else self.cooldown_seconds
+                deployment.cooldown_until = max(deployment.cooldown_until, time.monotonic() + wait)
+            elif error is None:
+                deployment.cooldown_until = 0.0
+
+    def stats(self) -> List[Dict[str, Any]]:
+        """Load and health of each deployment"""
+        now = time.monotonic()
+        return [
+            {
+                "azure_endpoint": d.config.get("azure_endpoint"),
+                "azure_deployment": d.config.get("azure_deployment"),
+                "outstanding": d.outstanding,
+                "failures": d.failures,
+                "healthy": d.cooldown_until <= now,
+            }
+            for d in self.deployments
+        ]
@@ -0,0 +1,70 @@
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from .usage import _CHARS_PER_TOKEN
+
+# Shortest prefix Anthropic will cache on Sonnet and Opus models; Haiku needs 2048
+DEFAULT_MIN_CACHE_TOKENS = 1024
+_EPHEMERAL = {"type": "ephemeral"}
+
+Content = Union[str, List[Any]]
+
+
+def prompt_cache_threshold(provider_config: Dict[str, Any], model_config: Dict[str, Any],
+                           kwargs: Dict[str, Any]) -> Optional[int]:
+    """Token threshold for automatic cache breakpoints, or None when prompt caching is off.
+
+    Reads `prompt_caching` from the provider and model config (the model
+    wins) and pops the per-call `prompt_cache` override from kwargs.
+    """
+    option = kwargs.pop("prompt_cache", None)
+    config = {**(provider_config.get("prompt_caching") or {}), **(model_config.get("prompt_caching") or {})}
+    if option is False or (option is None and not config.get("enabled", True)):
+        return None
+    return config.get("min_tokens", DEFAULT_MIN_CACHE_TOKENS)
+
+
+def text_blocks(content: Content) -> Content:
+    """A prompt as Anthropic message content: strings stay strings, lists become text blocks"""
+    if isinstance(content, str):
+        return content
+    return [{"type": "text", "text": part} if isinstance(part, str) else dict(part) for part in content]
+
+
+def _length(content: Optional[Content]) -> int:
+    if not content:
+        return 0
+    if isinstance(content, str):
+        return len(content)
+    return sum(len(block.get("text", "")) for block in content)
+
+
+def _has_breakpoint(content: Optional[Content]) -> bool:
+    return isinstance(content, list) and any("cache_control" in block for block in content)
+
+
+def add_cache_breakpoints(system: Optional[Content], prompt: Content,
+                          min_tokens: Optional[int]) -> Tuple[Optional[Content], Content]:
+    """Mark the stable parts of an Anthropic-format request as cacheable.
+
+    The system prompt gets a breakpoint once it reaches min_tokens. A
+    prompt given as a list of parts is treated as a shared prefix followed
+    by the final, per-call part; the prefix gets a breakpoint once the
+    request up to it reaches min_tokens. Plain string prompts are never
+    marked, since caching unique text only adds cache-write cost. Requests
+    that already carry cache_control are left alone.
+    """
+    prompt = text_blocks(prompt)
+    if min_tokens is None or _has_breakpoint(system) or _has_breakpoint(prompt):
+        return system, prompt
+    min_chars = min_tokens * _CHARS_PER_TOKEN
+
+    if system and _length(system) >= min_chars:
+        system = text_blocks([system] if isinstance(system, str) else system)
+        system[-1]["cache_control"] = dict(_EPHEMERAL)
+
+    if isinstance(prompt, list) and len(prompt) >= 2:
+        prefix = prompt[:-1]
+        if _length(system) + _length(prefix) >= min_chars:
+            prefix[-1]["cache_control"] = dict(_EPHEMERAL)
+
+    return system, prompt
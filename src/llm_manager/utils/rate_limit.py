@@ -0,0 +1,159 @@
+import asyncio
+import threading
+import time
+import weakref
+from typing import Any, Dict, Optional, Tuple
+
+# Keys read from provider and model sections of config.yaml
+RATE_LIMIT_KEYS = ("requests_per_minute", "tokens_per_minute", "max_concurrency")
+
+
+class TokenBucket:
+    """Token bucket refilled continuously at a per-minute rate.
+
+    Reservations may take the bucket into debt; the caller then waits for
+    the debt to be repaid, which admits requests smoothly and in order
+    instead of letting them race for tokens.
+    """
+
+    def __init__(self, per_minute: float, capacity: Optional[float] = None):
+        self.rate = per_minute / 60.0
+        self.capacity = capacity if capacity is not None else per_minute
+        self.tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float):
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def reserve(self, amount: float) -> float:
+        """Take amount tokens and return the seconds to wait before using them"""
+        with self._lock:
+            self._refill(time.monotonic())
+            self.tokens -= amount
+            return 0.0 if self.tokens >= 0 else -self.tokens / self.rate
+
+    def adjust(self, amount: float):
+        """Give back (positive) or charge extra (negative) tokens after the fact"""
+        with self._lock:
+            self._refill(time.monotonic())
+            self.tokens = min(self.capacity, self.tokens + amount)
+
+
+class Permit:
+    """Admission granted by a RateLimiter; release it once the call finishes"""
+
+    __slots__ = ("limiter", "tokens", "semaphore")
+
+    def __init__(self, limiter: "RateLimiter", tokens: int, semaphore: Any):
+        self.limiter = limiter
+        self.tokens = tokens
+        self.semaphore = semaphore
+
+    def release(self, used_tokens: Optional[int] = None):
+        """Free the concurrency slot and reconcile the token estimate with actual usage"""
+        if used_tokens is not None and self.limiter.token_bucket is not None:
+            self.limiter.token_bucket.adjust(self.tokens - used_tokens)
+        if self.semaphore is not None:
+            self.semaphore.release()
+            self.semaphore = None
+
+
+class RateLimiter:
+    """Requests-per-minute and tokens-per-minute buckets plus a concurrency cap.
+
+    max_concurrency is enforced separately for sync callers (threads) and for
+    each event loop.
+    """
+
+    def __init__(self, requests_per_minute: Optional[float] = None, tokens_per_minute: Optional[float] = None,
+                 max_concurrency: Optional[int] = None, name: str = ""):
+        self.name = name
+        self.request_bucket = TokenBucket(requests_per_minute) if requests_per_minute else None
+        self.token_bucket = TokenBucket(tokens_per_minute) if tokens_per_minute else None
+        self.max_concurrency = max_concurrency
+        self._semaphore = threading.BoundedSemaphore(max_concurrency) if max_concurrency else None
+        self._async_semaphores = weakref.WeakKeyDictionary()
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any], name: str = "") -> Optional["RateLimiter"]:
+        """Build a limiter from a provider or model config section, or None if it sets no limits"""
+        if not any(config.get(key) for key in RATE_LIMIT_KEYS):
+            return None
+        return cls(
+            requests_per_minute=config.get("requests_per_minute"),
+            tokens_per_minute=config.get("tokens_per_minute"),
+            max_concurrency=config.get("max_concurrency"),
+            name=name,
+        )
+
+    def _reserve(self, tokens: int) -> float:
+        wait = 0.0
+        if self.request_bucket is not None:
+            wait = self.request_bucket.reserve(1)
+        if self.token_bucket is not None:
+            wait = max(wait, self.token_bucket.reserve(tokens))
+        return wait
+
+    def _refund(self, tokens: int):
+        if self.request_bucket is not None:
+            self.request_bucket.adjust(1)
+        if self.token_bucket is not None:
+            self.token_bucket.adjust(tokens)
+
+    def _get_async_semaphore(self) -> Optional[asyncio.Semaphore]:
+        if not self.max_concurrency:
+            return None
+        loop = asyncio.get_running_loop()
+        semaphore = self._async_semaphores.get(loop)
+        if semaphore is None:
+            semaphore = self._async_semaphores[loop] = asyncio.Semaphore(self.max_concurrency)
+        return semaphore
+
+    def acquire(self, tokens: int) -> Permit:
+        """Block until a request of about `tokens` tokens may be sent"""
+        if self._semaphore is not None:
+            self._semaphore.acquire()
+        try:
+            wait = self._reserve(tokens)
+            if wait > 0:
+                time.sleep(wait)
+        except BaseException:
+            if self._semaphore is not None:
+                self._semaphore.release()
+            raise
+        return Permit(self, tokens, self._semaphore)
+
+    async def acquire_async(self, tokens: int) -> Permit:
+        """Wait without blocking the event loop until a request may be sent"""
+        semaphore = self._get_async_semaphore()
+        if semaphore is not None:
+            await semaphore.acquire()
+        try:
+            wait = self._reserve(tokens)
+            if wait > 0:
+                try:
+                    await asyncio.sleep(wait)
+                except asyncio.CancelledError:
+                    self._refund(tokens)
+                    raise
+        except BaseException:
+            if semaphore is not None:
+                semaphore.release()
+            raise
+        return Permit(self, tokens, semaphore)
+
+
+def build_rate_limiters(providers_config: Dict[str, Any]) -> Dict[str, Tuple[RateLimiter, ...]]:
+    """Map 'provider/model_id' to the limiters that apply to it, provider-level first"""
+    limiters = {}
+    for provider_name, provider_config in providers_config.items():
+        provider_limiter = RateLimiter.from_config(provider_config, provider_name)
+        for model_id, model_config in (provider_config.get("models") or {}).items():
+            name = f"{provider_name}/{model_id}"
+            chain = (provider_limiter, RateLimiter.from_config(model_config or {}, name))
+            chain = tuple(limiter for limiter in chain if limiter is not None)
+            if chain:
+                limiters[name] = chain
+    return limiters
@@ -0,0 +1,79 @@
+import asyncio
+import random
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from ..errors import LLMError
+
+DEFAULT_MAX_ATTEMPTS = 3
+DEFAULT_BASE_DELAY = 1.0
+DEFAULT_MAX_DELAY = 30.0
+DEFAULT_MAX_RETRY_AFTER = 120.0
+
+
+class RetryPolicy:
+    """Retry retryable LLMErrors with exponential backoff and full jitter.
+
+    The wait before attempt n+1 is uniform in [0, min(max_delay, base_delay * 2**n)],
+    unless the error carries a server-provided retry_after, which is honored
+    as long as it does not exceed max_retry_after.
+    """
+
+    def __init__(self, max_attempts: int = DEFAULT_MAX_ATTEMPTS, base_delay: float = DEFAULT_BASE_DELAY,
+                 max_delay: float = DEFAULT_MAX_DELAY, max_retry_after: float = DEFAULT_MAX_RETRY_AFTER):
+        self.max_attempts = max(1, int(max_attempts))
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.max_retry_after = max_retry_after
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any]) -> "RetryPolicy":
+        """Create a policy from the `retry` section of config.yaml"""
+        return cls(
+            max_attempts=config.get("max_attempts", DEFAULT_MAX_ATTEMPTS),
+            base_delay=config.get("base_delay", DEFAULT_BASE_DELAY),
+            max_delay=config.get("max_delay", DEFAULT_MAX_DELAY),
+            max_retry_after=config.get("max_retry_after", DEFAULT_MAX_RETRY_AFTER),
+        )
+
+    def with_attempts(self, max_attempts: int) -> "RetryPolicy":
+        """Copy of this policy with a different attempt budget"""
+        return RetryPolicy(max_attempts, self.base_delay, self.max_delay, self.max_retry_after)
+
+    def backoff(self, attempt: int, error: Optional[BaseException] = None) -> Optional[float]:
+        """Seconds to wait after a failed attempt (0-based), or None to give up"""
+        if attempt + 1 >= self.max_attempts:
+            return None
+        if not isinstance(error, LLMError) or not error.retryable:
+            return None
+        if error.retry_after is not None:
+            if error.retry_after > self.max_retry_after:
+                return None
+            return error.retry_after
+        return random.uniform(0, min(self.max_delay, self.base_delay * (2 ** attempt)))
+
+    def call(self, fn: Callable[[], Any]) -> Any:
+        """Call fn() until it succeeds, fails fatally or attempts run out"""
+        attempt = 0
+        while True:
+            try:
+                return fn()
+            except Exception as e:
+                delay = self.backoff(attempt, e)
+                if delay is None:
+                    raise
+            time.sleep(delay)
+            attempt += 1
+
+    async def acall(self, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """Await fn() until it succeeds, fails fatally or attempts run out"""
+        attempt = 0
+        while True:
+            try:
+                return await fn()
+            except Exception as e:
+                delay = self.backoff(attempt, e)
+                if delay is None:
+                    raise
+            await asyncio.sleep(delay)
+            attempt += 1
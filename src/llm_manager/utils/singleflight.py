@@ -0,0 +1,63 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable
+
+
+class _Flight:
+    """An in-flight upstream call and the number of callers waiting on it"""
+
+    __slots__ = ("task", "waiters")
+
+    def __init__(self, task: asyncio.Task):
+        self.task = task
+        self.waiters = 0
+
+
+class SingleFlight:
+    """Coalesce identical concurrent async calls into one upstream call.
+
+    The first caller for a key starts the call; later callers with the same
+    key await the same task and get its result or exception. Each waiter is
+    shielded, so a cancelled waiter does not cancel the shared call; the call
+    is only cancelled once every waiter has gone away.
+    """
+
+    def __init__(self):
+        self._flights: Dict[Hashable, _Flight] = {}
+        self.started = 0
+        self.coalesced = 0
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """Run fn() for key, or join the call already in flight for it"""
+        # Tasks are bound to a loop, so never share them across loops
+        flight_key = (asyncio.get_running_loop(), key)
+        flight = self._flights.get(flight_key)
+        if flight is None:
+            flight = _Flight(asyncio.ensure_future(fn()))
+            self._flights[flight_key] = flight
+            flight.task.add_done_callback(lambda _, k=flight_key, f=flight: self._forget(k, f))
+            self.started += 1
+        else:
+            self.coalesced += 1
+
+        flight.waiters += 1
+        try:
+            return await asyncio.shield(flight.task)
+        finally:
+            flight.waiters -= 1
+            if flight.waiters == 0 and not flight.task.done():
+                # Forget first, so a caller arriving before the task finishes
+                # cancelling starts a fresh call instead of joining this one
+                self._forget(flight_key, flight)
+                flight.task.cancel()
+
+    def _forget(self, flight_key, flight: _Flight):
+        if self._flights.get(flight_key) is flight:
+            del self._flights[flight_key]
+
+    def in_flight(self) -> int:
+        """Number of distinct upstream calls currently running"""
+        return len(self._flights)
+
+    def stats(self) -> Dict[str, int]:
+        """Upstream calls started versus callers that joined an existing call"""
+        return {"started": self.started, "coalesced": self.coalesced, "in_flight": self.in_flight()}
@@ -0,0 +1,91 @@
+from typing import Any, Dict, Optional
+
+from ..streaming import make_usage
+
+# Keys carrying the output budget of a request, by provider API
+_MAX_OUTPUT_KEYS = ("max_tokens", "max_completion_tokens", "max_output_tokens", "num_predict")
+DEFAULT_MAX_OUTPUT_TOKENS = 1000
+
+# Keys of a usage dict built by make_usage
+_NORMALIZED_KEYS = {"input_tokens", "output_tokens", "thinking_tokens", "cache_read_tokens", "cache_write_tokens"}
+
+# Rough characters-per-token ratio for pre-call estimates
+_CHARS_PER_TOKEN = 4
+
+
+def estimate_tokens(prompt: str, kwargs: Dict[str, Any]) -> int:
+    """Estimate the tokens a request may consume: prompt + system plus the output budget"""
+    if isinstance(prompt, (list, tuple)):
+        # A prompt given as parts (Anthropic text blocks or strings)
+        text_length = sum(len(part if isinstance(part, str) else part.get("text", "")) for part in prompt)
+    else:
+        text_length = len(prompt or "")
+    system = kwargs.get("system") or kwargs.get("system_message")
+    if isinstance(system, str):
+        text_length += len(system)
+    max_output = next((kwargs[key] for key in _MAX_OUTPUT_KEYS if kwargs.get(key)), DEFAULT_MAX_OUTPUT_TOKENS)
+    return text_length // _CHARS_PER_TOKEN + 1 + int(max_output)
+
+
+def _get(obj: Any, name: str) -> Any:
+    """Read a field from either a dict or an SDK object"""
+    if isinstance(obj, dict):
+        return obj.get(name)
+    return getattr(obj, name, None)
+
+
+def extract_usage(response: Any) -> Optional[Dict[str, int]]:
+    """Normalized token usage of a raw provider response, or None if it carries none.
+
+    Handles Azure chat completions and Responses objects, Bedrock/Anthropic
+    message dicts, Bedrock Converse responses and Ollama /api/generate dicts.
+    """
+    if isinstance(response, dict) and "prompt_eval_count" in response:
+        # Ollama
+        return make_usage(response.get("prompt_eval_count"), response.get("eval_count"))
+
+    usage = _get(response, "usage")
+    if usage is None:
+        return None
+
+    if isinstance(usage, dict) and usage.keys() <= _NORMALIZED_KEYS:
+        # Already normalized by the provider (Anthropic UsageText and thinking dicts)
+        return dict(usage)
+
+    if _get(usage, "prompt_tokens") is not None:
+        # Azure chat completions
+        details = _get(usage, "completion_tokens_details")
+        return make_usage(
+            _get(usage, "prompt_tokens"),
+            _get(usage, "completion_tokens"),
+            _get(details, "reasoning_tokens") if details is not None else None,
+        )
+
+    if _get(usage, "inputTokens") is not None:
+        # Bedrock Converse
+        return make_usage(
+            _get(usage, "inputTokens"),
+            _get(usage, "outputTokens"),
+            cache_read_tokens=_get(usage, "cacheReadInputTokens"),
+            cache_write_tokens=_get(usage, "cacheWriteInputTokens"),
+        )
+
+    if _get(usage, "input_tokens") is not None:
+        # Azure Responses API and Anthropic-format messages
+        details = _get(usage, "output_tokens_details")
+        return make_usage(
+            _get(usage, "input_tokens"),
+            _get(usage, "output_tokens"),
+            _get(details, "reasoning_tokens") if details is not None else None,
+            _get(usage, "cache_read_input_tokens"),
+            _get(usage, "cache_creation_input_tokens"),
+        )
+
+    return None
+
+
+def total_tokens(usage: Optional[Dict[str, int]]) -> Optional[int]:
+    """Input plus output tokens of a normalized usage dict, counting prompt-cache writes but not reads"""
+    if not usage:
+        return None
+    return usage.get("input_tokens", 0) + usage.get("output_tokens", 0) + usage.get("cache_write_tokens", 0)
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Startup benchmark: time and memory cost of `import llm_manager`.
+
+Each measurement runs in a fresh interpreter so module caches do not skew
+the numbers. Also reports which provider SDKs were imported as a side effect
+and the cost of constructing an LLMManager with a single enabled provider.
+
+Usage:
+    python tests/benchmark_import.py [--runs N]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+# Make the in-repo package importable without installing it
+SRC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src')
+
+SDK_MODULES = ["openai", "anthropic", "abacusai", "boto3", "aioboto3", "requests", "pkg_resources"]
+
+PROBE = r"""
+import json, sys, time
+
+def rss_kb():
+    with open("/proc/self/status") as f:
+        for line in f:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1])
+    return 0
+
+rss_before = rss_kb()
+start = time.perf_counter()
+import llm_manager
+import_s = time.perf_counter() - start
+rss_after_import = rss_kb()
+
+init_s = None
+if len(sys.argv) > 1:
+    start = time.perf_counter()
+    llm_manager.LLMManager(sys.argv[1])
+    init_s = time.perf_counter() - start
+
+print(json.dumps({
+    "import_s": import_s,
+    "import_rss_kb": rss_after_import - rss_before,
+    "init_s": init_s,
+    "total_rss_kb": rss_kb(),
+    "sdks": [m for m in %r if m in sys.modules],
+}))
+""" % (SDK_MODULES,)
+
+SINGLE_PROVIDER_CONFIG = """
+providers:
+  ollama:
+    enabled: true
+    base_url: "http://localhost:11434"
+    models:
+      llama3.2:
+        model_id: "llama3.2"
+default_model: "ollama/llama3.2"
+"""
+
+
+def run_probe(config_path=None):
+    """Run one measurement in a fresh interpreter"""
+    env = dict(os.environ, PYTHONPATH=SRC_DIR + os.pathsep + os.environ.get("PYTHONPATH", ""))
+    args = [sys.executable, "-c", PROBE] + ([config_path] if config_path else [])
+    output = subprocess.run(args, env=env, capture_output=True, text=True, check=True).stdout
+    return json.loads(output)
+
+
+def summarize(label, samples):
+    """Print median/min timings and memory for a set of samples"""
+    import_ms = [s["import_s"] * 1000 for s in samples]
+    print(f"\n{label}")
+    print("-" * 60)
+    print(f"import llm_manager: median {statistics.median(import_ms):.1f} ms, min {min(import_ms):.1f} ms")
+    print(f"RSS added by import: {statistics.median(s['import_rss_kb'] for s in samples) / 1024:.1f} MiB")
+    init = [s["init_s"] * 1000 for s in samples if s["init_s"] is not None]
+    if init:
+        print(f"LLMManager(config): median {statistics.median(init):.1f} ms")
+    print(f"Total RSS: {statistics.median(s['total_rss_kb'] for s in samples) / 1024:.1f} MiB")
+    print(f"SDKs loaded: {', '.join(samples[-1]['sdks']) or 'none'}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5, help="measurements per scenario")
+    args = parser.parse_args()
+
+    summarize("Import only", [run_probe() for _ in range(args.runs)])
+
+    with tempfile.NamedTemporaryFile("w", suffix=".yaml", delete=False) as f:
+        f.write(SINGLE_PROVIDER_CONFIG)
+        config_path = f.name
+    try:
+        summarize("Import + LLMManager with only Ollama enabled",
+                  [run_probe(config_path) for _ in range(args.runs)])
+    finally:
+        os.unlink(config_path)
+
+
+if __name__ == "__main__":
+    main()
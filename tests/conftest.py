@@ -0,0 +1,23 @@
+import pytest
+
+import llm_manager.llm_manager as manager_mod
+from llm_manager import LLMManager
+
+
+@pytest.fixture()
+def make_manager(monkeypatch, tmp_path):
+    """Build an LLMManager from a YAML config string and fake provider classes.
+
+    make_manager(CONFIG, fake=FakeProvider) registers FakeProvider as the
+    "fake" provider for the duration of the test, writes CONFIG to a
+    temporary config.yaml and loads the manager from it.
+    """
+
+    def make(config: str, **providers) -> LLMManager:
+        for name, provider_class in providers.items():
+            monkeypatch.setitem(manager_mod.PROVIDER_MAP, name, provider_class)
+        config_path = tmp_path / "config.yaml"
+        config_path.write_text(config)
+        return LLMManager(str(config_path))
+
+    return make
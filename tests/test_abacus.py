@@ -0,0 +1,77 @@
+import asyncio
+import threading
+import time
+
+import abacusai
+import pytest
+import requests
+
+import llm_manager.providers.abacus as abacus_mod
+from llm_manager import RateLimitedError, RequestTimeoutError, ServerError
+from llm_manager.providers.abacus import AbacusProvider
+
+
+CONFIG = {
+    "enabled": True,
+    "api_key": "abacus-key",
+    "max_concurrency": 2,
+    "models": {"gemini-2.5-pro": {"model_id": "GEMINI_2_5_PRO"}},
+}
+
+
+@pytest.fixture()
+def clients(monkeypatch):
+    created = []
+    state = {"active": 0, "peak": 0}
+    lock = threading.Lock()
+
+    class FakeApiClient:
+        def __init__(self, api_key=None):
+            created.append(api_key)
+
+        def evaluate_prompt(self, prompt, llm_name, **kwargs):
+            if prompt == "throttle":
+                raise abacusai.ApiException("Too many requests", 429)
+            if prompt == "unreachable":
+                raise requests.exceptions.ConnectionError("Connection refused")
+            if prompt == "slow":
+                raise requests.exceptions.ReadTimeout("Read timed out")
+            with lock:
+                state["active"] += 1
+                state["peak"] = max(state["peak"], state["active"])
+            time.sleep(0.02)
+            with lock:
+                state["active"] -= 1
+            return f"{llm_name}:{prompt}:{threading.current_thread().name}"
+
+    monkeypatch.setattr(abacus_mod.abacusai, "ApiClient", FakeApiClient)
+    return created, state
+
+
+def test_client_is_cached_and_errors_are_typed(clients):
+    created, _ = clients
+    provider = AbacusProvider(CONFIG)
+
+    provider.generate("a", "gemini-2.5-pro")
+    provider.generate("b", "gemini-2.5-pro")
+    assert created == ["abacus-key"]
+
+    with pytest.raises(RateLimitedError):
+        provider.generate("throttle", "gemini-2.5-pro")
+    with pytest.raises(ServerError, match="Connection refused"):
+        provider.generate("unreachable", "gemini-2.5-pro")
+    with pytest.raises(RequestTimeoutError):
+        provider.generate("slow", "gemini-2.5-pro")
+
+
+@pytest.mark.asyncio
+async def test_generate_async_runs_on_bounded_pool(clients):
+    _, state = clients
+    provider = AbacusProvider(CONFIG)
+
+    results = await asyncio.gather(*(provider.generate_async(str(i), "gemini-2.5-pro") for i in range(6)))
+
+    assert all(result.startswith("GEMINI_2_5_PRO:") for result in results)
+    assert all(":abacus" in result for result in results)
+    assert state["peak"] <= 2
+    provider.close_clients()
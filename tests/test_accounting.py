@@ -0,0 +1,121 @@
+import csv
+import io
+import json
+import types
+
+import pytest
+
+from llm_manager import LLMResult, StreamEvent
+from llm_manager.result import UsageText
+from llm_manager.utils.accounting import UsageRegistry
+
+
+def test_registry_aggregates_and_prices():
+    registry = UsageRegistry({"bedrock/claude": {"input": 3.0, "output": 15.0}})
+    registry.record("bedrock", "bedrock/claude", {"input_tokens": 1000, "output_tokens": 200}, tag="search")
+    registry.record("bedrock", "bedrock/claude", {"input_tokens": 1000, "output_tokens": 200, "thinking_tokens": 50})
+    registry.record("azure", "azure/gpt4o", {"input_tokens": 10, "output_tokens": 5}, tag="search")
+    registry.record("azure", "azure/gpt4o", None)
+
+    by_model = registry.snapshot()
+    assert by_model["bedrock/claude"]["calls"] == 2
+    assert by_model["bedrock/claude"]["thinking_tokens"] == 50
+    assert by_model["bedrock/claude"]["cost"] == pytest.approx(2 * (0.003 + 0.003))
+    assert by_model["azure/gpt4o"] == {
+        "calls": 2, "input_tokens": 10, "output_tokens": 5, "thinking_tokens": 0,
+        "cache_read_tokens": 0, "cache_write_tokens": 0, "cost": 0.0,
+    }
+    assert registry.snapshot("tag")["search"]["calls"] == 2
+    assert registry.snapshot("provider").keys() == {"bedrock", "azure"}
+    assert registry.snapshot(None)["total"]["calls"] == 4
+
+    with pytest.raises(ValueError):
+        registry.snapshot("region")
+
+
+def test_registry_prices_prompt_cache_tokens():
+    registry = UsageRegistry({
+        "anthropic/claude": {"input": 3.0, "output": 15.0},
+        "bedrock/claude": {"input": 3.0, "output": 15.0, "cache_read": 0.5},
+    })
+    usage = {"input_tokens": 100, "output_tokens": 10, "cache_read_tokens": 10000, "cache_write_tokens": 2000}
+    registry.record("anthropic", "anthropic/claude", usage)
+    registry.record("bedrock", "bedrock/claude", usage)
+
+    by_model = registry.snapshot()
+    assert by_model["anthropic/claude"]["cache_read_tokens"] == 10000
+    assert by_model["anthropic/claude"]["cache_write_tokens"] == 2000
+    # Defaults: reads at 10% and writes at 125% of the input price
+    assert by_model["anthropic/claude"]["cost"] == pytest.approx((300 + 150 + 3000 + 7500) / 1e6)
+    assert by_model["bedrock/claude"]["cost"] == pytest.approx((300 + 150 + 5000 + 7500) / 1e6)
+
+def test_registry_export():
+    registry = UsageRegistry()
+    registry.record("ollama", "ollama/llama3.2", {"input_tokens": 3, "output_tokens": 4}, tag="dev")
+
+    out = io.StringIO()
+    registry.export(out)
+    assert json.loads(out.getvalue())[0]["output_tokens"] == 4
+
+    out = io.StringIO()
+    registry.export(out, format="csv")
+    rows = list(csv.DictReader(io.StringIO(out.getvalue())))
+    assert rows[0]["model"] == "ollama/llama3.2" and rows[0]["tag"] == "dev"
+
+    registry.reset()
+    assert registry.rows() == []
+
+
+def test_usage_text_is_a_plain_string():
+    text = UsageText("Paris", {"input_tokens": 5, "output_tokens": 1})
+    assert text == "Paris" and isinstance(text, str)
+    result = LLMResult.from_response(text)
+    assert result.usage == {"input_tokens": 5, "output_tokens": 1}
+    assert type(result.text) is str
+
+
+CONFIG = """
+providers:
+  fake:
+    enabled: true
+    models:
+      m:
+        model_id: "m"
+        pricing:
+          input: 1.0
+          output: 2.0
+default_model: "fake/m"
+"""
+
+
+class FakeProvider:
+    def __init__(self, config):
+        self.models = config.get("models", {})
+
+    def generate(self, prompt, model_id, **kwargs):
+        return UsageText("hi", {"input_tokens": 100, "output_tokens": 10})
+
+    async def generate_async(self, prompt, model_id, **kwargs):
+        return types.SimpleNamespace(usage=types.SimpleNamespace(prompt_tokens=50, completion_tokens=5))
+
+    def stream(self, prompt, model_id, **kwargs):
+        yield StreamEvent("text", "hi")
+        yield StreamEvent("usage", usage={"input_tokens": 7, "output_tokens": 1})
+
+
+@pytest.fixture()
+def manager(make_manager):
+    return make_manager(CONFIG, fake=FakeProvider)
+
+
+@pytest.mark.asyncio
+async def test_manager_records_every_call(manager):
+    manager.generate("q", tag="sync")
+    await manager.generate_async("q", tag="async")
+    list(manager.stream("q", tag="stream"))
+
+    by_tag = manager.usage.snapshot("tag")
+    assert by_tag["sync"]["input_tokens"] == 100
+    assert by_tag["async"]["output_tokens"] == 5
+    assert by_tag["stream"]["input_tokens"] == 7
+    assert manager.usage.snapshot()["fake/m"]["cost"] == pytest.approx((157 * 1.0 + 16 * 2.0) / 1e6)
@@ -0,0 +1,253 @@
+import asyncio
+import types
+
+import pytest
+
+import llm_manager.providers.anthropic as anthropic_mod
+from llm_manager import ServerError
+from llm_manager.providers.anthropic import AnthropicProvider
+
+
+def _ns(**kwargs):
+    return types.SimpleNamespace(**kwargs)
+
+
+CONFIG = {
+    "enabled": True,
+    "api_key": "sk-provider",
+    "models": {
+        "claude-sonnet-4": {"model_id": "claude-sonnet-4-20250514"},
+        "claude-haiku": {"model_id": "claude-haiku", "api_key": "sk-model"},
+    },
+}
+
+STREAM = [
+    _ns(type="message_start", message=_ns(usage=_ns(input_tokens=12, output_tokens=1))),
+    _ns(type="content_block_delta", delta=_ns(type="thinking_delta", thinking="Hmm.")),
+    _ns(type="content_block_delta", delta=_ns(type="text_delta", text="Hello")),
+    _ns(type="message_delta", delta=_ns(stop_reason="end_turn"), usage=_ns(output_tokens=9)),
+]
+
+MESSAGE = _ns(content=[_ns(type="text", text="Hello")], usage=_ns(input_tokens=5, output_tokens=2))
+
+
+class FakeAsyncStream:
+    def __init__(self, events):
+        self._events = events
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def __aiter__(self):
+        for event in self._events:
+            yield event
+
+
+@pytest.fixture()
+def clients(monkeypatch):
+    created = []
+
+    class FakeAsyncAnthropic:
+        def __init__(self, api_key=None):
+            created.append(("async", api_key))
+            self.requests = []
+            self.messages = _ns(create=self.create)
+
+        async def close(self):
+            created.append(("async closed", None))
+
+        async def create(self, **params):
+            self.requests.append(params)
+            if params.get("stream"):
+                return FakeAsyncStream(STREAM)
+            return MESSAGE
+
+    class FakeAnthropic:
+        def __init__(self, api_key=None):
+            created.append(("sync", api_key))
+            self.messages = _ns(create=lambda **params: MESSAGE)
+
+        def close(self):
+            created.append(("closed", None))
+
+    monkeypatch.setattr(anthropic_mod, "Anthropic", FakeAnthropic)
+    monkeypatch.setattr(anthropic_mod, "AsyncAnthropic", FakeAsyncAnthropic)
+    return created
+
+
+def test_clients_are_cached_per_api_key(clients):
+    provider = AnthropicProvider(CONFIG)
+
+    assert provider.generate("Hi", "claude-sonnet-4") == "Hello"
+    provider.generate("Hi again", "claude-sonnet-4")
+    provider.generate("Hi", "claude-haiku")
+
+    assert clients == [("sync", "sk-provider"), ("sync", "sk-model")]
+    provider.close_clients()
+    assert clients.count(("closed", None)) == 2
+
+
+@pytest.mark.asyncio
+async def test_generate_async_text_and_thinking(clients):
+    provider = AnthropicProvider(CONFIG)
+
+    text = await provider.generate_async("Hi", "claude-sonnet-4")
+    assert text == "Hello"
+    assert text.usage == {"input_tokens": 5, "output_tokens": 2}
+
+    result = await provider.generate_async("Hi", "claude-sonnet-4", thinking_tokens=2000, max_tokens=4000)
+    assert result == {"thinking": "Hmm.", "response": "Hello", "usage": {"input_tokens": 12, "output_tokens": 9}}
+    assert clients == [("async", "sk-provider")]
+
+    await provider.aclose()
+    assert clients[-1] == ("async closed", None)
+    assert not provider._async_clients
+
+
+def test_async_clients_are_per_event_loop(clients):
+    provider = AnthropicProvider(CONFIG)
+
+    async def client_and_close(close):
+        client = await provider._get_async_client(CONFIG["models"]["claude-sonnet-4"])
+        if close:
+            await provider.aclose()
+        return client
+
+    # One event loop per call, as with asyncio.run in a sync caller
+    first = asyncio.run(client_and_close(False))
+    second = asyncio.run(client_and_close(False))
+    assert first is not second
+    # The first loop's client was closed once its loop was gone
+    assert clients.count(("async closed", None)) == 1
+
+    # aclose only closes the running loop's clients
+    asyncio.run(client_and_close(True))
+    assert clients.count(("async closed", None)) == 3
+    assert not provider._async_clients
+
+
+@pytest.mark.asyncio
+async def test_astream(clients):
+    provider = AnthropicProvider(CONFIG)
+
+    events = [event async for event in provider.astream("Hi", "claude-sonnet-4")]
+
+    assert [(e.type, e.text) for e in events[:-1]] == [("thinking", "Hmm."), ("text", "Hello")]
+    assert events[-1].usage == {"input_tokens": 12, "output_tokens": 9}
+    assert events[-1].finish_reason == "end_turn"
+
+
+LONG_SYSTEM = "You are a careful judge. " * 200
+
+
+def test_prompt_cache_breakpoints(clients):
+    provider = AnthropicProvider(CONFIG)
+
+    _, params, _ = provider._prepare_request("Short question", "claude-sonnet-4", {"system": LONG_SYSTEM})
+    assert params["system"] == [{"type": "text", "text": LONG_SYSTEM, "cache_control": {"type": "ephemeral"}}]
+    # A plain prompt is never marked, only the stable system prompt
+    assert params["messages"][0]["content"] == "Short question"
+
+    # A prompt given as parts caches its shared prefix
+    context = "Earlier ideas: ... " * 300
+    _, params, _ = provider._prepare_request([context, "Next idea?"], "claude-sonnet-4", {"system": "Be brief."})
+    assert params["system"] == "Be brief."
+    assert params["messages"][0]["content"] == [
+        {"type": "text", "text": context, "cache_control": {"type": "ephemeral"}},
+        {"type": "text", "text": "Next idea?"},
+    ]
+
+    # Short prompts, opted-out calls and disabled models are sent unmarked
+    _, params, _ = provider._prepare_request("Hi", "claude-sonnet-4", {"system": "Be brief."})
+    assert params["system"] == "Be brief."
+    _, params, _ = provider._prepare_request("Hi", "claude-sonnet-4", {"system": LONG_SYSTEM, "prompt_cache": False})
+    assert params["system"] == LONG_SYSTEM and "prompt_cache" not in params
+    provider.models["claude-haiku"]["prompt_caching"] = {"min_tokens": 100000}
+    _, params, _ = provider._prepare_request("Hi", "claude-haiku", {"system": LONG_SYSTEM})
+    assert params["system"] == LONG_SYSTEM
+
+
+def test_prompt_cache_usage_is_reported(clients, monkeypatch):
+    provider = AnthropicProvider(CONFIG)
+    message = _ns(content=[_ns(type="text", text="Hello")], usage=_ns(
+        input_tokens=5, output_tokens=2, cache_read_input_tokens=1200, cache_creation_input_tokens=0,
+    ))
+    provider._get_client = lambda model_config: _ns(messages=_ns(create=lambda **params: message))
+
+    text = provider.generate("Hi", "claude-sonnet-4", system=LONG_SYSTEM)
+
+    assert text.usage == {"input_tokens": 5, "output_tokens": 2, "cache_read_tokens": 1200}
+
+
+def test_prompt_cache_usage_reaches_accounting(monkeypatch, make_manager):
+    message = _ns(content=[_ns(type="text", text="Hello")], usage=_ns(
+        input_tokens=10, output_tokens=5, cache_read_input_tokens=1000, cache_creation_input_tokens=2000,
+    ))
+    monkeypatch.setattr(anthropic_mod, "Anthropic", lambda api_key=None: _ns(messages=_ns(create=lambda **p: message)))
+    manager = make_manager("""
+providers:
+  anthropic:
+    enabled: true
+    api_key: sk-test
+    models:
+      claude-sonnet-4:
+        model_id: claude-sonnet-4-20250514
+        pricing: {input: 3.0, output: 15.0}
+""")
+
+    result = manager.generate("Hi", model="anthropic/claude-sonnet-4", system=LONG_SYSTEM, normalize=True)
+
+    expected = {"input_tokens": 10, "output_tokens": 5, "cache_read_tokens": 1000, "cache_write_tokens": 2000}
+    assert result.usage == expected
+    totals = manager.usage.snapshot()["anthropic/claude-sonnet-4"]
+    assert totals["cache_read_tokens"] == 1000 and totals["cache_write_tokens"] == 2000
+    assert totals["cost"] == pytest.approx((10 * 3.0 + 5 * 15.0 + 1000 * 0.3 + 2000 * 3.75) / 1e6)
+
+
+def test_prompt_cache_option_stays_with_caching_providers(monkeypatch, make_manager):
+    requests = []
+
+    def create(**params):
+        requests.append(params)
+        raise ServerError("overloaded")
+
+    class PlainProvider:
+        def __init__(self, config):
+            self.models = config.get("models", {})
+            self.kwargs = []
+
+        def generate(self, prompt, model_id, **kwargs):
+            self.kwargs.append(kwargs)
+            return "plain"
+
+    monkeypatch.setattr(anthropic_mod, "Anthropic", lambda api_key=None: _ns(messages=_ns(create=create)))
+    manager = make_manager("""
+providers:
+  anthropic:
+    enabled: true
+    api_key: sk-test
+    models:
+      claude-sonnet-4:
+        model_id: claude-sonnet-4-20250514
+  plain:
+    enabled: true
+    models:
+      llama:
+        model_id: llama
+model_aliases:
+  claude-ha:
+    - "anthropic/claude-sonnet-4"
+    - "plain/llama"
+retry:
+  max_attempts: 1
+""", plain=PlainProvider)
+
+    assert manager.generate("Hi", model="claude-ha", system=LONG_SYSTEM, prompt_cache=False) == "plain"
+
+    # Anthropic honored the option; the fallback target never saw it
+    assert isinstance(requests[0]["system"], str)
+    assert manager.providers["plain"].kwargs == [{"system": LONG_SYSTEM}]
+
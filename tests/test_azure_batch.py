@@ -0,0 +1,167 @@
+import json
+import re
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from llm_manager import LLMManager
+from llm_manager.errors import BadRequestError, LLMError
+
+
+class MockAzureBatchService:
+    """In-memory stand-in for the Azure OpenAI files and batches endpoints"""
+
+    def __init__(self):
+        self.files = {}
+        self.batches = {}
+        self.requests = []
+        self.statuses = ["validating", "in_progress", "completed"]
+
+    def upload(self, body: bytes) -> dict:
+        # Keep the JSONL part of the multipart upload
+        lines = [line for line in body.decode().splitlines() if line.startswith('{"custom_id"')]
+        file_id = f"file-{len(self.files)}"
+        self.files[file_id] = "\n".join(lines) + "\n"
+        return {"id": file_id, "object": "file", "bytes": len(body), "created_at": 0,
+                "filename": "batch.jsonl", "purpose": "batch", "status": "processed"}
+
+    def create_batch(self, params: dict) -> dict:
+        batch = {"id": f"batch-{len(self.batches)}", "object": "batch", "created_at": 0, "status": "validating",
+                 **params}
+        self.batches[batch["id"]] = batch
+        return batch
+
+    def retrieve_batch(self, batch_id: str) -> dict:
+        batch = self.batches[batch_id]
+        batch["status"] = self.statuses.pop(0) if len(self.statuses) > 1 else self.statuses[0]
+        if batch["status"] == "completed" and "output_file_id" not in batch:
+            self._run(batch)
+        if batch["status"] == "failed":
+            batch["errors"] = {"object": "list", "data": [{"code": "invalid_file", "message": "bad JSONL"}]}
+        return batch
+
+    def _run(self, batch):
+        outputs, errors = [], []
+        for line in self.files[batch["input_file_id"]].splitlines():
+            request = json.loads(line)
+            self.requests.append(request)
+            prompt = request["body"]["messages"][-1]["content"]
+            if prompt == "bad":
+                errors.append({"id": "r", "custom_id": request["custom_id"], "error": None, "response": {
+                    "status_code": 400, "body": {"error": {"code": "invalid_prompt", "message": "Bad prompt"}},
+                }})
+                continue
+            outputs.append({"id": "r", "custom_id": request["custom_id"], "error": None, "response": {
+                "status_code": 200,
+                "body": {
+                    "id": "chatcmpl-1", "object": "chat.completion", "created": 0, "model": request["body"]["model"],
+                    "choices": [{"index": 0, "finish_reason": "stop",
+                                 "message": {"role": "assistant", "content": f"answer to {prompt}"}}],
+                    "usage": {"prompt_tokens": 5, "completion_tokens": 3, "total_tokens": 8},
+                },
+            }})
+        batch["output_file_id"] = "file-out"
+        batch["error_file_id"] = "file-err"
+        self.files["file-out"] = "\n".join(json.dumps(o) for o in reversed(outputs)) + "\n"
+        self.files["file-err"] = "\n".join(json.dumps(e) for e in errors) + "\n"
+
+
+@pytest.fixture()
+def service():
+    state = MockAzureBatchService()
+
+    class Handler(BaseHTTPRequestHandler):
+        def _reply(self, payload, content_type="application/json"):
+            data = payload if isinstance(payload, bytes) else json.dumps(payload).encode()
+            self.send_response(200)
+            self.send_header("content-type", content_type)
+            self.send_header("content-length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def do_POST(self):
+            body = self.rfile.read(int(self.headers.get("content-length") or 0))
+            path = self.path.split("?")[0]
+            if path == "/openai/files":
+                self._reply(state.upload(body))
+            elif path == "/openai/batches":
+                self._reply(state.create_batch(json.loads(body)))
+            else:
+                self.send_error(404)
+
+        def do_GET(self):
+            path = self.path.split("?")[0]
+            batch = re.fullmatch(r"/openai/batches/([\w-]+)", path)
+            content = re.fullmatch(r"/openai/files/([\w-]+)/content", path)
+            if batch:
+                self._reply(state.retrieve_batch(batch.group(1)))
+            elif content:
+                self._reply(state.files[content.group(1)].encode(), "application/octet-stream")
+            else:
+                self.send_error(404)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    state.endpoint = f"http://127.0.0.1:{server.server_port}"
+    yield state
+    server.shutdown()
+
+
+@pytest.fixture()
+def provider(service, tmp_path):
+    path = tmp_path / "config.yaml"
+    path.write_text(f"""
+default_model: azure/gpt4o
+providers:
+  azure:
+    enabled: true
+    batch:
+      deployment: gpt-4o-batch
+    models:
+      gpt4o:
+        api_key: test
+        api_version: "2024-10-21"
+        azure_endpoint: "{service.endpoint}"
+        model_id: gpt-4o
+""")
+    return LLMManager(str(path)).providers["azure"]
+
+
+def test_azure_batch_end_to_end(provider, service):
+    results = list(provider.run_batch_job(
+        ["What is AI?", ("bad", None, {}), {"prompt": "What is ML?", "max_tokens": 50}],
+        "gpt4o", poll_interval=0, system="Be brief.",
+    ))
+
+    # Requests reuse the live message format and run on the batch deployment
+    assert [r["custom_id"] for r in service.requests] == ["0", "1", "2"]
+    assert service.requests[0]["url"] == "/chat/completions"
+    assert service.requests[0]["body"] == {
+        "model": "gpt-4o-batch",
+        "messages": [{"role": "system", "content": "Be brief."}, {"role": "user", "content": "What is AI?"}],
+    }
+    assert service.requests[2]["body"]["max_tokens"] == 50
+    assert service.batches["batch-0"]["endpoint"] == "/chat/completions"
+    assert service.batches["batch-0"]["completion_window"] == "24h"
+
+    by_index = {r.index: r for r in results}
+    assert sorted(by_index) == [0, 1, 2]
+    assert by_index[0].response.text == "answer to What is AI?"
+    assert by_index[0].response.usage == {"input_tokens": 5, "output_tokens": 3}
+    assert by_index[0].item.prompt == "What is AI?"
+    assert by_index[0].target == "azure/gpt4o"
+    assert isinstance(by_index[1].error, BadRequestError)
+    assert "Bad prompt" in str(by_index[1].error)
+    assert by_index[2].response.text == "answer to What is ML?"
+
+
+def test_azure_batch_failure(provider, service):
+    service.statuses = ["validating", "failed"]
+
+    batch_id = provider.submit_batch_job(["What is AI?"], "gpt4o")
+    with pytest.raises(LLMError, match="failed: bad JSONL"):
+        provider.wait_batch_job(batch_id, "gpt4o", poll_interval=0)
@@ -0,0 +1,177 @@
+import asyncio
+import threading
+import pytest
+
+import llm_manager.batch as batch_mod
+from llm_manager import BatchItem, RequestTimeoutError
+from llm_manager.batch import BatchJobMixin, spool_jsonl
+
+
+CONFIG = """
+providers:
+  fast:
+    enabled: true
+    models:
+      echo:
+        model_id: "echo"
+  slow:
+    enabled: true
+    models:
+      echo:
+        model_id: "echo"
+model_aliases:
+  quick: "fast/echo"
+default_model: "fast/echo"
+"""
+
+
+class FakeProvider:
+    """Echo provider that records peak concurrency, per instance and overall"""
+
+    total_in_flight = 0
+    total_peak = 0
+    _lock = threading.Lock()
+
+    def __init__(self, config):
+        self.config = config
+        self.models = config.get("models", {})
+        self.in_flight = 0
+        self.peak = 0
+
+    def _enter(self):
+        with self._lock:
+            self.in_flight += 1
+            self.peak = max(self.peak, self.in_flight)
+            FakeProvider.total_in_flight += 1
+            FakeProvider.total_peak = max(FakeProvider.total_peak, FakeProvider.total_in_flight)
+
+    def _exit(self):
+        with self._lock:
+            self.in_flight -= 1
+            FakeProvider.total_in_flight -= 1
+
+    def generate(self, prompt, model_id, **kwargs):
+        self._enter()
+        try:
+            threading.Event().wait(0.01)
+            if prompt == "boom":
+                raise RuntimeError("provider failure")
+            return f"{model_id}:{prompt}:{kwargs.get('suffix', '')}"
+        finally:
+            self._exit()
+
+    async def generate_async(self, prompt, model_id, **kwargs):
+        self._enter()
+        try:
+            await asyncio.sleep(0.01)
+            if prompt == "boom":
+                raise RuntimeError("provider failure")
+            return f"{model_id}:{prompt}:{kwargs.get('suffix', '')}"
+        finally:
+            self._exit()
+
+
+@pytest.fixture()
+def manager(monkeypatch, make_manager):
+    monkeypatch.setattr(FakeProvider, "total_peak", 0)
+    return make_manager(CONFIG, fast=FakeProvider, slow=FakeProvider)
+
+
+def _items():
+    return [
+        "plain",
+        ("tuple", "slow/echo"),
+        ("with-kwargs", "quick", {"suffix": "x"}),
+        {"prompt": "dict", "model": "slow/echo", "suffix": "y"},
+        BatchItem("boom", "fast/echo"),
+        ("bad-model", "nope"),
+    ]
+
+
+def _check(results):
+    assert [r.index for r in results] == list(range(6))
+    assert results[0].response == "echo:plain:"
+    assert results[1].response == "echo:tuple:"
+    assert results[2].response == "echo:with-kwargs:x"
+    assert results[3].response == "echo:dict:y"
+    assert not results[4].ok and isinstance(results[4].error, RuntimeError)
+    assert not results[5].ok and isinstance(results[5].error, ValueError)
+
+
+def test_generate_batch_preserves_order_and_errors(manager):
+    _check(manager.generate_batch(_items()))
+
+
+@pytest.mark.asyncio
+async def test_generate_batch_async_preserves_order_and_errors(manager):
+    _check(await manager.generate_batch_async(_items()))
+
+
+@pytest.mark.asyncio
+async def test_generate_batch_async_respects_limits(manager):
+    items = [(f"p{i}", "fast/echo") for i in range(40)] + [(f"q{i}", "slow/echo") for i in range(40)]
+    results = await manager.generate_batch_async(
+        items, max_concurrency=6, provider_concurrency={"slow": 2}
+    )
+
+    assert all(r.ok for r in results)
+    assert manager.providers["slow"].peak <= 2
+    assert FakeProvider.total_peak <= 6
+
+
+def test_generate_batch_respects_limits(manager):
+    items = [(f"p{i}", "slow/echo") for i in range(20)]
+    results = manager.generate_batch(items, max_concurrency=4, provider_concurrency={"slow": 3})
+
+    assert all(r.ok for r in results)
+    assert manager.providers["slow"].peak <= 3
+    assert FakeProvider.total_peak <= 3
+
+
+class FakeJobProvider(BatchJobMixin):
+    _provider_name = "fake"
+
+    def __init__(self, statuses):
+        self.statuses = list(statuses)
+
+    def _get_batch_config(self, model_id):
+        return {}, {"poll_interval": 5}
+
+    def get_batch_job(self, job_id, model_id):
+        return self.statuses.pop(0)
+
+    def _batch_job_state(self, job):
+        return job, job != "running", None
+
+
+def test_batch_job_wait_times_out(monkeypatch):
+    sleeps = []
+    now = [0.0]
+
+    def sleep(seconds):
+        sleeps.append(seconds)
+        now[0] += seconds
+
+    monkeypatch.setattr(batch_mod.time, "sleep", sleep)
+    monkeypatch.setattr(batch_mod.time, "monotonic", lambda: now[0])
+    provider = FakeJobProvider(["running"] * 3 + ["done"])
+
+    assert provider.wait_batch_job("job-1", "m") == "done"
+    assert sleeps == [5, 5, 5]
+
+    provider.statuses = ["running"] * 3
+    with pytest.raises(RequestTimeoutError, match="Fake batch job job-1 still running after 12s"):
+        provider.wait_batch_job("job-1", "m", timeout=12)
+    assert len(sleeps) == 5
+
+
+def test_batch_job_items_target_one_model():
+    provider = FakeJobProvider([])
+
+    assert [i for i, _ in provider._iter_batch_items(["a", ("b", "fake/m")], "m")] == [0, 1]
+    with pytest.raises(ValueError, match="runs only fake/m"):
+        list(provider._iter_batch_items([("c", "other/m")], "m"))
+    with pytest.raises(ValueError, match="at least one item"):
+        with spool_jsonl([]):
+            pass
+
@@ -66,7 +66,7 @@ class FakeAioSession:
     def __init__(self, client_instance: FakeAioBoto3Client):
         self._client_instance = client_instance
 
-    def client(self, *, service_name, region_name, aws_access_key_id, aws_secret_access_key):
+    def client(self, *, service_name, region_name, aws_access_key_id, aws_secret_access_key, config=None):
         return self._client_instance
 
 
@@ -98,7 +98,7 @@ def test_bedrock_generate_sync(monkeypatch, test_config):
     # Monkeypatch boto3.client factory to return our fake client
     import llm_manager.providers.bedrock as bedrock_mod
 
-    def fake_boto3_client(*, service_name, region_name, aws_access_key_id, aws_secret_access_key):
+    def fake_boto3_client(*, service_name, region_name, aws_access_key_id, aws_secret_access_key, config=None):
         assert service_name == "bedrock-runtime"
         return fake_client
 
@@ -163,7 +163,7 @@ def test_bedrock_user_payload_sync(monkeypatch, test_config):
 
     import llm_manager.providers.bedrock as bedrock_mod
 
-    def fake_boto3_client(*, service_name, region_name, aws_access_key_id, aws_secret_access_key):
+    def fake_boto3_client(*, service_name, region_name, aws_access_key_id, aws_secret_access_key, config=None):
         return fake_client
 
     monkeypatch.setattr(bedrock_mod, "boto3", types.SimpleNamespace(client=fake_boto3_client))
@@ -218,3 +218,213 @@ async def test_bedrock_user_payload_async(monkeypatch, test_config):
     assert fake_async_client.last_payload == raw_payload
 
 
+
+
+@pytest.mark.asyncio
+async def test_bedrock_async_client_is_pooled(monkeypatch, test_config):
+    fake_async_client = FakeAioBoto3Client()
+    sessions = []
+    configs = []
+    exits = []
+
+    class CountingSession:
+        def client(self, *, config=None, **kwargs):
+            configs.append(config)
+            outer = self
+
+            class Context:
+                async def __aenter__(self):
+                    return fake_async_client
+
+                async def __aexit__(self, exc_type, exc, tb):
+                    exits.append(outer)
+                    return False
+
+            return Context()
+
+    def make_session():
+        sessions.append(CountingSession())
+        return sessions[-1]
+
+    import llm_manager.providers.bedrock as bedrock_mod
+    monkeypatch.setattr(bedrock_mod, "aioboto3", types.SimpleNamespace(Session=make_session))
+
+    import llm_manager.llm_manager as manager_mod
+    test_config["providers"]["bedrock"]["max_pool_connections"] = 200
+    monkeypatch.setattr(manager_mod, "load_config", lambda path=None: test_config)
+
+    async with LLMManager() as manager:
+        results = await asyncio.gather(*(
+            manager.generate_async(f"Hi {i}", model="bedrock/claude-sonnet-3.7", coalesce=False)
+            for i in range(20)
+        ))
+        assert all(r["fake"] == "async_response" for r in results)
+        # One session and client entered for all concurrent calls
+        assert len(sessions) == 1
+        assert len(fake_async_client.calls) == 20
+        assert configs[0].max_pool_connections == 200
+        assert exits == []
+
+    assert exits == sessions
+
+
+def test_bedrock_clients_of_closed_loops_are_closed(monkeypatch, test_config):
+    exits = []
+
+    class Context:
+        async def __aenter__(self):
+            return FakeAioBoto3Client()
+
+        async def __aexit__(self, exc_type, exc, tb):
+            exits.append(self)
+            return False
+
+    import llm_manager.providers.bedrock as bedrock_mod
+    monkeypatch.setattr(bedrock_mod, "aioboto3", types.SimpleNamespace(
+        Session=lambda: types.SimpleNamespace(client=lambda **kwargs: Context())
+    ))
+    provider = bedrock_mod.BedrockProvider(test_config["providers"]["bedrock"])
+
+    # One event loop per call, as with asyncio.run in a sync caller
+    asyncio.run(provider._get_async_client({}))
+    asyncio.run(provider._get_async_client({}))
+
+    assert len(exits) == 1
+    assert len(provider._async_clients) == 1
+    asyncio.run(provider._close_stale_clients())
+    assert len(exits) == 2 and not provider._async_clients
+
+
+CONVERSE_RESPONSE = {
+    "output": {"message": {"role": "assistant", "content": [
+        {"reasoningContent": {"reasoningText": {"text": "Thinking.", "signature": "sig"}}},
+        {"text": "Hello from Llama"},
+    ]}},
+    "stopReason": "end_turn",
+    "usage": {"inputTokens": 9, "outputTokens": 4, "totalTokens": 13},
+    "metrics": {"latencyMs": 120},
+    "ResponseMetadata": {"HTTPStatusCode": 200},
+}
+
+CONVERSE_STREAM = [
+    {"messageStart": {"role": "assistant"}},
+    {"contentBlockDelta": {"contentBlockIndex": 0, "delta": {"reasoningContent": {"text": "Hmm."}}}},
+    {"contentBlockDelta": {"contentBlockIndex": 1, "delta": {"text": "Hello"}}},
+    {"contentBlockDelta": {"contentBlockIndex": 1, "delta": {"text": " Llama"}}},
+    {"contentBlockStop": {"contentBlockIndex": 1}},
+    {"messageStop": {"stopReason": "max_tokens"}},
+    {"metadata": {"usage": {"inputTokens": 9, "outputTokens": 2, "totalTokens": 11, "cacheReadInputTokens": 1500},
+                  "metrics": {"latencyMs": 80}}},
+]
+
+
+class FakeConverseClient:
+    def __init__(self):
+        self.params = None
+
+    def converse(self, **params):
+        self.params = params
+        return json.loads(json.dumps(CONVERSE_RESPONSE))
+
+    def converse_stream(self, **params):
+        self.params = params
+        return {"stream": list(CONVERSE_STREAM)}
+
+
+class FakeAsyncConverseClient(FakeConverseClient):
+    async def converse(self, **params):
+        return FakeConverseClient.converse(self, **params)
+
+
+@pytest.fixture()
+def converse_manager(monkeypatch, test_config):
+    import llm_manager.llm_manager as manager_mod
+    test_config["providers"]["bedrock"]["models"]["llama3.3-70b"] = {
+        "model_id": "us.meta.llama3-3-70b-instruct-v1:0",
+        "converse": True,
+    }
+    monkeypatch.setattr(manager_mod, "load_config", lambda path=None: test_config)
+    return LLMManager()
+
+
+def test_bedrock_converse(converse_manager):
+    provider = converse_manager.providers["bedrock"]
+    fake_client = FakeConverseClient()
+    provider._get_client = lambda model_config: fake_client
+
+    result = converse_manager.generate(
+        "Hi", model="bedrock/llama3.3-70b", max_tokens=64, top_p=0.9, top_k=40,
+        stop_sequences=["END"], system="Be brief.", normalize=True,
+    )
+
+    assert fake_client.params == {
+        "modelId": "us.meta.llama3-3-70b-instruct-v1:0",
+        "messages": [{"role": "user", "content": [{"text": "Hi"}]}],
+        "inferenceConfig": {"maxTokens": 64, "temperature": 0.7, "topP": 0.9, "stopSequences": ["END"]},
+        "system": [{"text": "Be brief."}],
+        "additionalModelRequestFields": {"top_k": 40},
+    }
+    assert result.text == "Hello from Llama"
+    assert result.thinking == "Thinking."
+    assert result.usage == {"input_tokens": 9, "output_tokens": 4}
+    assert result.finish_reason == "end_turn"
+    assert "ResponseMetadata" not in result.raw
+
+
+def test_bedrock_converse_stream(converse_manager):
+    provider = converse_manager.providers["bedrock"]
+    provider._get_client = lambda model_config: FakeConverseClient()
+
+    events = list(converse_manager.stream("Hi", model="bedrock/llama3.3-70b"))
+
+    assert "".join(e.text for e in events if e.type == "text") == "Hello Llama"
+    assert "".join(e.text for e in events if e.type == "thinking") == "Hmm."
+    assert events[-1].usage == {"input_tokens": 9, "output_tokens": 2, "cache_read_tokens": 1500}
+    assert events[-1].finish_reason == "max_tokens"
+
+
+@pytest.mark.asyncio
+async def test_bedrock_converse_async(converse_manager):
+    provider = converse_manager.providers["bedrock"]
+    fake_client = FakeAsyncConverseClient()
+
+    async def fake_get_async_client(model_config):
+        return fake_client
+
+    provider._get_async_client = fake_get_async_client
+
+    response = await converse_manager.generate_async("Hi", model="bedrock/llama3.3-70b")
+
+    assert response["output"]["message"]["content"][1]["text"] == "Hello from Llama"
+    assert fake_client.params["messages"][0]["content"] == [{"text": "Hi"}]
+
+
+def test_bedrock_claude_converse_thinking(converse_manager):
+    provider = converse_manager.providers["bedrock"]
+    provider.models["claude-sonnet-3.7"]["converse"] = True
+    fake_client = FakeConverseClient()
+    provider._get_client = lambda model_config: fake_client
+
+    converse_manager.generate("Hi", model="bedrock/claude-sonnet-3.7", thinking_tokens=1024, max_tokens=2048)
+
+    assert fake_client.params["additionalModelRequestFields"] == {
+        "thinking": {"type": "enabled", "budget_tokens": 1024}
+    }
+
+
+def test_bedrock_claude_prompt_cache_breakpoints(monkeypatch, test_config):
+    import llm_manager.llm_manager as manager_mod
+    monkeypatch.setattr(manager_mod, "load_config", lambda path=None: test_config)
+    provider = LLMManager().providers["bedrock"]
+    system = "Judge the ideas below. " * 300
+
+    _, _, body = provider._build_request(["Shared context " * 300, "Question?"], "claude-sonnet-3.7", {"system": system})
+    payload = json.loads(body)
+
+    assert payload["system"] == [{"type": "text", "text": system, "cache_control": {"type": "ephemeral"}}]
+    assert payload["messages"][0]["content"][0]["cache_control"] == {"type": "ephemeral"}
+    assert "cache_control" not in payload["messages"][0]["content"][1]
+    assert "prompt_cache" not in payload
+
+    _, _, body = provider._build_request("Question?", "claude-sonnet-3.7", {"system": system, "prompt_cache": False})
+    assert json.loads(body)["system"] == system
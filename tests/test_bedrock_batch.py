@@ -0,0 +1,143 @@
+import json
+
+import pytest
+
+from llm_manager import LLMManager
+from llm_manager.errors import BadRequestError, LLMError
+
+moto = pytest.importorskip("moto")
+boto3 = pytest.importorskip("boto3")
+
+BUCKET = "batch-bucket"
+JOB_ARN = "arn:aws:bedrock:us-east-2:123:model-invocation-job/abc123"
+
+CONFIG = {
+    "default_model": "bedrock/claude-sonnet-3.7",
+    "providers": {
+        "bedrock": {
+            "enabled": True,
+            "region_name": "us-east-2",
+            "aws_access_key_id": "test",
+            "aws_secret_access_key": "test",
+            "batch": {"s3_uri": f"s3://{BUCKET}/jobs", "role_arn": "arn:aws:iam::123:role/batch"},
+            "models": {
+                "claude-sonnet-3.7": {"model_id": "us.anthropic.claude-3-7-sonnet-20250219-v1:0", "thinking_supported": True},
+            },
+        }
+    },
+}
+
+
+class FakeBedrockControlPlane:
+    """Runs a batch job by answering every staged record in S3, like Bedrock would"""
+
+    def __init__(self, s3, statuses=("Submitted", "InProgress", "Completed")):
+        self.s3 = s3
+        self.statuses = list(statuses)
+        self.job = None
+
+    def create_model_invocation_job(self, **params):
+        self.job = params
+        return {"jobArn": JOB_ARN}
+
+    def get_model_invocation_job(self, jobIdentifier):
+        assert jobIdentifier == JOB_ARN
+        status = self.statuses.pop(0) if len(self.statuses) > 1 else self.statuses[0]
+        if status == "Completed":
+            self._write_output()
+        return {
+            "jobArn": JOB_ARN,
+            "status": status,
+            "message": "boom" if status == "Failed" else "",
+            "modelId": self.job["modelId"],
+            "outputDataConfig": self.job["outputDataConfig"],
+            "ResponseMetadata": {},
+        }
+
+    def _write_output(self):
+        input_uri = self.job["inputDataConfig"]["s3InputDataConfig"]["s3Uri"]
+        key = input_uri.split(f"s3://{BUCKET}/", 1)[1]
+        lines = self.s3.get_object(Bucket=BUCKET, Key=key)["Body"].read().decode().splitlines()
+        out = []
+        for line in lines:
+            record = json.loads(line)
+            prompt = record["modelInput"]["messages"][0]["content"]
+            if prompt == "bad":
+                out.append({**record, "error": {"errorCode": 400, "errorMessage": "Malformed input"}})
+            else:
+                out.append({**record, "modelOutput": {
+                    "content": [{"type": "text", "text": f"answer to {prompt}"}],
+                    "stop_reason": "end_turn",
+                    "usage": {"input_tokens": 3, "output_tokens": 4},
+                }})
+        output_prefix = self.job["outputDataConfig"]["s3OutputDataConfig"]["s3Uri"].split(f"s3://{BUCKET}/", 1)[1]
+        self.s3.put_object(Bucket=BUCKET, Key=f"{output_prefix}abc123/input.jsonl.out",
+                           Body="\n".join(json.dumps(r) for r in reversed(out)).encode())
+        self.s3.put_object(Bucket=BUCKET, Key=f"{output_prefix}abc123/manifest.json.out", Body=b"{}")
+
+
+@pytest.fixture()
+def batch_setup(monkeypatch):
+    import llm_manager.llm_manager as manager_mod
+    monkeypatch.setattr(manager_mod, "load_config", lambda path=None: json.loads(json.dumps(CONFIG)))
+    monkeypatch.setenv("AWS_ACCESS_KEY_ID", "test")
+    monkeypatch.setenv("AWS_SECRET_ACCESS_KEY", "test")
+
+    with moto.mock_aws():
+        s3 = boto3.client("s3", region_name="us-east-2")
+        s3.create_bucket(Bucket=BUCKET, CreateBucketConfiguration={"LocationConstraint": "us-east-2"})
+        provider = LLMManager().providers["bedrock"]
+        control_plane = FakeBedrockControlPlane(s3)
+        get_service_client = provider._get_service_client
+        monkeypatch.setattr(
+            provider, "_get_service_client",
+            lambda service_name, model_config: (
+                control_plane if service_name == "bedrock" else get_service_client(service_name, model_config)
+            ),
+        )
+        yield provider, control_plane, s3
+
+
+def test_bedrock_batch_job_end_to_end(batch_setup):
+    provider, control_plane, s3 = batch_setup
+
+    results = list(provider.run_batch_job(
+        ["What is AI?", ("bad", None, {}), {"prompt": "What is ML?", "max_tokens": 50}],
+        "claude-sonnet-3.7", poll_interval=0, job_name="nightly", thinking_tokens=1024,
+    ))
+
+    # Records are staged with the same payload logic as generate
+    staged = s3.get_object(Bucket=BUCKET, Key="jobs/nightly/input.jsonl")["Body"].read().decode().splitlines()
+    records = [json.loads(line) for line in staged]
+    assert [r["recordId"] for r in records] == ["00000000000", "00000000001", "00000000002"]
+    assert records[0]["modelInput"]["thinking"] == {"type": "enabled", "budget_tokens": 1024}
+    assert records[2]["modelInput"]["max_tokens"] == 50
+    assert control_plane.job["jobName"] == "nightly"
+    assert control_plane.job["modelId"] == "us.anthropic.claude-3-7-sonnet-20250219-v1:0"
+    assert control_plane.job["outputDataConfig"]["s3OutputDataConfig"]["s3Uri"] == f"s3://{BUCKET}/jobs/nightly/output/"
+
+    by_index = {r.index: r for r in results}
+    assert sorted(by_index) == [0, 1, 2]
+    assert by_index[0].response.text == "answer to What is AI?"
+    assert by_index[0].response.usage == {"input_tokens": 3, "output_tokens": 4}
+    assert by_index[0].item.prompt == "What is AI?"
+    assert by_index[0].target == "bedrock/claude-sonnet-3.7"
+    assert isinstance(by_index[1].error, BadRequestError)
+    assert by_index[2].response.text == "answer to What is ML?"
+
+
+def test_bedrock_batch_job_failure(batch_setup):
+    provider, control_plane, _ = batch_setup
+    control_plane.statuses = ["InProgress", "Failed"]
+
+    job_arn = provider.submit_batch_job(["What is AI?"], "claude-sonnet-3.7")
+    with pytest.raises(LLMError, match="Failed: boom"):
+        provider.wait_batch_job(job_arn, "claude-sonnet-3.7", poll_interval=0)
+
+
+def test_bedrock_batch_job_requires_staging_config(batch_setup):
+    provider, _, _ = batch_setup
+    provider.config["batch"] = {}
+
+    with pytest.raises(ValueError, match="s3_uri"):
+        provider.submit_batch_job(["What is AI?"], "claude-sonnet-3.7")
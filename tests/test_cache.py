@@ -0,0 +1,93 @@
+import pytest
+
+import llm_manager.utils.cache as cache_mod
+from llm_manager.utils.cache import ResponseCache, make_cache_key
+
+
+CONFIG = """
+providers:
+  counting:
+    enabled: true
+    models:
+      m:
+        model_id: "m"
+cache:
+  enabled: true
+  max_bytes: 100000
+  ttl_seconds: 60
+default_model: "counting/m"
+"""
+
+
+class CountingProvider:
+    def __init__(self, config):
+        self.models = config.get("models", {})
+        self.calls = 0
+
+    def generate(self, prompt, model_id, **kwargs):
+        self.calls += 1
+        return f"{prompt}#{self.calls}"
+
+    async def generate_async(self, prompt, model_id, **kwargs):
+        return self.generate(prompt, model_id, **kwargs)
+
+
+@pytest.fixture()
+def manager(make_manager):
+    return make_manager(CONFIG, counting=CountingProvider)
+
+
+def test_cache_key_is_canonical():
+    a = make_cache_key("azure/gpt4o", "p", {"temperature": 0, "system": "s", "top_p": None})
+    b = make_cache_key("azure/gpt4o", "p", {"system": "s", "temperature": 0})
+    assert a == b
+    assert a != make_cache_key("bedrock/gpt4o", "p", {"system": "s", "temperature": 0})
+
+
+def test_lru_eviction_by_bytes():
+    cache = ResponseCache(max_bytes=3 * (100 + cache_mod._ENTRY_OVERHEAD))
+    for key in "abc":
+        cache.set(key, "x" * 100)
+    cache.get("a")  # a becomes most recently used
+    cache.set("d", "x" * 100)
+
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+    assert cache.stats()["evictions"] == 1
+    assert not cache.set("huge", "x" * 10000)
+
+
+def test_ttl_expiry(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(cache_mod.time, "monotonic", lambda: now[0])
+    cache = ResponseCache(ttl_seconds=10)
+    cache.set("short", "v", ttl_seconds=1)
+    cache.set("long", "v")
+
+    now[0] += 5
+    assert cache.get("short") is None
+    assert cache.get("long") == "v"
+    assert cache.stats()["expirations"] == 1
+
+
+def test_manager_caches_deterministic_requests(manager):
+    provider = manager.providers["counting"]
+
+    assert manager.generate("q", temperature=0) == "q#1"
+    assert manager.generate("q", temperature=0) == "q#1"
+    assert manager.generate("q", temperature=0.7) == "q#2"
+    assert manager.generate("q", temperature=0.7) == "q#3"
+
+    # Explicit opt-in and per-call bypass
+    assert manager.generate("r", cache=True) == "r#4"
+    assert manager.generate("r", cache=True) == "r#4"
+    assert manager.generate("q", temperature=0, cache=False) == "q#5"
+
+    assert provider.calls == 5
+    assert manager.cache.stats()["hits"] == 2
+
+
+@pytest.mark.asyncio
+async def test_manager_async_shares_cache(manager):
+    assert manager.generate("q", temperature=0) == "q#1"
+    assert await manager.generate_async("q", temperature=0) == "q#1"
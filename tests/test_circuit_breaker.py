@@ -0,0 +1,193 @@
+import pytest
+
+import llm_manager.utils.circuit_breaker as breaker_mod
+from llm_manager import CircuitOpenError, RateLimitedError, RequestTimeoutError, ServerError
+from llm_manager.utils.circuit_breaker import CircuitBreaker, CLOSED, OPEN, HALF_OPEN
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture()
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(breaker_mod.time, "monotonic", clock)
+    return clock
+
+
+def fail(breaker, error):
+    with pytest.raises(type(error)):
+        with breaker.guard():
+            raise error
+
+
+def succeed(breaker):
+    with breaker.guard():
+        pass
+
+
+def test_opens_on_failure_rate_and_fails_fast(clock):
+    breaker = CircuitBreaker(failure_rate=0.5, minimum_calls=4, window_size=4, open_seconds=10, name="azure/gpt4o")
+
+    succeed(breaker)
+    fail(breaker, ServerError("503"))
+    succeed(breaker)
+    assert breaker.state == CLOSED
+    fail(breaker, RequestTimeoutError("timeout"))
+    assert breaker.state == OPEN
+
+    with pytest.raises(CircuitOpenError) as excinfo:
+        breaker.check()
+    assert excinfo.value.retry_after == 10
+    assert not excinfo.value.retryable
+    assert breaker.stats() == {"state": OPEN, "opened": 1, "rejected": 1}
+
+
+def test_rate_limits_and_bad_requests_do_not_trip(clock):
+    breaker = CircuitBreaker(failure_rate=0.5, minimum_calls=2)
+    for _ in range(5):
+        fail(breaker, RateLimitedError("429"))
+        fail(breaker, ValueError("bad input"))
+    assert breaker.state == CLOSED
+
+
+def test_half_open_probe_closes_or_reopens(clock):
+    breaker = CircuitBreaker(failure_rate=1.0, minimum_calls=1, open_seconds=10)
+    fail(breaker, ServerError("503"))
+    assert breaker.state == OPEN
+
+    clock.now += 10
+    with breaker.guard():
+        assert breaker.state == HALF_OPEN
+        # Only one probe at a time
+        with pytest.raises(CircuitOpenError):
+            breaker.allow()
+    assert breaker.state == CLOSED
+
+    fail(breaker, ServerError("503"))
+    clock.now += 10
+    fail(breaker, ServerError("still down"))
+    assert breaker.state == OPEN
+    assert breaker.stats()["opened"] == 3
+
+
+def test_slow_calls_count_as_failures(clock):
+    breaker = CircuitBreaker(failure_rate=1.0, minimum_calls=2, slow_call_seconds=5)
+    for _ in range(2):
+        with breaker.guard():
+            clock.now += 6
+    assert breaker.state == OPEN
+
+
+def test_cancelled_probe_frees_its_slot(clock):
+    breaker = CircuitBreaker(failure_rate=1.0, minimum_calls=1, open_seconds=1)
+    fail(breaker, ServerError("503"))
+    clock.now += 1
+
+    with pytest.raises(KeyboardInterrupt):
+        with breaker.guard():
+            raise KeyboardInterrupt
+    assert breaker.state == HALF_OPEN
+    succeed(breaker)
+    assert breaker.state == CLOSED
+
+
+CONFIG = """
+providers:
+  endpoints:
+    enabled: true
+    models:
+      a1:
+        endpoint: "https://a"
+      a2:
+        endpoint: "https://a"
+      b1:
+        endpoint: "https://b"
+      pool1:
+        deployments:
+          - endpoint: "https://c"
+      pool2:
+        deployments:
+          - endpoint: "https://d"
+retry:
+  max_attempts: 1
+circuit_breaker:
+  failure_rate: 0.5
+  minimum_calls: 2
+  open_seconds: 30
+default_model: "endpoints/a1"
+"""
+
+
+class EndpointProvider:
+    def __init__(self, config):
+        self.models = config.get("models", {})
+        self.down = set()
+        self.calls = []
+
+    def _create_cache_key(self, model_config):
+        return (model_config.get("endpoint"),)
+
+    def generate(self, prompt, model_id, **kwargs):
+        self.calls.append(model_id)
+        model_config = self.models[model_id]
+        endpoint = model_config.get("endpoint") or model_config["deployments"][0]["endpoint"]
+        if endpoint in self.down:
+            raise ServerError("503")
+        return model_id
+
+
+@pytest.fixture()
+def manager(make_manager, clock):
+    return make_manager(CONFIG, endpoints=EndpointProvider)
+
+
+def test_manager_breaker_is_shared_per_endpoint(manager):
+    provider = manager.providers["endpoints"]
+    provider.down.add("https://a")
+
+    for _ in range(2):
+        with pytest.raises(ServerError):
+            manager.generate("q", model="endpoints/a1")
+
+    # a2 lives on the same endpoint, so it fails fast without a call
+    with pytest.raises(CircuitOpenError):
+        manager.generate("q", model="endpoints/a2")
+    assert provider.calls == ["a1", "a1"]
+
+    assert manager.generate("q", model="endpoints/b1") == "b1"
+    stats = manager.circuit_breaker_stats()
+    assert stats["endpoints/a2"]["state"] == OPEN
+    assert stats["endpoints/b1"]["state"] == CLOSED
+
+
+def test_load_balanced_models_get_their_own_breaker(manager):
+    provider = manager.providers["endpoints"]
+    provider.down.add("https://c")
+
+    for _ in range(2):
+        with pytest.raises(ServerError):
+            manager.generate("q", model="endpoints/pool1")
+    with pytest.raises(CircuitOpenError):
+        manager.generate("q", model="endpoints/pool1")
+
+    # Both pools have no top-level endpoint, but pool2 is unaffected
+    assert manager.generate("q", model="endpoints/pool2") == "pool2"
+    assert manager.circuit_breaker_stats()["endpoints/pool2"]["state"] == CLOSED
+
+
+def test_disabled_breaker(make_manager):
+    manager = make_manager(
+        CONFIG.replace("circuit_breaker:\n", "circuit_breaker:\n  enabled: false\n"), endpoints=EndpointProvider
+    )
+    manager.providers["endpoints"].down.add("https://a")
+
+    for _ in range(3):
+        with pytest.raises(ServerError):
+            manager.generate("q")
+    assert manager.circuit_breakers is None
@@ -0,0 +1,63 @@
+import os
+
+import llm_manager.utils.config as cfg_mod
+from llm_manager.utils.config import load_config, default_config_path, substitute_env_vars
+
+
+def _write(path, text):
+    path.write_text(text)
+    # Make sure an edit is visible even on coarse mtime filesystems
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+def test_bundled_config_path_exists():
+    assert os.path.exists(default_config_path())
+
+
+def test_every_placeholder_is_substituted(monkeypatch):
+    monkeypatch.setenv("LLMM_TEST_HOST", "example.com")
+    monkeypatch.setenv("LLMM_TEST_PORT", "8443")
+    monkeypatch.delenv("LLMM_TEST_UNSET", raising=False)
+
+    config = {
+        "url": "https://${LLMM_TEST_HOST}:${LLMM_TEST_PORT}/${LLMM_TEST_UNSET:-v1}",
+        "list": ["${LLMM_TEST_UNSET}", "${LLMM_TEST_HOST}-${LLMM_TEST_HOST}"],
+        "plain": "no placeholders",
+    }
+
+    assert substitute_env_vars(config) == {
+        "url": "https://example.com:8443/v1",
+        # Unset variables without a default become empty
+        "list": ["", "example.com-example.com"],
+        "plain": "no placeholders",
+    }
+
+
+def test_snapshot_reused_until_env_or_file_changes(monkeypatch, tmp_path):
+    calls = []
+    real_safe_load = cfg_mod.yaml.safe_load
+    monkeypatch.setattr(cfg_mod.yaml, "safe_load", lambda f: calls.append(1) or real_safe_load(f))
+    monkeypatch.setenv("LLMM_TEST_KEY", "one")
+    monkeypatch.delenv("LLMM_TEST_HOST", raising=False)
+
+    path = tmp_path / "config.yaml"
+    _write(path, 'key: "${LLMM_TEST_KEY}"\nurl: "http://${LLMM_TEST_HOST:-localhost}:${LLMM_TEST_PORT:-80}"\n')
+
+    first = load_config(str(path))
+    assert first == {"key": "one", "url": "http://localhost:80"}
+
+    # Cached: no re-parse, and callers get their own copy
+    first["key"] = "mutated"
+    assert load_config(str(path))["key"] == "one"
+    assert len(calls) == 1
+
+    # Environment change re-resolves without re-parsing
+    monkeypatch.setenv("LLMM_TEST_KEY", "two")
+    assert load_config(str(path))["key"] == "two"
+    assert len(calls) == 1
+
+    # File change re-parses
+    _write(path, 'key: "${LLMM_TEST_KEY}"\nextra: 1\n')
+    assert load_config(str(path)) == {"key": "two", "extra": 1}
+    assert len(calls) == 2
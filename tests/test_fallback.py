@@ -0,0 +1,119 @@
+import pytest
+
+import llm_manager.utils.retry as retry_mod
+from llm_manager import BadRequestError, CircuitOpenError, ServerError, RequestTimeoutError
+
+
+CONFIG = """
+providers:
+  primary:
+    enabled: true
+    models:
+      claude:
+        model_id: "claude"
+  secondary:
+    enabled: true
+    models:
+      claude:
+        model_id: "claude"
+  disabled:
+    enabled: false
+    models:
+      gpt:
+        model_id: "gpt"
+model_aliases:
+  claude-ha:
+    - "disabled/gpt"
+    - "primary/claude"
+    - "secondary/claude"
+  nothing:
+    - "disabled/gpt"
+retry:
+  max_attempts: 2
+circuit_breaker:
+  enabled: false
+default_model: "claude-ha"
+"""
+
+
+class FakeProvider:
+    def __init__(self, config):
+        self.models = config.get("models", {})
+        self.failures = []
+        self.calls = 0
+
+    def _next(self, model_id):
+        self.calls += 1
+        if self.failures:
+            raise self.failures.pop(0)
+        return f"{self.name}:{model_id}"
+
+    def generate(self, prompt, model_id, **kwargs):
+        return self._next(model_id)
+
+    async def generate_async(self, prompt, model_id, **kwargs):
+        return self._next(model_id)
+
+
+class PrimaryProvider(FakeProvider):
+    name = "primary"
+
+
+class SecondaryProvider(FakeProvider):
+    name = "secondary"
+
+
+@pytest.fixture()
+def manager(monkeypatch, make_manager):
+    monkeypatch.setattr(retry_mod.time, "sleep", lambda delay: None)
+    return make_manager(CONFIG, primary=PrimaryProvider, secondary=SecondaryProvider, disabled=PrimaryProvider)
+
+
+def test_chain_skips_unavailable_targets(manager):
+    chain = manager._chains["claude-ha"]
+    assert [route.name for route in chain] == ["primary/claude", "secondary/claude"]
+    # The alias on its own resolves to the first available target
+    assert manager._routes["claude-ha"] is chain[0]
+
+    with pytest.raises(ValueError, match="No target of fallback chain 'nothing'"):
+        manager.generate("q", model="nothing")
+
+
+def test_primary_serves_when_healthy(manager):
+    assert manager.generate("q", return_target=True) == ("primary:claude", "primary/claude")
+    assert manager.providers["secondary"].calls == 0
+
+
+@pytest.mark.parametrize("error", [ServerError("503"), RequestTimeoutError("timeout"), CircuitOpenError("open")])
+def test_fails_over_on_transient_errors(manager, error):
+    manager.providers["primary"].failures = [error]
+
+    assert manager.generate("q", return_target=True) == ("secondary:claude", "secondary/claude")
+    assert manager.providers["primary"].calls == 1
+
+
+def test_does_not_fail_over_on_bad_request(manager):
+    manager.providers["primary"].failures = [BadRequestError("400")]
+
+    with pytest.raises(BadRequestError):
+        manager.generate("q")
+    assert manager.providers["secondary"].calls == 0
+
+
+def test_retries_whole_chain(manager):
+    manager.providers["primary"].failures = [ServerError("a"), ServerError("b")]
+    manager.providers["secondary"].failures = [ServerError("c")]
+
+    assert manager.generate("q", return_target=True) == ("secondary:claude", "secondary/claude")
+    assert manager.providers["primary"].calls == 2
+
+
+@pytest.mark.asyncio
+async def test_async_fail_over_and_batch_target(manager):
+    manager.providers["primary"].failures = [ServerError("503")]
+
+    assert await manager.generate_async("q") == "secondary:claude"
+
+    manager.providers["primary"].failures = [ServerError("503")]
+    results = await manager.generate_batch_async(["a", ("b", "primary/claude")], max_concurrency=1)
+    assert [result.target for result in results] == ["secondary/claude", "primary/claude"]
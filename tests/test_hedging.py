@@ -0,0 +1,122 @@
+import asyncio
+
+import pytest
+
+from llm_manager.utils.hedging import HedgeBudget, Hedger, LatencyTracker
+
+
+CONFIG = """
+providers:
+  slow:
+    enabled: true
+    models:
+      claude:
+        model_id: "claude"
+  fast:
+    enabled: true
+    models:
+      claude:
+        model_id: "claude"
+model_aliases:
+  claude-ha:
+    - "slow/claude"
+    - "fast/claude"
+hedging:
+  enabled: {enabled}
+  initial_delay: 0.05
+  budget: 1.0
+default_model: "claude-ha"
+"""
+
+
+class DelayedProvider:
+    delay = 0.0
+
+    def __init__(self, config):
+        self.models = config.get("models", {})
+        self.started = 0
+        self.cancelled = 0
+
+    async def generate_async(self, prompt, model_id, **kwargs):
+        self.started += 1
+        try:
+            await asyncio.sleep(self.delay)
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        return f"{self.name}:{prompt}"
+
+    def generate(self, prompt, model_id, **kwargs):
+        return f"{self.name}:{prompt}"
+
+
+class SlowProvider(DelayedProvider):
+    name = "slow"
+    delay = 5.0
+
+
+class FastProvider(DelayedProvider):
+    name = "fast"
+    delay = 0.01
+
+
+def hedged_manager(make_manager, enabled):
+    return make_manager(CONFIG.format(enabled=enabled), slow=SlowProvider, fast=FastProvider)
+
+
+@pytest.mark.asyncio
+async def test_hedge_wins_and_loser_is_cancelled(make_manager):
+    manager = hedged_manager(make_manager, "true")
+
+    response, target = await manager.generate_async("q", return_target=True)
+
+    assert (response, target) == ("fast:q", "fast/claude")
+    await asyncio.sleep(0)
+    assert manager.providers["slow"].cancelled == 1
+    assert manager.hedging.stats() == {"claude-ha": {"calls": 1, "hedged": 1}}
+
+
+@pytest.mark.asyncio
+async def test_no_hedge_when_primary_is_fast_or_disabled(make_manager):
+    manager = hedged_manager(make_manager, "false")
+    manager.providers["slow"].delay = 0.0
+
+    assert await manager.generate_async("q") == "slow:q"
+    assert await manager.generate_async("q", hedge=True) == "slow:q"
+    assert manager.providers["fast"].started == 0
+
+
+@pytest.mark.asyncio
+async def test_budget_caps_hedges(make_manager):
+    manager = hedged_manager(make_manager, "true")
+    manager.providers["slow"].delay = 0.1
+    manager.hedging.budget = 0.0
+
+    assert await manager.generate_async("q") == "slow:q"
+    assert manager.providers["fast"].started == 0
+    assert manager.hedging.stats()["claude-ha"] == {"calls": 1, "hedged": 0}
+
+
+def test_latency_tracker_and_delay():
+    tracker = LatencyTracker(window_size=100)
+    assert tracker.percentile(95) is None
+    for latency in range(1, 101):
+        tracker.record(latency / 100)
+    assert tracker.percentile(50) == 0.51
+    assert tracker.percentile(95) == 0.96
+
+    hedger = Hedger({"min_samples": 5, "initial_delay": 3.0, "models": {"m": {"percentile": 50}}})
+    assert hedger.delay("m", "p/m") == 3.0
+    for latency in (1.0, 2.0, 3.0, 4.0, 5.0):
+        hedger.record("p/m", latency)
+    assert hedger.delay("m", "p/m") == 3.0
+    assert hedger.delay("other", "p/m") == 5.0
+
+
+def test_hedge_budget_ratio():
+    budget = HedgeBudget(ratio=0.25, max_burst=2)
+    spent = 0
+    for _ in range(100):
+        budget.deposit()
+        spent += budget.try_spend()
+    assert spent == 25
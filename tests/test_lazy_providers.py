@@ -0,0 +1,27 @@
+import subprocess
+import sys
+
+from llm_manager.providers import ProviderRegistry
+
+
+def test_import_does_not_load_provider_sdks():
+    code = (
+        "import sys, llm_manager; "
+        "print(','.join(m for m in ('openai', 'anthropic', 'abacusai', 'boto3', 'aioboto3') if m in sys.modules))"
+    )
+    output = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True).stdout
+    assert output.strip() == ""
+
+
+def test_registry_imports_on_lookup_only():
+    registry = ProviderRegistry({"ollama": (".ollama", "OllamaProvider")})
+
+    assert "ollama" in registry
+    assert not registry.is_loaded("ollama")
+    assert registry["ollama"].__name__ == "OllamaProvider"
+    assert registry.is_loaded("ollama")
+
+    registry["custom"] = object
+    assert list(registry) == ["ollama", "custom"]
+    del registry["custom"]
+    assert "custom" not in registry
@@ -0,0 +1,142 @@
+import asyncio
+import types
+
+import pytest
+
+import llm_manager.providers.azure as azure_mod
+import llm_manager.utils.load_balancer as lb_mod
+from llm_manager import RateLimitedError, BadRequestError
+from llm_manager.providers.azure import AzureProvider
+from llm_manager.utils.load_balancer import DeploymentPool
+
+
+AZURE_CONFIG = {
+    "enabled": True,
+    "models": {
+        "gpt-5": {
+            "api_version": "2025-03-01-preview",
+            "model_id": "gpt-5",
+            "deployments": [
+                {"azure_endpoint": "https://eastus", "api_key": "k1", "azure_deployment": "gpt-5"},
+                {"azure_endpoint": "https://swedencentral", "api_key": "k2", "azure_deployment": "gpt-5"},
+            ],
+        },
+        "gpt4o": {"azure_endpoint": "https://eastus", "api_key": "k1", "model_id": "gpt-4o"},
+    },
+}
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_least_outstanding_spreads_load():
+    pool = DeploymentPool([{"name": "a"}, {"name": "b", "weight": 2}])
+
+    picks = [pool.acquire().config["name"] for _ in range(3)]
+    # b has twice the weight, so it takes two of the first three requests
+    assert sorted(picks) == ["a", "b", "b"]
+    assert [d.outstanding for d in pool.deployments] == [1, 2]
+
+
+def test_retryable_failure_cools_deployment_down(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(lb_mod.time, "monotonic", clock)
+    pool = DeploymentPool([{"name": "a"}, {"name": "b"}], cooldown_seconds=5)
+
+    a = next(d for d in pool.deployments if d.config["name"] == "a")
+    pool.acquire()
+    pool.release(a, RateLimitedError("429", retry_after=30))
+    pool.deployments[1].outstanding = 0
+
+    assert all(pool.acquire().config["name"] == "b" for _ in range(3))
+    assert pool.stats()[0]["healthy"] is False
+
+    clock.now += 30
+    assert pool.stats()[0]["healthy"] is True
+
+    # Non-retryable errors say nothing about the deployment's health
+    b = pool.deployments[1]
+    pool.release(b, BadRequestError("400"))
+    assert b.cooldown_until == 0.0
+
+
+def test_weighted_strategy(monkeypatch):
+    picks = []
+
+    def choices(candidates, weights):
+        picks.append(([d.config["name"] for d in candidates], weights))
+        return [candidates[-1]]
+
+    monkeypatch.setattr(lb_mod.random, "choices", choices)
+    pool = DeploymentPool([{"name": "a", "weight": 1}, {"name": "b", "weight": 3}], strategy="weighted")
+    assert pool.acquire().config["name"] == "b"
+    assert picks == [(["a", "b"], [1.0, 3.0])]
+
+    with pytest.raises(ValueError, match="Unknown load balancing strategy"):
+        DeploymentPool([{}], strategy="round_robin")
+
+
+def test_zero_weight_drains_deployment():
+    pool = DeploymentPool([{"name": "a", "weight": 1}, {"name": "b", "weight": 0}], strategy="weighted")
+    assert all(pool.acquire().config["name"] == "a" for _ in range(20))
+
+    # With every deployment drained, they share the load
+    pool = DeploymentPool([{"name": "a", "weight": 0}, {"name": "b", "weight": 0}])
+    assert {pool.acquire().config["name"] for _ in range(4)} == {"a", "b"}
+
+    with pytest.raises(ValueError, match="zero or positive"):
+        DeploymentPool([{"weight": -1}])
+
+    with pytest.raises(ValueError, match="Unknown load balancing strategy"):
+        DeploymentPool([{}], strategy="round_robin")
+
+
+@pytest.fixture()
+def provider(monkeypatch):
+    created = []
+
+    class FakeAsyncAzureOpenAI:
+        def __init__(self, api_key, api_version, azure_endpoint, azure_deployment):
+            created.append(azure_endpoint)
+            self.endpoint = azure_endpoint
+            self.chat = types.SimpleNamespace(completions=types.SimpleNamespace(create=self.create))
+
+        async def create(self, **params):
+            await asyncio.sleep(0.01)
+            if self.endpoint == "https://eastus" and provider.throttle_east:
+                raise RateLimitedError("429", retry_after=60)
+            return self.endpoint
+
+    monkeypatch.setattr(azure_mod, "AsyncAzureOpenAI", FakeAsyncAzureOpenAI)
+    provider = AzureProvider(AZURE_CONFIG)
+    provider.throttle_east = False
+    provider.created = created
+    return provider
+
+
+@pytest.mark.asyncio
+async def test_azure_model_balances_over_deployments(provider):
+    endpoints = await asyncio.gather(*(provider.generate_async("q", "gpt-5") for _ in range(4)))
+
+    assert sorted(endpoints) == ["https://eastus"] * 2 + ["https://swedencentral"] * 2
+    # One cached client per deployment
+    assert sorted(provider.created) == ["https://eastus", "https://swedencentral"]
+    assert [d["outstanding"] for d in provider.deployment_stats("gpt-5")] == [0, 0]
+    assert provider.deployment_stats("gpt4o") == []
+
+
+@pytest.mark.asyncio
+async def test_azure_throttled_deployment_is_avoided(provider):
+    provider.throttle_east = True
+    results = await asyncio.gather(
+        *(provider.generate_async("q", "gpt-5") for _ in range(2)), return_exceptions=True
+    )
+    assert sum(isinstance(r, RateLimitedError) for r in results) == 1
+
+    endpoints = await asyncio.gather(*(provider.generate_async("q", "gpt-5") for _ in range(3)))
+    assert endpoints == ["https://swedencentral"] * 3
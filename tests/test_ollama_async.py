@@ -0,0 +1,118 @@
+import asyncio
+import json
+
+import pytest
+import pytest_asyncio
+from aiohttp import web
+
+from llm_manager import BadRequestError, RequestTimeoutError
+from llm_manager.providers.ollama import OllamaProvider
+
+
+CHUNKS = [
+    {"response": "Hi", "done": False},
+    {"response": " there", "done": False},
+    {"response": "", "done": True, "done_reason": "stop", "prompt_eval_count": 3, "eval_count": 2},
+]
+
+
+@pytest_asyncio.fixture()
+async def server():
+    received = []
+
+    async def generate(request):
+        payload = await request.json()
+        received.append(payload)
+        if payload["model"] == "missing":
+            return web.json_response({"error": "model 'missing' not found"}, status=404)
+        if payload["model"] == "stuck":
+            await asyncio.sleep(1)
+        if not payload["stream"]:
+            return web.json_response({**CHUNKS[-1], "response": "Hi there"})
+        response = web.StreamResponse(headers={"Content-Type": "application/x-ndjson"})
+        await response.prepare(request)
+        for chunk in CHUNKS:
+            await response.write(json.dumps(chunk).encode() + b"\n")
+            await asyncio.sleep(0)
+        await response.write_eof()
+        return response
+
+    app = web.Application()
+    app.router.add_post("/api/generate", generate)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    yield f"http://127.0.0.1:{port}", received
+    await runner.cleanup()
+
+
+def make_provider(base_url):
+    return OllamaProvider({
+        "enabled": True,
+        "base_url": base_url,
+        "keep_alive": "30m",
+        "timeout": 0.2,
+        "models": {
+            "llama3.2": {"model_id": "llama3.2"},
+            "missing": {"model_id": "missing"},
+            "stuck": {"model_id": "stuck"},
+        },
+    })
+
+
+@pytest.mark.asyncio
+async def test_generate_async_reuses_pooled_session(server):
+    base_url, received = server
+    provider = make_provider(base_url)
+
+    first = await provider.generate_async("Hi", "llama3.2", temperature=0, keep_alive=-1)
+    second = await provider.generate_async("Hi", "llama3.2")
+
+    assert first["response"] == second["response"] == "Hi there"
+    assert received[0]["keep_alive"] == -1
+    assert received[0]["options"] == {"temperature": 0}
+    assert received[1]["keep_alive"] == "30m"
+    loop_sessions = provider._async_clients[asyncio.get_running_loop()]
+    assert len(loop_sessions) == 1
+    await provider.aclose()
+    assert all(session.closed for session in loop_sessions.values())
+
+
+@pytest.mark.asyncio
+async def test_astream_parses_ndjson(server):
+    base_url, _ = server
+    provider = make_provider(base_url)
+
+    events = [event async for event in provider.astream("Hi", "llama3.2")]
+
+    assert "".join(e.text for e in events if e.type == "text") == "Hi there"
+    assert events[-1].usage == {"input_tokens": 3, "output_tokens": 2}
+    assert events[-1].finish_reason == "stop"
+    await provider.aclose()
+
+
+@pytest.mark.asyncio
+async def test_async_errors_and_read_timeout(server):
+    base_url, _ = server
+    provider = make_provider(base_url)
+
+    with pytest.raises(BadRequestError, match="model 'missing' not found"):
+        await provider.generate_async("Hi", "missing")
+    with pytest.raises(RequestTimeoutError):
+        await provider.generate_async("Hi", "stuck")
+    await provider.aclose()
+
+
+def test_sessions_of_closed_loops_are_closed():
+    provider = make_provider("http://127.0.0.1:1")
+
+    # One event loop per call, as with asyncio.run in a sync caller
+    first = asyncio.run(provider._get_async_client({}))
+    second = asyncio.run(provider._get_async_client({}))
+
+    assert first.closed and not second.closed
+    assert len(provider._async_clients) == 1
+    asyncio.run(provider._close_stale_clients())
+    assert second.closed and not provider._async_clients
@@ -0,0 +1,123 @@
+import asyncio
+import types
+import pytest
+
+import llm_manager.utils.rate_limit as rl_mod
+from llm_manager.utils.rate_limit import TokenBucket, RateLimiter, build_rate_limiters
+from llm_manager.utils.usage import estimate_tokens, extract_usage
+
+
+CONFIG = """
+providers:
+  limited:
+    enabled: true
+    max_concurrency: 3
+    models:
+      a:
+        model_id: "a"
+        max_concurrency: 2
+        tokens_per_minute: 60000
+      b:
+        model_id: "b"
+default_model: "limited/a"
+"""
+
+
+class UsageProvider:
+    def __init__(self, config):
+        self.models = config.get("models", {})
+        self.in_flight = 0
+        self.peak = 0
+
+    def generate(self, prompt, model_id, **kwargs):
+        return {"usage": {"input_tokens": 10, "output_tokens": 5}}
+
+    async def generate_async(self, prompt, model_id, **kwargs):
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        await asyncio.sleep(0.01)
+        self.in_flight -= 1
+        return {"usage": {"input_tokens": 10, "output_tokens": 5}}
+
+
+@pytest.fixture()
+def clock(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(rl_mod.time, "monotonic", lambda: now[0])
+    return now
+
+
+def test_token_bucket_debt_and_refill(clock):
+    bucket = TokenBucket(per_minute=60)  # one token per second
+
+    assert bucket.reserve(60) == 0
+    assert bucket.reserve(2) == pytest.approx(2.0)
+    clock[0] += 2
+    assert bucket.reserve(1) == pytest.approx(1.0)
+
+    bucket.adjust(100)
+    assert bucket.tokens == 60  # capped at capacity
+
+
+def test_limiters_built_per_model():
+    limiters = build_rate_limiters({
+        "p": {"requests_per_minute": 10, "models": {"x": {"max_concurrency": 1}, "y": {}}},
+        "q": {"models": {"z": {}}},
+    })
+
+    assert [l.name for l in limiters["p/x"]] == ["p", "p/x"]
+    assert [l.name for l in limiters["p/y"]] == ["p"]
+    assert limiters["p/x"][0] is limiters["p/y"][0]
+    assert "q/z" not in limiters
+
+
+def test_permit_reconciles_tokens(clock):
+    limiter = RateLimiter(tokens_per_minute=1000)
+    permit = limiter.acquire(400)
+    assert limiter.token_bucket.tokens == 600
+
+    permit.release(used_tokens=100)
+    assert limiter.token_bucket.tokens == 900
+
+
+@pytest.fixture()
+def manager(make_manager):
+    return make_manager(CONFIG, limited=UsageProvider)
+
+
+@pytest.mark.asyncio
+async def test_manager_enforces_concurrency(manager):
+    provider = manager.providers["limited"]
+
+    await asyncio.gather(*(manager.generate_async(f"p{i}", model="limited/a") for i in range(10)))
+    assert provider.peak == 2
+
+    provider.peak = 0
+    await asyncio.gather(*(manager.generate_async(f"p{i}", model="limited/b") for i in range(10)))
+    assert provider.peak == 3
+
+
+def test_manager_reconciles_usage(manager):
+    provider_limiter, model_limiter = manager._rate_limiters["limited/a"]
+    manager.generate("hello", model="limited/a", max_tokens=500)
+
+    # Estimate of ~500 tokens was replaced by the 15 actually used
+    assert 60000 - model_limiter.token_bucket.tokens == pytest.approx(15, abs=1)
+    assert provider_limiter.token_bucket is None
+
+
+def test_estimate_tokens():
+    assert estimate_tokens("x" * 400, {"system": "y" * 400, "max_tokens": 50}) == 201 + 50
+    assert estimate_tokens("", {}) == 1 + 1000
+
+
+def test_extract_usage_formats():
+    ns = types.SimpleNamespace
+    chat = ns(usage=ns(prompt_tokens=3, completion_tokens=4, completion_tokens_details=ns(reasoning_tokens=2)))
+    responses = ns(usage=ns(input_tokens=5, output_tokens=6, output_tokens_details=ns(reasoning_tokens=0)))
+
+    assert extract_usage(chat) == {"input_tokens": 3, "output_tokens": 4, "thinking_tokens": 2}
+    assert extract_usage(responses) == {"input_tokens": 5, "output_tokens": 6}
+    assert extract_usage({"usage": {"input_tokens": 1, "output_tokens": 2}}) == {"input_tokens": 1, "output_tokens": 2}
+    assert extract_usage({"response": "hi", "prompt_eval_count": 7, "eval_count": 8}) == {"input_tokens": 7, "output_tokens": 8}
+    assert extract_usage("plain text") is None
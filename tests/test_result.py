@@ -0,0 +1,122 @@
+import types
+
+import pytest
+
+from llm_manager import LLMResult
+
+
+def _ns(**kwargs):
+    return types.SimpleNamespace(**kwargs)
+
+
+AZURE_CHAT = _ns(
+    choices=[_ns(message=_ns(content="Paris"), finish_reason="stop")],
+    usage=_ns(prompt_tokens=9, completion_tokens=1, completion_tokens_details=_ns(reasoning_tokens=0)),
+)
+
+AZURE_RESPONSES = _ns(
+    output=[
+        _ns(type="reasoning", summary=[_ns(text="Thinking about "), _ns(text="capitals.")]),
+        _ns(type="message", content=[_ns(type="output_text", text="Paris")]),
+    ],
+    status="completed",
+    incomplete_details=None,
+    usage=_ns(input_tokens=9, output_tokens=30, output_tokens_details=_ns(reasoning_tokens=20)),
+)
+
+BEDROCK_CLAUDE = {
+    "content": [{"type": "thinking", "thinking": "Capitals..."}, {"type": "text", "text": "Paris"}],
+    "stop_reason": "end_turn",
+    "usage": {"input_tokens": 12, "output_tokens": 5},
+}
+
+OLLAMA = {"response": "Paris", "done": True, "done_reason": "stop", "prompt_eval_count": 7, "eval_count": 2}
+
+
+@pytest.mark.parametrize(
+    "response, text, thinking, usage, finish_reason",
+    [
+        ("Paris", "Paris", None, None, None),
+        ({"thinking": "Capitals...", "response": "Paris"}, "Paris", "Capitals...", None, None),
+        (AZURE_CHAT, "Paris", None, {"input_tokens": 9, "output_tokens": 1}, "stop"),
+        (AZURE_RESPONSES, "Paris", "Thinking about capitals.",
+         {"input_tokens": 9, "output_tokens": 30, "thinking_tokens": 20}, "completed"),
+        (BEDROCK_CLAUDE, "Paris", "Capitals...", {"input_tokens": 12, "output_tokens": 5}, "end_turn"),
+        ({"outputs": [{"text": "Paris", "stop_reason": "stop"}]}, "Paris", None, None, "stop"),
+        ({"generation": "Paris", "stop_reason": "stop"}, "Paris", None, None, "stop"),
+        (OLLAMA, "Paris", None, {"input_tokens": 7, "output_tokens": 2}, "stop"),
+        ({**OLLAMA, "thinking": "Capitals..."}, "Paris", "Capitals...", {"input_tokens": 7, "output_tokens": 2}, "stop"),
+        (_ns(content="Paris"), "Paris", None, None, None),
+    ],
+)
+def test_from_response(response, text, thinking, usage, finish_reason):
+    result = LLMResult.from_response(response, model="p/m", latency=0.5)
+
+    assert (result.text, result.thinking, result.usage, result.finish_reason) == (text, thinking, usage, finish_reason)
+    assert result.raw is response
+    assert result.model == "p/m" and result.latency == 0.5
+    assert str(result) == text
+
+
+def test_compact_and_raw_can_be_dropped():
+    result = LLMResult.from_response(BEDROCK_CLAUDE, keep_raw=False)
+
+    assert result.raw is None
+    assert not hasattr(result, "__dict__")
+    assert LLMResult.from_response(result) is result
+    # Text is referenced, not copied
+    assert result.text is BEDROCK_CLAUDE["content"][1]["text"]
+
+
+CONFIG = """
+providers:
+  fake:
+    enabled: true
+    models:
+      m:
+        model_id: "m"
+cache:
+  enabled: true
+default_model: "fake/m"
+"""
+
+
+class FakeProvider:
+    def __init__(self, config):
+        self.models = config.get("models", {})
+
+    def generate(self, prompt, model_id, **kwargs):
+        return BEDROCK_CLAUDE
+
+    async def generate_async(self, prompt, model_id, **kwargs):
+        return OLLAMA
+
+
+@pytest.fixture()
+def manager(make_manager):
+    return make_manager(CONFIG, fake=FakeProvider)
+
+
+def test_manager_normalize_option(manager):
+    assert manager.generate("q") is BEDROCK_CLAUDE
+
+    result = manager.generate("q", normalize=True)
+    assert isinstance(result, LLMResult)
+    assert result.model == "fake/m"
+    assert result.latency >= 0
+
+    # Cache hits are normalized too, and report no serving target
+    manager.generate("q", temperature=0)
+    result, target = manager.generate("q", temperature=0, normalize=True, return_target=True)
+    assert result.text == "Paris" and target is None
+
+
+@pytest.mark.asyncio
+async def test_manager_normalize_async_and_batch(manager):
+    result = await manager.generate_async("q", normalize=True)
+    assert result.usage == {"input_tokens": 7, "output_tokens": 2}
+
+    results = await manager.generate_batch_async([{"prompt": "q", "normalize": True}])
+    assert results[0].response.text == "Paris"
+    assert results[0].target == "fake/m"
+
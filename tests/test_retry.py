@@ -0,0 +1,155 @@
+from types import SimpleNamespace
+
+import openai
+import pytest
+from botocore.exceptions import ClientError
+
+import llm_manager.utils.retry as retry_mod
+from llm_manager import RateLimitedError, ServerError, BadRequestError, ContentFilteredError
+from llm_manager.errors import error_for_status, retry_after_from_headers, RequestTimeoutError
+from llm_manager.utils.retry import RetryPolicy
+
+
+CONFIG = """
+providers:
+  flaky:
+    enabled: true
+    models:
+      m:
+        model_id: "m"
+retry:
+  max_attempts: 4
+  base_delay: 0.5
+default_model: "flaky/m"
+"""
+
+
+class FlakyProvider:
+    def __init__(self, config):
+        self.models = config.get("models", {})
+        self.failures = []
+        self.calls = 0
+
+    def _next(self):
+        self.calls += 1
+        if self.failures:
+            raise self.failures.pop(0)
+        return "ok"
+
+    def generate(self, prompt, model_id, **kwargs):
+        return self._next()
+
+    async def generate_async(self, prompt, model_id, **kwargs):
+        return self._next()
+
+
+@pytest.fixture()
+def sleeps(monkeypatch):
+    recorded = []
+    monkeypatch.setattr(retry_mod.time, "sleep", recorded.append)
+
+    async def fake_sleep(delay):
+        recorded.append(delay)
+
+    monkeypatch.setattr(retry_mod.asyncio, "sleep", fake_sleep)
+    return recorded
+
+
+@pytest.fixture()
+def manager(make_manager):
+    return make_manager(CONFIG, flaky=FlakyProvider)
+
+
+def test_retry_after_headers():
+    assert retry_after_from_headers({"Retry-After": "7"}) == 7
+    assert retry_after_from_headers({"retry-after-ms": "250"}) == 0.25
+    assert retry_after_from_headers({"x-ratelimit-reset-tokens": "1m30s", "retry-after": "2"}) == 90
+    assert retry_after_from_headers({"x-ratelimit-reset-requests": "20ms"}) == pytest.approx(0.02)
+    assert retry_after_from_headers({"content-type": "application/json"}) is None
+
+
+def test_error_for_status():
+    assert type(error_for_status(429, "m")) is RateLimitedError
+    assert type(error_for_status(503, "m")) is ServerError
+    assert type(error_for_status(408, "m")) is RequestTimeoutError
+    assert type(error_for_status(400, "m")) is BadRequestError
+    assert not error_for_status(401, "m").retryable
+
+
+def test_backoff_full_jitter_and_retry_after():
+    policy = RetryPolicy(max_attempts=5, base_delay=1, max_delay=4, max_retry_after=10)
+    error = ServerError("x")
+
+    for attempt in range(4):
+        assert 0 <= policy.backoff(attempt, error) <= min(4, 2 ** attempt)
+    assert policy.backoff(4, error) is None
+
+    assert policy.backoff(0, RateLimitedError("x", retry_after=3)) == 3
+    assert policy.backoff(0, RateLimitedError("x", retry_after=60)) is None
+    assert policy.backoff(0, BadRequestError("x")) is None
+    assert policy.backoff(0, ValueError("x")) is None
+
+
+def test_manager_retries_transient_errors(manager, sleeps):
+    provider = manager.providers["flaky"]
+    provider.failures = [RateLimitedError("429", retry_after=2), ServerError("503")]
+
+    assert manager.generate("q") == "ok"
+    assert provider.calls == 3
+    assert sleeps[0] == 2
+    assert 0 <= sleeps[1] <= 1.0
+
+
+def test_manager_does_not_retry_fatal_errors(manager, sleeps):
+    provider = manager.providers["flaky"]
+    provider.failures = [BadRequestError("400")]
+
+    with pytest.raises(BadRequestError):
+        manager.generate("q")
+    assert provider.calls == 1
+
+
+@pytest.mark.asyncio
+async def test_manager_async_retries_and_override(manager, sleeps):
+    provider = manager.providers["flaky"]
+    provider.failures = [ServerError("a"), ServerError("b")]
+
+    with pytest.raises(ServerError):
+        await manager.generate_async("q", max_attempts=2)
+    assert provider.calls == 2
+
+    assert await manager.generate_async("q") == "ok"
+
+
+def test_bedrock_error_translation():
+    from llm_manager.providers.bedrock import _translate_error
+
+    throttled = ClientError(
+        {
+            "Error": {"Code": "ThrottlingException", "Message": "Too many requests"},
+            "ResponseMetadata": {"HTTPStatusCode": 429, "HTTPHeaders": {"retry-after": "5"}},
+        },
+        "InvokeModel",
+    )
+    error = _translate_error(throttled)
+    assert isinstance(error, RateLimitedError)
+    assert error.retry_after == 5
+    assert str(error) == "Bedrock error: Too many requests"
+
+    blocked = ClientError(
+        {"Error": {"Code": "ValidationException", "Message": "Blocked by guardrail"}}, "InvokeModel"
+    )
+    assert isinstance(_translate_error(blocked), ContentFilteredError)
+
+
+def test_azure_error_translation():
+    from llm_manager.providers.azure import _translate_error
+
+    request = SimpleNamespace(method="POST", url="https://example.openai.azure.com")
+    response = SimpleNamespace(status_code=429, request=request, headers={"retry-after-ms": "1500"})
+    error = _translate_error(openai.RateLimitError("slow down", response=response, body=None))
+
+    assert isinstance(error, RateLimitedError)
+    assert error.retry_after == 1.5
+    assert error.status_code == 429
+    assert isinstance(_translate_error(openai.APITimeoutError(request=request)), RequestTimeoutError)
@@ -0,0 +1,79 @@
+import pytest
+
+
+CONFIG = """
+providers:
+  synconly:
+    enabled: true
+    models:
+      small:
+        model_id: "small-v1"
+  both:
+    enabled: true
+    models:
+      big:
+        model_id: "big-v1"
+  disabled:
+    enabled: false
+    models:
+      other:
+        model_id: "other-v1"
+model_aliases:
+  small: "synconly/small"
+  big: "both/big"
+  dangling: "disabled/other"
+default_model: "big"
+"""
+
+
+class SyncOnlyProvider:
+    def __init__(self, config):
+        self.models = config.get("models", {})
+
+    def generate(self, prompt, model_id, **kwargs):
+        if model_id not in self.models:
+            raise ValueError(f"Unknown SyncOnly model: {model_id}")
+        return ("sync", model_id, prompt, kwargs)
+
+
+class AsyncProvider(SyncOnlyProvider):
+    async def generate_async(self, prompt, model_id, **kwargs):
+        return ("async", model_id, prompt, kwargs)
+
+
+@pytest.fixture()
+def manager(make_manager):
+    return make_manager(CONFIG, synconly=SyncOnlyProvider, both=AsyncProvider, disabled=AsyncProvider)
+
+
+def test_aliases_and_paths_share_routes(manager):
+    assert manager._routes["small"] is manager._routes["synconly/small"]
+    route = manager._routes["big"]
+    assert route.provider_name == "both"
+    assert route.model_id == "big"
+    assert route.model_config == {"model_id": "big-v1"}
+    assert "dangling" not in manager._routes
+
+    with pytest.raises(TypeError):
+        manager._routes["new"] = route
+
+
+def test_generate_dispatch(manager):
+    assert manager.generate("hi", model="small", temperature=0) == ("sync", "small", "hi", {"temperature": 0})
+    assert manager.generate("hi") == ("sync", "big", "hi", {})
+
+
+@pytest.mark.asyncio
+async def test_generate_async_dispatch(manager):
+    assert await manager.generate_async("hi", model="both/big") == ("async", "big", "hi", {})
+    with pytest.raises(ValueError, match="does not support async"):
+        await manager.generate_async("hi", model="small")
+
+
+def test_unknown_models_report_errors(manager):
+    with pytest.raises(ValueError, match="Invalid model format"):
+        manager.generate("hi", model="nope")
+    with pytest.raises(ValueError, match="not found or not enabled"):
+        manager.generate("hi", model="dangling")
+    with pytest.raises(ValueError, match="Unknown SyncOnly model"):
+        manager.generate("hi", model="synconly/missing")
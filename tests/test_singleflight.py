@@ -0,0 +1,149 @@
+import asyncio
+import pytest
+
+from llm_manager.utils.singleflight import SingleFlight
+
+
+CONFIG = """
+providers:
+  slow:
+    enabled: true
+    models:
+      m:
+        model_id: "m"
+default_model: "slow/m"
+"""
+
+
+class SlowProvider:
+    def __init__(self, config):
+        self.models = config.get("models", {})
+        self.calls = 0
+
+    def generate(self, prompt, model_id, **kwargs):
+        raise NotImplementedError
+
+    async def generate_async(self, prompt, model_id, **kwargs):
+        self.calls += 1
+        call_number = self.calls
+        await asyncio.sleep(0.02)
+        return f"{prompt}#{call_number}"
+
+
+class Upstream:
+    def __init__(self, result=None, error=None):
+        self.calls = 0
+        self.cancelled = False
+        self.result = result
+        self.error = error
+
+    async def __call__(self):
+        self.calls += 1
+        try:
+            await asyncio.sleep(0.05)
+        except asyncio.CancelledError:
+            self.cancelled = True
+            raise
+        if self.error:
+            raise self.error
+        return self.result
+
+
+@pytest.mark.asyncio
+async def test_identical_calls_share_result():
+    flight = SingleFlight()
+    upstream = Upstream(result="shared")
+
+    results = await asyncio.gather(*(flight.do("k", upstream) for _ in range(10)))
+
+    assert results == ["shared"] * 10
+    assert upstream.calls == 1
+    assert flight.stats() == {"started": 1, "coalesced": 9, "in_flight": 0}
+
+
+@pytest.mark.asyncio
+async def test_identical_calls_share_exception():
+    flight = SingleFlight()
+    upstream = Upstream(error=RuntimeError("boom"))
+
+    results = await asyncio.gather(*(flight.do("k", upstream) for _ in range(3)), return_exceptions=True)
+
+    assert all(isinstance(r, RuntimeError) for r in results)
+    assert upstream.calls == 1
+
+
+@pytest.mark.asyncio
+async def test_cancelled_waiter_does_not_cancel_shared_call():
+    flight = SingleFlight()
+    upstream = Upstream(result="ok")
+
+    leaver = asyncio.ensure_future(flight.do("k", upstream))
+    stayer = asyncio.ensure_future(flight.do("k", upstream))
+    await asyncio.sleep(0.01)
+    leaver.cancel()
+
+    assert await stayer == "ok"
+    assert leaver.cancelled()
+    assert not upstream.cancelled
+
+
+@pytest.mark.asyncio
+async def test_shared_call_cancelled_when_all_waiters_leave():
+    flight = SingleFlight()
+    upstream = Upstream(result="ok")
+
+    waiters = [asyncio.ensure_future(flight.do("k", upstream)) for _ in range(2)]
+    await asyncio.sleep(0.01)
+    for waiter in waiters:
+        waiter.cancel()
+    await asyncio.gather(*waiters, return_exceptions=True)
+    await asyncio.sleep(0)
+
+    assert upstream.cancelled
+    assert flight.in_flight() == 0
+
+
+@pytest.mark.asyncio
+async def test_new_caller_does_not_join_cancelled_call():
+    flight = SingleFlight()
+    calls = []
+
+    async def upstream():
+        calls.append(1)
+        try:
+            await asyncio.sleep(0.05)
+        except asyncio.CancelledError:
+            # Closing a connection takes a moment
+            await asyncio.sleep(0.02)
+            raise
+        return "ok"
+
+    waiter = asyncio.ensure_future(flight.do("k", upstream))
+    await asyncio.sleep(0.01)
+    waiter.cancel()
+    await asyncio.gather(waiter, return_exceptions=True)
+
+    # The abandoned call is still cancelling, so this one starts afresh
+    assert await flight.do("k", upstream) == "ok"
+    assert len(calls) == 2
+
+
+@pytest.fixture()
+def manager(make_manager):
+    return make_manager(CONFIG, slow=SlowProvider)
+
+
+@pytest.mark.asyncio
+async def test_manager_coalesces_deterministic_requests(manager):
+    provider = manager.providers["slow"]
+
+    results = await asyncio.gather(*(manager.generate_async("q", temperature=0) for _ in range(5)))
+    assert results == ["q#1"] * 5
+    assert provider.calls == 1
+
+    # Sampling requests stay independent unless explicitly coalesced
+    results = await asyncio.gather(*(manager.generate_async("q", temperature=0.7) for _ in range(3)))
+    assert len(set(results)) == 3
+
+    await asyncio.gather(*(manager.generate_async("q", temperature=0.7, coalesce=True) for _ in range(3)))
+    assert provider.calls == 1 + 3 + 1
@@ -0,0 +1,343 @@
+import json
+import types
+import pytest
+
+from llm_manager import LLMManager
+
+
+def _ns(**kwargs):
+    return types.SimpleNamespace(**kwargs)
+
+
+def _collect(events):
+    text = "".join(e.text for e in events if e.type == "text")
+    thinking = "".join(e.text for e in events if e.type == "thinking")
+    return text, thinking, events[-1]
+
+
+CLAUDE_EVENTS = [
+    {"type": "message_start", "message": {"usage": {"input_tokens": 12, "output_tokens": 1}}},
+    {"type": "content_block_delta", "index": 0, "delta": {"type": "thinking_delta", "thinking": "Let me "}},
+    {"type": "content_block_delta", "index": 0, "delta": {"type": "thinking_delta", "thinking": "think."}},
+    {"type": "content_block_delta", "index": 1, "delta": {"type": "text_delta", "text": "Hello"}},
+    {"type": "content_block_delta", "index": 1, "delta": {"type": "text_delta", "text": " world"}},
+    {"type": "message_delta", "delta": {"stop_reason": "end_turn"}, "usage": {"output_tokens": 7}},
+    {"type": "message_stop"},
+]
+
+
+class FakeEventStream:
+    def __init__(self, chunks):
+        self._events = [{"chunk": {"bytes": json.dumps(c).encode("utf-8")}} for c in chunks]
+        self.closed = False
+
+    def __iter__(self):
+        return iter(self._events)
+
+    async def _aiter(self):
+        for event in self._events:
+            yield event
+
+    def __aiter__(self):
+        return self._aiter()
+
+    def close(self):
+        self.closed = True
+
+
+class FakeBedrockClient:
+    def __init__(self):
+        self.stream = FakeEventStream(CLAUDE_EVENTS)
+        self.last_payload = None
+
+    def invoke_model_with_response_stream(self, *, modelId, body, contentType, accept):
+        self.last_payload = json.loads(body)
+        return {"body": self.stream}
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        return False
+
+
+class AsyncFakeBedrockClient(FakeBedrockClient):
+    async def invoke_model_with_response_stream(self, **kwargs):
+        return FakeBedrockClient.invoke_model_with_response_stream(self, **kwargs)
+
+
+@pytest.fixture()
+def manager():
+    return LLMManager()
+
+
+def test_bedrock_stream(manager):
+    provider = manager.providers["bedrock"]
+    fake_client = FakeBedrockClient()
+    provider._get_client = lambda model_config: fake_client
+
+    events = list(manager.stream("Hi", model="bedrock/claude-sonnet-3.7", thinking_tokens=1024, max_tokens=2048))
+    text, thinking, final = _collect(events)
+
+    assert text == "Hello world"
+    assert thinking == "Let me think."
+    assert final.type == "usage"
+    assert final.usage == {"input_tokens": 12, "output_tokens": 7}
+    assert final.finish_reason == "end_turn"
+    assert fake_client.last_payload["thinking"] == {"type": "enabled", "budget_tokens": 1024}
+    assert fake_client.stream.closed
+
+
+@pytest.mark.asyncio
+async def test_bedrock_astream(manager):
+    provider = manager.providers["bedrock"]
+    fake_client = AsyncFakeBedrockClient()
+
+    async def fake_get_async_client(model_config):
+        return fake_client
+
+    provider._get_async_client = fake_get_async_client
+
+    events = [e async for e in manager.astream("Hi", model="bedrock/claude-sonnet-3.7")]
+    text, thinking, final = _collect(events)
+
+    assert text == "Hello world"
+    assert final.usage == {"input_tokens": 12, "output_tokens": 7}
+
+
+
+def test_bedrock_stream_usage_from_invocation_metrics(manager):
+    provider = manager.providers["bedrock"]
+    fake_client = FakeBedrockClient()
+    fake_client.stream = FakeEventStream([
+        {"generation": "Hello", "prompt_token_count": 5, "generation_token_count": 1, "stop_reason": None},
+        {"generation": " there", "prompt_token_count": None, "generation_token_count": 2, "stop_reason": "stop",
+         "amazon-bedrock-invocationMetrics": {"inputTokenCount": 5, "outputTokenCount": 2,
+                                              "invocationLatency": 310, "firstByteLatency": 95}},
+    ])
+    provider._get_client = lambda model_config: fake_client
+
+    text, _, final = _collect(list(manager.stream("Hi", model="bedrock/claude-sonnet-3.7")))
+
+    assert text == "Hello there"
+    assert final.usage == {"input_tokens": 5, "output_tokens": 2}
+    assert final.finish_reason == "stop"
+
+
+def test_bedrock_stream_early_cutoff(manager):
+    provider = manager.providers["bedrock"]
+    fake_client = FakeBedrockClient()
+    provider._get_client = lambda model_config: fake_client
+
+    for event in manager.stream("Hi", model="bedrock/claude-sonnet-3.7", thinking_tokens=1024, max_tokens=2048):
+        if event.type == "text":
+            break
+
+    assert fake_client.stream.closed
+
+
+@pytest.mark.asyncio
+async def test_bedrock_astream_early_cutoff(manager):
+    provider = manager.providers["bedrock"]
+    fake_client = AsyncFakeBedrockClient()
+
+    async def fake_get_async_client(model_config):
+        return fake_client
+
+    provider._get_async_client = fake_get_async_client
+
+    events = manager.astream("Hi", model="bedrock/claude-sonnet-3.7")
+    async for event in events:
+        if event.type == "text":
+            break
+    await events.aclose()
+
+    assert fake_client.stream.closed
+
+def test_anthropic_stream(manager, monkeypatch):
+    import llm_manager.providers.anthropic as anthropic_mod
+
+    class FakeStream:
+        def __init__(self, events):
+            self._events = events
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *exc):
+            return False
+
+        def __iter__(self):
+            return iter(self._events)
+
+    def to_event(chunk):
+        event = dict(chunk)
+        if "message" in event:
+            event["message"] = _ns(usage=_ns(**event["message"]["usage"]))
+        if "delta" in event:
+            event["delta"] = _ns(**{"type": None, **event["delta"]})
+        if "usage" in event:
+            event["usage"] = _ns(**event["usage"])
+        return _ns(**event)
+
+    requests = []
+
+    class FakeAnthropic:
+        def __init__(self, api_key=None):
+            self.messages = _ns(create=self.create)
+
+        def create(self, **params):
+            requests.append(params)
+            return FakeStream([to_event(c) for c in CLAUDE_EVENTS])
+
+    monkeypatch.setattr(anthropic_mod, "Anthropic", FakeAnthropic)
+
+    events = list(manager.stream("Hi", model="anthropic/claude-sonnet-4", system="Be brief."))
+    text, thinking, final = _collect(events)
+
+    assert text == "Hello world"
+    assert thinking == "Let me think."
+    assert final.usage == {"input_tokens": 12, "output_tokens": 7}
+    assert requests[0]["stream"] is True
+    assert requests[0]["system"] == "Be brief."
+
+
+def test_azure_chat_stream(manager):
+    chunks = [
+        _ns(usage=None, choices=[_ns(delta=_ns(content="Hel"), finish_reason=None)]),
+        _ns(usage=None, choices=[_ns(delta=_ns(content="lo"), finish_reason="stop")]),
+        _ns(usage=_ns(prompt_tokens=5, completion_tokens=2, completion_tokens_details=None), choices=[]),
+    ]
+
+    class FakeStream(list):
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *exc):
+            return False
+
+    calls = []
+
+    def create(**params):
+        calls.append(params)
+        return FakeStream(chunks)
+
+    provider = manager.providers["azure"]
+    provider._get_client = lambda model_config: _ns(chat=_ns(completions=_ns(create=create)))
+
+    events = list(manager.stream("Hi", model="azure/gpt4o"))
+    text, _, final = _collect(events)
+
+    assert text == "Hello"
+    assert final.usage == {"input_tokens": 5, "output_tokens": 2}
+    assert final.finish_reason == "stop"
+    assert calls[0]["stream"] is True
+    assert calls[0]["stream_options"] == {"include_usage": True}
+
+
+
+RESPONSES_EVENTS = [
+    _ns(type="response.created"),
+    _ns(type="response.reasoning_summary_text.delta", delta="Weighing "),
+    _ns(type="response.reasoning_summary_text.delta", delta="options."),
+    _ns(type="response.output_text.delta", delta="Paris"),
+    _ns(type="response.output_text.delta", delta="."),
+    _ns(type="response.completed", response=_ns(
+        status="completed", incomplete_details=None,
+        usage=_ns(input_tokens=9, output_tokens=40, output_tokens_details=_ns(reasoning_tokens=32)),
+    )),
+]
+
+
+class FakeResponsesStream(list):
+    def __init__(self, events):
+        super().__init__(events)
+        self.closed = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.closed = True
+        return False
+
+
+def test_azure_responses_stream(manager):
+    calls = []
+    streams = []
+
+    def create(**params):
+        calls.append(params)
+        streams.append(FakeResponsesStream(RESPONSES_EVENTS))
+        return streams[-1]
+
+    provider = manager.providers["azure"]
+    provider._get_client = lambda model_config: _ns(responses=_ns(create=create))
+
+    events = list(manager.stream("Capital of France?", model="azure/o3", reasoning_effort="high"))
+    text, thinking, final = _collect(events)
+
+    assert thinking == "Weighing options."
+    assert text == "Paris."
+    assert final.usage == {"input_tokens": 9, "output_tokens": 40, "thinking_tokens": 32}
+    assert final.finish_reason == "completed"
+    assert final.ttft is not None and final.ttft >= 0
+    # Summaries are requested by default so reasoning progress is streamed
+    assert calls[0]["reasoning"] == {"effort": "high", "summary": "auto"}
+
+    # Stopping early closes the HTTP stream
+    for event in manager.stream("Capital of France?", model="azure/o3", summary_level="detailed"):
+        if event.type == "thinking":
+            break
+    assert calls[1]["reasoning"] == {"summary": "detailed"}
+    assert streams[1].closed
+
+    # Non-streaming calls only request summaries when asked to
+    manager.generate("Capital of France?", model="azure/o3", reasoning_effort="high")
+    assert calls[2]["reasoning"] == {"effort": "high"}
+
+def test_ollama_stream(manager):
+    lines = [
+        json.dumps({"response": "Hi", "done": False}).encode(),
+        b"",
+        json.dumps({"response": " there", "done": False}).encode(),
+        json.dumps({"response": "", "done": True, "done_reason": "stop",
+                    "prompt_eval_count": 3, "eval_count": 2}).encode(),
+    ]
+
+    class FakeResponse:
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *exc):
+            return False
+
+        def raise_for_status(self):
+            pass
+
+        def iter_lines(self):
+            return iter(lines)
+
+    posted = []
+
+    class FakeSession:
+        def post(self, url, json=None, stream=False, timeout=None):
+            posted.append((url, json, stream, timeout))
+            return FakeResponse()
+
+    provider = manager.providers["ollama"]
+    provider._get_client = lambda model_config: FakeSession()
+
+    events = list(manager.stream("Hi", model="ollama/llama3.2", temperature=0))
+    text, _, final = _collect(events)
+
+    assert text == "Hi there"
+    assert final.usage == {"input_tokens": 3, "output_tokens": 2}
+    assert posted[0][1]["stream"] is True
+    assert posted[0][2] is True
+    assert posted[0][3] == (10, 300)
+
+
+def test_stream_unsupported_provider(manager):
+    with pytest.raises(ValueError, match="does not support streaming"):
+        manager.stream("Hi", model="abacus/o3-low")